@@ -1,7 +1,9 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from bson import ObjectId
+import hmac
 import json
-from db.people import PeopleRepository
+import logging
+from db.people import CachedPeopleRepository
 from db.photos import PhotoRepository
 from db.photo_people import PhotoPeopleRepository
 from db.photo_tags import PhotoTagsRepository
@@ -9,28 +11,191 @@ from db.huggingface.huggingface_tag import get_tags_from_huggingface
 from db.travel_people import TravelPeopleRepository
 from db.travel_places import TravelPlacesRepository
 from db.travel import TravelRepository
+from db.person_stats import PersonStatsRepository
+from db.sync import SyncRepository
+from db.recommend_jobs import RecommendJobRepository
+from db.recommend_cache import RecommendCacheRepository
+from db.indexes import ensure_indexes
+from db.compact import start_compaction_thread
+from db.geo import to_geojson, from_geojson
+from db.monitoring import command_metrics, set_route, reset_route
+from db.read_preference import PRIMARY, SECONDARY_PREFERRED, begin_request, end_request, read_preference
 import os
-from tools.tool import Tools
-from llm.models import TOTPlanner, TOTExecutor
+from recommend import JobQueueFull, RecommendCache, RecommendJobRunner, extract_places, get_cache_backend, get_pipeline
+from web.admission import AdmissionControl, AdmissionPool, admission_pool
+from web.encoding import FastJSONProvider
+from web.sse import stream_events
+from web.streaming import stream_json_array
+from web.fields import parse_fields, select_fields
+from web.paging import parse_page_args, set_next_cursor
 app = Flask(__name__)
-people_repo = PeopleRepository()
+logger = logging.getLogger("app")
+# orjson 기반 JSON 인코딩 (ObjectId/datetime 등 BSON 타입 직접 직렬화)
+app.json = FastJSONProvider(app)
+# 요청 수락 제어: 추천(LLM) 라우트는 llm 풀, 나머지 CRUD 라우트는 crud 풀로 워커 용량을 나눠 씀.
+# 풀이 가득 차거나 클라이언트 요청 속도를 넘으면 429 + Retry-After (ADMISSION_* 환경 변수, web.admission 참고)
+crud_pool = AdmissionPool.from_env("crud", max_concurrent=32, max_queue=64, queue_timeout=2)
+llm_pool = AdmissionPool.from_env(
+    "llm", max_concurrent=4, max_queue=4, queue_timeout=5, rate=0.1, burst=5, retry_after=5
+)
+admission = None
+if os.getenv("ADMISSION_CONTROL", "1") == "1":
+    admission = AdmissionControl(app, default_pool=crud_pool)
+people_repo = CachedPeopleRepository()
+if os.getenv("PEOPLE_CACHE_CHANGE_STREAM", "0") == "1":
+    people_repo.start_change_stream()
 photo_repo = PhotoRepository()
 photo_people_repo = PhotoPeopleRepository()
 photo_tags_repo = PhotoTagsRepository()
 travel_people_repo = TravelPeopleRepository()
 travel_places_repo = TravelPlacesRepository()
 travel_repo = TravelRepository()
+person_stats_repo = PersonStatsRepository()
+sync_repo = SyncRepository()
+recommend_job_repo = RecommendJobRepository()
+# 추천 결과 캐시 (RECOMMEND_CACHE_BACKEND=memory|mongo|off)
+recommend_cache = RecommendCache(get_cache_backend())
+
+
+def apply_indexes():
+    """
+    모든 Repository의 인덱스 선언 적용 (이미 있으면 변경 없음).
+    sync_tombstones / recommend_jobs / recommend_cache의 TTL 인덱스도 여기서 만들어지므로
+    WSGI 서버로 띄울 때도 워커 시작 시 한 번 실행합니다. 별도로는 `python -m db.indexes apply`
+    """
+    repositories = [
+        people_repo, photo_repo, photo_people_repo, photo_tags_repo,
+        travel_repo, travel_people_repo, travel_places_repo, person_stats_repo, sync_repo,
+        recommend_job_repo
+    ]
+    if isinstance(recommend_cache.backend, RecommendCacheRepository):
+        repositories.append(recommend_cache.backend)
+    # 실패한 컬렉션은 db.indexes가 경고를 남기고 건너뜀. DB에 연결할 수 없어도(MongoUnavailable 등
+    # ConnectionFailure) 서버는 띄우고, 배포 후 CLI로 다시 적용할 수 있게 경고만 남김
+    errors = {}
+    ensure_indexes(repositories=repositories, errors=errors)
+    if errors:
+        logger.warning("인덱스 적용 실패: %s (`python -m db.indexes apply`로 다시 적용하세요)", ", ".join(errors))
+
+
+# ENSURE_INDEXES=0이면 시작 시 적용하지 않음 (배포 단계에서 `python -m db.indexes apply` 실행 필요)
+if os.getenv("ENSURE_INDEXES", "1") == "1":
+    apply_indexes()
+# 고아 링크 정리 백그라운드 작업 (초 단위 주기, 0이면 비활성화). 별도로는 `python -m db.compact orphans`
+if float(os.getenv("ORPHAN_COMPACTION_INTERVAL", "0")) > 0:
+    start_compaction_thread(interval=float(os.getenv("ORPHAN_COMPACTION_INTERVAL")))
+
+
+@app.before_request
+def tag_db_route():
+    # 이 요청에서 실행되는 MongoDB 명령을 라우트별로 집계 (GET /api/metrics)
+    rule = request.url_rule.rule if request.url_rule else request.path
+    g.db_route_token = set_route(f"{request.method} {rule}")
+    # 쓰기 요청은 조회도 primary로, GET은 라우트 데코레이터/Repository 정책을 따름
+    g.read_preference_tokens = begin_request(None if request.method in ("GET", "HEAD") else PRIMARY)
+
+
+@app.teardown_request
+def untag_db_route(exc):
+    token = g.pop("db_route_token", None)
+    if token is not None:
+        reset_route(token)
+    tokens = g.pop("read_preference_tokens", None)
+    if tokens is not None:
+        end_request(tokens)
+
+
 def serialize_id(doc):
     doc["_id"] = str(doc["_id"])
     return doc
 
+def to_object_id(value):
+    """ObjectId 형식이면 ObjectId로, 아니면 원래 값 그대로 반환"""
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+def get_photo_stats_state(photo_oid):
+    """person_stats 반영용 사진의 현재 인물/태그 (없으면 None)"""
+    docs = photo_repo.get_photo({"_id": photo_oid}, {"people": 1, "tags": 1})
+    return docs[0] if docs else None
+
+def get_travel_stats_state(travel_oid):
+    """person_stats 반영용 여행의 현재 날짜/이름/참여 인물 (없으면 None)"""
+    docs = travel_repo.get_travel({"_id": travel_oid}, {"date": 1, "name": 1})
+    if not docs:
+        return None
+    links = travel_people_repo.get_travel_person({"travelId": travel_oid}, {"peopleId": 1})
+    return dict(docs[0], people=[link.get("peopleId") for link in links])
+
+# 목록 조회 기본 페이지 크기 (?limit= 로 변경, 최대 MAX_PAGE_SIZE)
+PEOPLE_PAGE_SIZE = 100
+PHOTO_PAGE_SIZE = 50
+SEARCH_PAGE_SIZE = 20
+TRAVEL_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 500
+
+# ?fields= 로 선택 가능한 응답 필드 -> 문서 필드 (None: 다른 컬렉션에서 채우는 필드)
+PERSON_FIELDS = {"name": "name", "personId": "_id"}
+PHOTO_LIST_FIELDS = {"id": "_id", "url": "image_url", "location": "location"}
+PHOTO_DETAIL_FIELDS = {
+    "url": "image_url",
+    "text": "description",
+    "peopleId": "people",
+    "tags": "tags",
+    "travelId": "travel_id",
+}
+PHOTO_SEARCH_FIELDS = {
+    "id": "_id",
+    "url": "image_url",
+    "text": "description",
+    "tags": "tags",
+    "location": "location",
+    "score": None,
+}
+TRAVEL_LIST_FIELDS = {"id": "_id", "date": "date", "name": "name", "places": None}
+TRAVEL_DETAIL_FIELDS = {"date": "date", "people": None, "name": "name", "places": None}
+
 @app.route("/api/people", methods=["GET"])
+@read_preference(SECONDARY_PREFERRED)
 def get_people():
-    people = people_repo.get_person({})
-    result = [{
-        "name": person["name"],
-        "personId": str(person["_id"])}for person in people]
-    return jsonify(result)
+    try:
+        fields, projection = parse_fields(PERSON_FIELDS, request.args.get("fields"))
+        limit, cursor = parse_page_args(request.args, PEOPLE_PAGE_SIZE, MAX_PAGE_SIZE)
+        people, next_cursor = people_repo.page_person({}, limit, cursor, projection)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = stream_json_array(people, lambda person: select_fields({
+        "name": person.get("name", ""),
+        "personId": person["_id"]}, fields))
+    return set_next_cursor(response, next_cursor)
+
+@app.route("/api/people/<personId>/stats", methods=["GET"])
+@read_preference(SECONDARY_PREFERRED)
+def get_person_stats(personId):
+    """
+    Precomputed statistics for one person (a single person_stats fetch).
+
+    Response:
+    {
+        "personId": "...", "photoCount": 3, "travelCount": 2,
+        "lastTravel": {"date": "YYYY-MM-DD", "travelId": "...", "name": "..."} | null,
+        "topTags": [{"tag": "beach", "count": 2}, ...],
+        "coTravelers": [{"personId": "...", "count": 2}, ...]
+    }
+    404 if the person has no statistics yet.
+    """
+    try:
+        top = min(max(int(request.args.get("top", 5)), 1), 50)
+    except ValueError:
+        return jsonify({"error": "top must be an integer"}), 400
+    stats = people_repo.get_person_stats(to_object_id(personId), top)
+    if stats is None:
+        return jsonify({"error": "Person stats not found"}), 404
+    stats["personId"] = str(stats["personId"])
+    if stats["lastTravel"]:
+        stats["lastTravel"]["travelId"] = str(stats["lastTravel"]["travelId"])
+    return jsonify(stats), 200
 
 @app.route("/api/people", methods=["POST"])
 def add_person():
@@ -40,17 +205,23 @@ def add_person():
     return jsonify(result)
 
 @app.route("/api/photos", methods=["GET"])
+@read_preference(SECONDARY_PREFERRED)
 def get_photos_by_person():
     person_id = request.args.get("personId")
     query = {}
     if person_id:
-        query["people"] = ObjectId(person_id)
-    photos = photo_repo.get_photo(query)
-    result = [{
-        "id": str(photo["_id"]),
+        query["people"] = to_object_id(person_id)
+    try:
+        fields, projection = parse_fields(PHOTO_LIST_FIELDS, request.args.get("fields"))
+        limit, cursor = parse_page_args(request.args, PHOTO_PAGE_SIZE, MAX_PAGE_SIZE)
+        photos, next_cursor = photo_repo.page_photo(query, limit, cursor, projection)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = stream_json_array(photos, lambda photo: select_fields({
+        "id": photo["_id"],
         "url": photo.get("image_url", ""),
-        "location": photo.get("location", [])}for photo in photos]
-    return jsonify(result)
+        "location": from_geojson(photo.get("location"))}, fields))
+    return set_next_cursor(response, next_cursor)
 
 @app.route("/api/photos", methods=["POST"])
 def add_photo():
@@ -58,57 +229,97 @@ def add_photo():
 
     # 문자열로 전달된 JSON 데이터 파싱
     description = request.form.get("text", "")
-    location = json.loads(request.form.get("location", "[]"))
+    try:
+        # [latitude, longitude] -> GeoJSON Point (2dsphere index)
+        location = to_geojson(json.loads(request.form.get("location", "[]")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     travel_id = request.form.get("travelId")
     people_ids = json.loads(request.form.get("peopleId", "[]"))
 
     # 예시 이미지 URL
     image_url = "hello"
 
+    photo_tags = get_tags_from_huggingface(img_file)
+    people = [to_object_id(p) for p in people_ids]
+
     photo = {
         "image_url": image_url,
         "description": description,
-        "location": location,
-        "travel_id": travel_id
+        "travel_id": travel_id,
+        # 비정규화 인물/태그 (photo_people, photoTags 링크와 함께 유지)
+        "people": people,
+        "tags": photo_tags
     }
+    if location:
+        photo["location"] = location
 
     photo_id = photo_repo.add_photo(photo)
 
-    photo_tags = get_tags_from_huggingface(img_file)
+    # 링크 문서는 컬렉션별로 한 번의 unordered insert_many로 저장
+    photo_people_repo.add_photoPeople_many([
+        {"photoId": photo_id, "personId": p} for p in people
+    ])
+    photo_tags_repo.add_photoTags_many([
+        {"photoId": photo_id, "tags": t} for t in photo_tags
+    ])
+    person_stats_repo.apply_photo_change(None, {"people": people, "tags": photo_tags})
+    recommend_cache.invalidate_people(people)
 
-    for p in people_ids:
-        photo_people_repo.add_photoPeople({
-            "photoId": photo_id,
-            "personId": p
-        })
+    return {"photoId": str(photo_id)}, 201
 
-    for t in photo_tags:
-        photo_tags_repo.add_photoTags({
-            "photoId": photo_id,
-            "tags": t
-        })
 
-    return {"photoId": str(photo_id)}, 201
+@app.route("/api/photos/search", methods=["GET"])
+@read_preference(SECONDARY_PREFERRED)
+def search_photos():
+    """
+    Full-text search over photo descriptions and tags, ranked by relevance.
 
+    Query Parameters:
+        q (str)      – Search terms (required).
+        limit (int)  – Page size (default 20, max 500).
+        cursor (str) – Continuation token from the X-Next-Cursor header.
+        fields (str) – Optional subset of id, url, text, tags, location, score.
+    """
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+    try:
+        fields, projection = parse_fields(PHOTO_SEARCH_FIELDS, request.args.get("fields"))
+        limit, cursor = parse_page_args(request.args, SEARCH_PAGE_SIZE, MAX_PAGE_SIZE)
+        photos, next_cursor = photo_repo.search_photo(q, limit, cursor, projection)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = stream_json_array(photos, lambda photo: select_fields({
+        "id": str(photo["_id"]),
+        "url": photo.get("image_url", ""),
+        "text": photo.get("description", ""),
+        "tags": photo.get("tags", []),
+        "location": from_geojson(photo.get("location")),
+        "score": photo.get("score", 0)}, fields))
+    return set_next_cursor(response, next_cursor)
 
 @app.route("/api/photos/<photoId>", methods=["GET"])
+@read_preference(SECONDARY_PREFERRED)
 def get_photo_detail(photoId):
-    photo = photo_repo.get_photo({"_id": ObjectId(photoId)})
-    photo = photo[0]
-
-    people_raw = photo_people_repo.get_photoPeople({"photoId": ObjectId(photoId)})
-    people = [str(p["personId"]) for p in people_raw]
+    try:
+        fields, projection = parse_fields(PHOTO_DETAIL_FIELDS, request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    tags_raw = photo_tags_repo.get_photoTags({"photoId": ObjectId(photoId)})
-    tags = [t["tags"] for t in tags_raw]
+    # people / tags are denormalized onto the photo, so this is a single _id fetch
+    photo = photo_repo.get_photo({"_id": ObjectId(photoId)}, projection)
+    if not photo:
+        return jsonify({"error": "Invalid photoId"}), 404
+    photo = photo[0]
 
-    return jsonify({
+    return jsonify(select_fields({
         "url": photo.get("image_url", ""),
         "text": photo.get("description", ""),
-        "peopleId": people,
-        "tags": tags,
+        "peopleId": [str(p) for p in photo.get("people", [])],
+        "tags": photo.get("tags", []),
         "travelId": str(photo.get("travel_id", ""))
-    })
+    }, fields))
 
 
 
@@ -116,53 +327,84 @@ def get_photo_detail(photoId):
 def update_photo(photoId):
     data = request.get_json()
     update = {}
+    unset = {}
+    # 위치는 링크 교체 전에 검증
+    if "location" in data:
+        try:
+            location = to_geojson(data["location"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if location:
+            update["location"] = location
+        else:
+            unset["location"] = ""
+    # 변경 전 인물/태그: 추천 캐시 무효화(어떤 필드가 바뀌어도)와
+    # 인물/태그가 바뀐 경우 person_stats 차이 반영에 사용
+    photo_before = get_photo_stats_state(ObjectId(photoId))
+    stats_before = photo_before if "peopleId" in data or "tags" in data else None
     if "img" in data:
         update["image_url"] = data["img"]
     if "text" in data:
         update["description"] = data["text"]
     if "peopleId" in data:
-        photo_people_repo.delete_photoPeople({
-            photoId: photoId
-        })
+        people = [to_object_id(p) for p in data["peopleId"]]
+        photo_people_repo.replace_photoPeople({"photoId": ObjectId(photoId)}, [
+            {"photoId": ObjectId(photoId), "personId": p} for p in people
+        ])
+        update["people"] = people
 
-        for p in data["peopleId"]:
-            photo_people_repo.add_photoPeople({
-                "photoId": photoId,
-                "peopleId": ObjectId(p)
-            })
-        
-    if "location" in data:
-        update["location"] = data["location"]
     if "travelId" in data:
         update["travel_id"] = data["travelId"]
     if "tags" in data:
-        photo_tags_repo.delete_photoTags({
-            photoId: photoId
+        photo_tags_repo.replace_photoTags({"photoId": ObjectId(photoId)}, [
+            {"photoId": ObjectId(photoId), "tags": pt} for pt in data["tags"]
+        ])
+        update["tags"] = list(data["tags"])
+
+    update_doc = {}
+    if update:
+        update_doc["$set"] = update
+    if unset:
+        update_doc["$unset"] = unset
+    if update_doc:
+        photo_repo.update_photo({"_id": ObjectId(photoId)}, update_doc)
+    if stats_before is not None:
+        person_stats_repo.apply_photo_change(stats_before, {
+            "people": update.get("people", stats_before.get("people")),
+            "tags": update.get("tags", stats_before.get("tags")),
         })
-
-        for pt in data["tags"]:
-            photo_tags_repo.add_photoTags({
-                "photoId": photoId,
-                "tags": ObjectId(pt)
-            })
-        
-
-    photo_repo.update_photo({"_id": ObjectId(photoId)}, {"$set": update})
-    return
+    recommend_cache.invalidate_people((photo_before or {}).get("people"), update.get("people"))
+    return "", 200
 
 @app.route("/api/photos/<photoId>", methods=["DELETE"])
 def delete_photo(photoId):
-    photo_repo.delete_photo({"_id": ObjectId(photoId)})
-    return
+    if not ObjectId.is_valid(photoId):
+        return jsonify({"error": "Invalid photoId"}), 400
+    stats_before = get_photo_stats_state(ObjectId(photoId))
+    # 사진과 photo_people / photoTags 링크를 함께 삭제
+    deleted = photo_repo.delete_photo_cascade({"_id": ObjectId(photoId)})
+    if not deleted[photo_repo.collection_name]:
+        return jsonify({"error": "Photo not found"}), 404
+    person_stats_repo.apply_photo_change(stats_before, None)
+    recommend_cache.invalidate_people((stats_before or {}).get("people"))
+    return "", 200
 
 
 
 
 # New route: Get 5 most recent travels and their places
 @app.route("/api/travels", methods=["GET"])
+@read_preference(SECONDARY_PREFERRED)
 def get_recent_travels():
     """
-    Returns the 5 most recent travels and their associated places.
+    Returns the most recent travels (5 by default) and their associated places.
+
+    Query Parameters:
+        fields (str) – Optional comma-separated subset of response fields
+                       (id, date, name, places).
+        limit (int)  – Page size (default 5, max 500).
+        cursor (str) – Continuation token from the previous page's
+                       X-Next-Cursor response header.
 
     Response Body Example:
     [
@@ -181,35 +423,41 @@ def get_recent_travels():
     """
 
     try:
-        # Fetch all travels, then sort by date descending and take the latest five
-        travels = travel_repo.get_travel({})
-        travels_sorted = sorted(
-            travels, key=lambda t: t.get("date", ""), reverse=True
-        )[:5]
+        fields, projection = parse_fields(TRAVEL_LIST_FIELDS, request.args.get("fields"))
+        limit, cursor = parse_page_args(request.args, TRAVEL_PAGE_SIZE, MAX_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        # Fetch one page of travels, newest first, sorted and limited on the server
+        travels, next_cursor = travel_repo.page_travel({}, limit, cursor, projection)
 
         response = []
-        for travel in travels_sorted:
+        for travel in travels:
             travel_id = travel["_id"]
 
-            # Retrieve places linked to this travel
-            places_raw = travel_places_repo.get_travel_place({"travelId": travel_id})
-
-            # Build places list, preserving 'order' field if present
+            # Retrieve places linked to this travel (only when requested)
             places = []
-            for idx, place in enumerate(places_raw):
-                places.append({
-                    "name": place.get("placeId", ""),
-                    "order": place.get("order", idx)
-                })
+            if "places" in fields:
+                places_raw = travel_places_repo.get_travel_place(
+                    {"travelId": travel_id}, {"placeId": 1, "order": 1}
+                )
+
+                # Build places list, preserving 'order' field if present
+                for idx, place in enumerate(places_raw):
+                    places.append({
+                        "name": place.get("placeId", ""),
+                        "order": place.get("order", idx)
+                    })
 
-            response.append({
+            response.append(select_fields({
                 "id": str(travel_id),
                 "date": travel.get("date"),
                 "name": travel.get("name", ""),
                 "places": places
-            })
+            }, fields))
 
-        return jsonify(response), 200
+        return set_next_cursor(jsonify(response), next_cursor), 200
     except Exception as e:
         # Return a 400 with error details if something goes wrong
         return jsonify({"error": str(e)}), 400
@@ -218,10 +466,15 @@ def get_recent_travels():
 
 # New route: Get a detailed travel record
 @app.route("/api/travels/<travelId>", methods=["GET"])
+@read_preference(SECONDARY_PREFERRED)
 def get_travel_detail(travelId):
     """
     Returns detailed information for a single travel.
 
+    Query Parameters:
+        fields (str) – Optional comma-separated subset of response fields
+                       (date, people, name, places).
+
     Response Body Example:
     {
         "date": date,
@@ -244,64 +497,48 @@ def get_travel_detail(travelId):
         if not ObjectId.is_valid(travelId):
             return jsonify({"error": "Invalid travelId"}), 400
 
-        # Fetch the travel document
-        travel_docs = travel_repo.get_travel({"_id": ObjectId(travelId)})
-        if not travel_docs:
+        fields, projection = parse_fields(TRAVEL_DETAIL_FIELDS, request.args.get("fields"))
+
+        # Fetch the travel with its people, places and a located photo in one aggregation
+        travel = travel_repo.get_travel_detail(
+            ObjectId(travelId),
+            projection,
+            include_people="people" in fields,
+            include_places="places" in fields
+        )
+        if not travel:
             return jsonify({"error": "Invalid travelId"}), 400
-        travel = travel_docs[0]
 
         # ---- People Section ----
-        people_links = travel_people_repo.get_travel_person({"travelId": ObjectId(travelId)})
+        names = {p["_id"]: p.get("name", "") for p in travel.get("people_docs", [])}
         people_list = []
-        for link in people_links:
+        for link in travel.get("people_links", []):
             pid = link.get("peopleId")
-            person_name = ""
-            # Attempt to resolve the person's name if we have a valid ObjectId
-            try:
-                if ObjectId.is_valid(str(pid)):
-                    person_docs = people_repo.get_person({"_id": ObjectId(pid)})
-                    if person_docs:
-                        person_name = person_docs[0].get("name", "")
-            except Exception:
-                pass  # In case pid is not an ObjectId or repository fails
             people_list.append({
                 "id": str(pid),
-                "name": person_name
+                "name": names.get(pid, "")
             })
 
         # ---- Places Section ----
-        place_links = travel_places_repo.get_travel_place({"travelId": ObjectId(travelId)})
+        # Location is inferred from a photo of this travel having non-empty 'location'
+        located = travel.get("located_photos", [])
+        location_val = from_geojson(located[0].get("location")) if located else []
         places_output = []
-        for idx, link in enumerate(place_links):
+        for idx, link in enumerate(travel.get("place_links", [])):
             place_id = link.get("placeId", "")
-            order_val = link.get("order", idx)
-
-            # Try to infer location via photos of this travel having non-empty 'location'
-            location_val = []
-            try:
-                photos = photo_repo.get_photo({
-                    "travel_id": ObjectId(travelId),
-                    "location": {"$ne": []}
-                })
-                # Pick first photo's location if available
-                if photos:
-                    location_val = photos[0].get("location", [])
-            except Exception:
-                pass
-
             places_output.append({
                 "id": place_id,
-                "order": order_val,
+                "order": link.get("order", idx),
                 "name": place_id,     # using place_id as name fallback
                 "location": location_val
             })
 
-        response = {
+        response = select_fields({
             "date": travel.get("date"),
             "people": people_list,
             "name": travel.get("name", ""),
             "places": places_output
-        }
+        }, fields)
         return jsonify(response), 200
 
     except Exception as e:
@@ -337,6 +574,11 @@ def update_travel(travelId):
         if data is None:
             data = {}
 
+        # person_stats 반영용 변경 전 상태
+        stats_before = None
+        if any(key in data for key in ("name", "date", "peopleId")):
+            stats_before = get_travel_stats_state(ObjectId(travelId))
+
         # -- Update basic fields in the travel document --
         update_doc = {}
         if "name" in data:
@@ -346,33 +588,37 @@ def update_travel(travelId):
         if update_doc:
             travel_repo.update_travel({"_id": ObjectId(travelId)}, {"$set": update_doc})
 
-        # -- Update people links --
+        # -- Update people links (replace all in one bulk write) --
         if "peopleId" in data:
-            # Remove existing links
-            travel_people_repo.delete_travel_person({"travelId": ObjectId(travelId)})
-            # Add new links
-            for pid in data["peopleId"]:
-                try:
-                    travel_people_repo.add_travel_person({
-                        "travelId": ObjectId(travelId),
-                        "peopleId": ObjectId(pid)
-                    })
-                except Exception:
-                    travel_people_repo.add_travel_person({
-                        "travelId": ObjectId(travelId),
-                        "peopleId": pid
-                    })
-
-        # -- Update places links --
+            travel_people_repo.replace_travel_person(
+                {"travelId": ObjectId(travelId)},
+                [
+                    {"travelId": ObjectId(travelId), "peopleId": to_object_id(pid)}
+                    for pid in data["peopleId"]
+                ]
+            )
+
+        # -- Update places links (replace all in one bulk write) --
         if "places" in data:
-            travel_places_repo.delete_travel_place({"travelId": ObjectId(travelId)})
-            for place in data["places"]:
-                travel_places_repo.add_travel_place({
-                    "travelId": ObjectId(travelId),
-                    
-                    "placeId": place.get("id"),
-                    "order": place.get("order")
-                })
+            travel_places_repo.replace_travel_place(
+                {"travelId": ObjectId(travelId)},
+                [
+                    {
+                        "travelId": ObjectId(travelId),
+                        "placeId": place.get("id"),
+                        "order": place.get("order")
+                    }
+                    for place in data["places"]
+                ]
+            )
+
+        if stats_before is not None:
+            person_stats_repo.apply_travel_change(stats_before, dict(
+                stats_before,
+                **update_doc,
+                people=[to_object_id(pid) for pid in data["peopleId"]] if "peopleId" in data
+                else stats_before["people"]
+            ))
 
         return "", 200
 
@@ -396,12 +642,12 @@ def delete_travel(travelId):
 
         travel_oid = ObjectId(travelId)
 
-        # Remove travel document
-        travel_repo.delete_travel({"_id": travel_oid})
+        stats_before = get_travel_stats_state(travel_oid)
 
-        # Remove associated people and places links
-        travel_people_repo.delete_travel_person({"travelId": travel_oid})
-        travel_places_repo.delete_travel_place({"travelId": travel_oid})
+        # Remove travel document and all of its people/places links
+        deleted = travel_repo.delete_travel_cascade({"_id": travel_oid})
+        if deleted[travel_repo.collection_name]:
+            person_stats_repo.apply_travel_change(stats_before, None)
 
         return "", 200
 
@@ -447,27 +693,26 @@ def create_travel():
             "date": date
         })
 
-        # Link people to the travel
-        for pid in people_ids:
-            try:
-                travel_people_repo.add_travel_person({
-                    "travelId": travel_id,
-                    "peopleId": ObjectId(pid)
-                })
-            except Exception:
-                # If pid is not a valid ObjectId, store as raw string
-                travel_people_repo.add_travel_person({
-                    "travelId": travel_id,
-                    "peopleId": pid
-                })
+        # Link people to the travel (invalid ObjectIds are stored as raw strings)
+        people = [to_object_id(pid) for pid in people_ids]
+        travel_people_repo.add_travel_person_many([
+            {"travelId": travel_id, "peopleId": person}
+            for person in people
+        ])
 
         # Link places to the travel
-        for place in places:
-            travel_places_repo.add_travel_place({
+        travel_places_repo.add_travel_place_many([
+            {
                 "travelId": travel_id,
                 "placeId": place.get("id"),
                 "order": place.get("order")
-            })
+            }
+            for place in places
+        ])
+
+        person_stats_repo.apply_travel_change(None, {
+            "_id": travel_id, "date": date, "name": name, "people": people
+        })
 
         response = {
             "id": str(travel_id),
@@ -485,7 +730,46 @@ def create_travel():
 
 # ---------------------------------------------------------------------------
 # New route: Recommend places based on a prompt and selected people
+def new_recommend_context():
+    return get_pipeline(
+        photo_repo=photo_repo,
+        people_repo=people_repo,
+        photo_people_repo=photo_people_repo
+    ).new_context()
+
+
+def parse_recommend_args():
+    """
+    prompt and peopleId from the query string, form or JSON body.
+    Raises ValueError when prompt is missing or peopleId is malformed.
+    """
+    prompt = request.args.get("prompt") or request.form.get("prompt", "")
+    people_ids = request.args.getlist("peopleId") or request.form.getlist("peopleId")
+
+    # Fallback to JSON body if provided
+    if not prompt or not people_ids:
+        data = request.get_json(silent=True) or {}
+        prompt = prompt or data.get("prompt", "")
+        people_ids = people_ids or data.get("peopleId", [])
+
+    # Basic validation
+    if not prompt:
+        raise ValueError("prompt is required")
+    if isinstance(people_ids, str):
+        people_ids = [pid.strip() for pid in people_ids.split(",") if pid.strip()]
+    if not isinstance(people_ids, list):
+        raise ValueError("Invalid peopleId")
+    return prompt, people_ids
+
+
+# 비동기 추천 작업 (POST /api/recommend?async=1). 워커 프로세스마다 제한된 스레드 풀에서 실행
+recommend_jobs = RecommendJobRunner(new_recommend_context, recommend_job_repo, cache=recommend_cache)
+RECOMMEND_RETRY_AFTER = 5
+
+
 @app.route("/api/recommend", methods=["POST"])
+@admission_pool(llm_pool)
+@read_preference(SECONDARY_PREFERRED)
 def recommend_places():
     """
     Generates place recommendations using a TOT pipeline.
@@ -507,65 +791,179 @@ def recommend_places():
     }
 
     Error Response (400) – malformed peopleId or internal failure.
+    Error Response (429) – too many concurrent recommendations or per-client
+    rate limit exceeded; retry after the Retry-After header (seconds).
+
+    Results are cached per normalized prompt, peopleId set and time window
+    (X-Cache: HIT | MISS); photo changes for those people invalidate them.
+
+    Async mode (?async=1):
+        Returns 202 {"jobId": str, "status": "queued"} immediately with a
+        Location header; poll GET /api/recommend/<jobId> for the result.
+        Returns 503 with Retry-After when the job queue is full.
     """
     # --- 1) Retrieve parameters ------------------------------------------------
-    prompt = request.args.get("prompt") or request.form.get("prompt", "")
-    people_ids = request.args.getlist("peopleId") or request.form.getlist("peopleId")
+    try:
+        prompt, people_ids = parse_recommend_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    # Fallback to JSON body if provided
-    if not prompt or not people_ids:
-        data = request.get_json(silent=True) or {}
-        prompt = prompt or data.get("prompt", "")
-        people_ids = people_ids or data.get("peopleId", [])
+    if request.args.get("async") == "1":
+        try:
+            job_id = recommend_jobs.submit(prompt, people_ids)
+        except JobQueueFull as e:
+            return jsonify({"error": str(e)}), 503, {"Retry-After": str(RECOMMEND_RETRY_AFTER)}
+        return jsonify({"jobId": job_id, "status": "queued"}), 202, {"Location": f"/api/recommend/{job_id}"}
 
-    # Basic validation
-    if not prompt:
-        return jsonify({"error": "prompt is required"}), 400
-    if isinstance(people_ids, str):
-        people_ids = [pid.strip() for pid in people_ids.split(",") if pid.strip()]
-    if not isinstance(people_ids, list):
-        return jsonify({"error": "Invalid peopleId"}), 400
+    # --- 2) Same prompt and people within the cache window: reuse the result
+    cached = recommend_cache.lookup(prompt, people_ids)
+    if cached.hit:
+        return jsonify(cached.value), 200, {"X-Cache": "HIT"}
 
-    # --- 2) Build TOT pipeline -------------------------------------------------
+    # --- 3) Run TOT pipeline (heavy objects are built once per worker) ------
     try:
-        tools = Tools(
-            photo_repo=photo_repo,
-            people_repo=people_repo,
-            photo_people_repo=photo_people_repo
-        )
-        planner = TOTPlanner(api_key=os.getenv("GOOGLE_API_KEY", ""), tools=tools)
-        executor = TOTExecutor(api_key=os.getenv("GOOGLE_SEARCH_CX", ""), tools=tools)
-
-        # Build and execute a single TOT plan
-        steps = planner.build_full_plan(prompt)
-        plan = {"steps": steps}
-        results = executor.execute_plan(plan, prompt)
-
-        # --- 3) Extract recommended places ------------------------------------
-        recommended_places = []
-        # Try to locate a "places" list either in step results or final summary
-        for step in results.get("steps", []):
-            res = step.get("result", {})
-            if isinstance(res, dict) and "places" in res:
-                recommended_places = res["places"]
-                break
-        if not recommended_places and isinstance(results.get("final_summary"), dict):
-            recommended_places = results["final_summary"].get("places", [])
-
-        # Normalise output shape
-        formatted = []
-        for idx, place in enumerate(recommended_places):
-            formatted.append({
-                "id": str(place.get("id", "")),
-                "order": int(place.get("order", idx)),
-                "name": place.get("name", ""),
-                "location": place.get("location", [])
-            })
+        results = new_recommend_context().run(prompt)
 
-        return jsonify({"places": formatted}), 200
+        # --- 4) Extract recommended places ------------------------------------
+        response = {"places": extract_places(results)}
+        if response["places"] and not results.get("error"):
+            cached.store(response)
+        return jsonify(response), 200, {"X-Cache": "MISS"}
 
     except Exception as e:
         return jsonify({"error": str(e)}), 400
+
+
+@app.route("/api/recommend/stream", methods=["GET", "POST"])
+@admission_pool(llm_pool)
+@read_preference(SECONDARY_PREFERRED)
+def stream_recommend_places():
+    """
+    Streaming variant of POST /api/recommend as Server-Sent Events
+    (GET works with EventSource). Takes the same prompt/peopleId parameters.
+
+    Events (data is JSON):
+        plan_step     each planned step as soon as the planner produces it
+        step_result   {"stepId", "toolId", "summary", "analysis"} after each executed step
+        place         each recommended place ({"id", "order", "name", "location"})
+        done          {"places": [...]} (plus "error" if execution stopped early,
+                      or "cached": true when served from the recommend cache)
+        error         {"error": str} if the pipeline failed
+
+    Error Response (400) – missing prompt or malformed peopleId (before streaming starts).
+    Error Response (429) – same admission limits as POST /api/recommend.
+    """
+    try:
+        prompt, people_ids = parse_recommend_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    cached = recommend_cache.lookup(prompt, people_ids)
+
+    def produce(emit):
+        if cached.hit:
+            for place in cached.value["places"]:
+                emit("place", place)
+            emit("done", dict(cached.value, cached=True))
+            return
+        results = new_recommend_context().run(prompt, on_event=emit)
+        done = {"places": extract_places(results)}
+        if results.get("error"):
+            done["error"] = results["error"]
+        elif done["places"]:
+            cached.store(done)
+        emit("done", done)
+
+    return stream_events(produce)
+
+
+@app.route("/api/recommend/<jobId>", methods=["GET"])
+def get_recommend_job(jobId):
+    """
+    Status and result of an async recommend job.
+
+    Response Body Example:
+    {
+        "jobId": str,
+        "status": "queued" | "running" | "done" | "failed",
+        "places": [...],        # when done
+        "error": str            # when failed
+    }
+
+    404 if the job does not exist or its result has expired.
+    """
+    job = recommend_job_repo.get_job(jobId)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    response = {"jobId": str(job["_id"]), "status": job["status"]}
+    if "result" in job:
+        response.update(job["result"])
+    if "error" in job:
+        response["error"] = job["error"]
+    return jsonify(response), 200
+
+
+@app.route("/api/sync", methods=["GET"])
+def sync_changes():
+    """
+    Incremental sync for the mobile client.
+
+    Returns the documents created or modified and the ids deleted since the
+    given token, grouped by collection (people, photos, travels and their link
+    collections). Store the returned token and pass it on the next call.
+    Changes close to the token time may be sent again; apply them idempotently.
+
+    Query params:
+        since (str) – token from the previous sync response (omit on first sync)
+
+    Response Body Example:
+    {
+        "token": str,
+        "reset": bool,          # true: refetch the full lists, then sync from this token
+        "changes": {"photos": [{...}], "travel_people": [{...}]},
+        "deleted": {"photos": [str], "photoTags": [str]}
+    }
+    """
+    try:
+        result = sync_repo.get_changes(request.args.get("since"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    for photo in result["changes"].get("photos", []):
+        if "location" in photo:
+            photo["location"] = from_geojson(photo["location"])
+    return jsonify(result), 200
+
+@app.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    """
+    MongoDB command metrics collected since start-up (or the last reset).
+
+    Response: per-collection/operation latency histograms (ms), document counts,
+    request/reply payload sizes, the same broken down by route, and the most
+    recent slow queries with their query shape, plus per-pool admission
+    counters (active, waiting, admitted, rejected) when admission control is on.
+
+    Read-only; use POST /api/metrics/reset to clear the counters.
+    """
+    snapshot = command_metrics.snapshot()
+    if admission is not None:
+        snapshot["admission"] = admission.snapshot()
+    return jsonify(snapshot), 200
+
+
+@app.route("/api/metrics/reset", methods=["POST"])
+def reset_metrics():
+    """
+    Return the MongoDB command metrics and clear the counters.
+
+    When METRICS_ADMIN_TOKEN is set, the request must carry the same value in
+    the X-Admin-Token header (403 otherwise).
+    """
+    admin_token = os.getenv("METRICS_ADMIN_TOKEN")
+    if admin_token and not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), admin_token):
+        return jsonify({"error": "Forbidden"}), 403
+    snapshot = command_metrics.snapshot()
+    command_metrics.reset()
+    return jsonify(snapshot), 200
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
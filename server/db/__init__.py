@@ -1,5 +1,6 @@
+from .connection import MongoClientRegistry, MongoUnavailable, registry, get_mongo_client
 from .db import MongoDBClient
-from .people import PeopleRepository
+from .people import PeopleRepository, CachedPeopleRepository
 from .photos import PhotoRepository
 from .photo_people import PhotoPeopleRepository
-__all__ = ["MongoDBClient", "PeopleRepository", "PhotoRepository", "PhotoPeopleRepository"]
\ No newline at end of file
+__all__ = ["MongoClientRegistry", "MongoUnavailable", "registry", "get_mongo_client", "MongoDBClient", "PeopleRepository", "CachedPeopleRepository", "PhotoRepository", "PhotoPeopleRepository"]
\ No newline at end of file
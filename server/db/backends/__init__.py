@@ -0,0 +1,32 @@
+"""
+MongoDBClient 아래의 저장소 엔진.
+
+    mongo   pymongo로 실제 MongoDB 서버에 연결 (기본값)
+    memory  프로세스 안의 인메모리 엔진 (DB 없이 부하 테스트·벤치마크용)
+
+엔진은 MongoDBClient(backend=...) 인자나 SKYST_STORAGE 환경 변수로 선택합니다.
+    SKYST_STORAGE=memory python app.py
+"""
+import os
+
+from .base import StorageBackend
+
+BACKENDS = ("mongo", "memory")
+
+
+def get_backend(name: str, uri: str, db_name: str, **client_options) -> StorageBackend:
+    """
+    이름으로 저장소 엔진 생성. memory 엔진은 db_name별로 프로세스 안에서 공유합니다.
+    client_options는 mongo 엔진의 MongoClient 생성 옵션으로 전달됩니다.
+    """
+    name = (name or os.getenv("SKYST_STORAGE") or "mongo").lower()
+    if name == "mongo":
+        from .mongo import MongoBackend
+        return MongoBackend(uri, db_name, **client_options)
+    if name == "memory":
+        from .memory import get_memory_backend
+        return get_memory_backend(db_name)
+    raise ValueError(f"Unknown storage backend: {name} (choose from {', '.join(BACKENDS)})")
+
+
+__all__ = ["BACKENDS", "StorageBackend", "get_backend"]
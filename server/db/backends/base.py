@@ -0,0 +1,65 @@
+from typing import Iterable, List
+
+
+class StorageBackend:
+    """
+    MongoDBClient 아래에서 실제 저장소 작업을 수행하는 엔진 인터페이스.
+
+    쿼리·업데이트·집계 문법은 MongoDB 형식을 그대로 사용하며,
+    반환값도 pymongo 결과 객체와 같은 속성(inserted_id, matched_count 등)을 가집니다.
+    """
+
+    name = "base"
+
+    def ping(self):
+        """저장소 연결 상태 확인. 실패 시 db.connection.MongoUnavailable (ConnectionFailure)"""
+        raise NotImplementedError
+
+    def insert_one(self, collection_name: str, document: dict):
+        raise NotImplementedError
+
+    def insert_many(self, collection_name: str, documents: list, ordered: bool = False):
+        raise NotImplementedError
+
+    def bulk_write(self, collection_name: str, requests: list, ordered: bool = False):
+        raise NotImplementedError
+
+    def find(
+        self,
+        collection_name: str,
+        query: dict,
+        projection: dict = None,
+        sort: list = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = None,
+        raw: bool = False,
+        read_preference: str = None
+    ) -> Iterable[dict]:
+        """
+        raw=True이면 RawBSONDocument로 반환 (필드 접근 시점에만 디코딩).
+        read_preference는 db.read_preference의 모드 이름 (없으면 클라이언트 기본값)
+        """
+        raise NotImplementedError
+
+    def aggregate(self, collection_name: str, pipeline: list, read_preference: str = None) -> Iterable[dict]:
+        raise NotImplementedError
+
+    def watch(self, collection_name: str, pipeline: list = None, resume_after: dict = None):
+        """resume_after는 이전 change stream의 resume token (그 이후 변경부터 이어서 받음)"""
+        raise NotImplementedError
+
+    def explain(self, collection_name: str, query: dict, sort: list = None) -> dict:
+        raise NotImplementedError
+
+    def create_indexes(self, collection_name: str, indexes: list) -> List[str]:
+        raise NotImplementedError
+
+    def update_one(self, collection_name: str, query: dict, update: dict, upsert: bool = False):
+        raise NotImplementedError
+
+    def delete_one(self, collection_name: str, query: dict):
+        raise NotImplementedError
+
+    def delete_many(self, collection_name: str, query: dict):
+        raise NotImplementedError
@@ -0,0 +1,1069 @@
+import copy
+import datetime
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+from ..geo import EARTH_RADIUS_M
+from .base import StorageBackend
+
+_MISSING = object()
+
+# MongoDB 정렬 시 타입 간 비교 순서 (null < 숫자 < 문자열 < 객체 < 배열 < ObjectId < bool < 날짜)
+_TYPE_ORDER = {
+    type(None): 1, int: 2, float: 2, str: 3, dict: 4, list: 5,
+    ObjectId: 7, bool: 8, datetime.datetime: 9,
+}
+
+_TYPE_ALIASES = {
+    "null": (type(None),), "double": (float,), "int": (int,), "long": (int,),
+    "number": (int, float), "string": (str,), "object": (dict,), "array": (list,),
+    "objectId": (ObjectId,), "bool": (bool,), "date": (datetime.datetime,),
+}
+
+
+def _type_rank(value) -> int:
+    return _TYPE_ORDER.get(type(value), 6)
+
+
+def _sort_key(value):
+    """타입 순서를 먼저 비교하는 정렬 키 (서로 다른 타입이 섞여도 비교 가능)"""
+    rank = _type_rank(value)
+    if isinstance(value, dict):
+        return rank, [(k, _sort_key(v)) for k, v in value.items()]
+    if isinstance(value, list):
+        return rank, [_sort_key(v) for v in value]
+    if value is None:
+        return rank, 0
+    if isinstance(value, ObjectId):
+        return rank, value.binary
+    return rank, value
+
+
+def _comparable(a, b) -> bool:
+    """$gt/$lt 등 범위 비교는 같은 타입 계열끼리만 성립"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool)
+    return _type_rank(a) == _type_rank(b) and a is not None
+
+
+def _values_equal(a, b) -> bool:
+    if isinstance(a, bool) != isinstance(b, bool):
+        return False
+    return a == b
+
+
+def _resolve(doc, parts: List[str]) -> List[Any]:
+    """
+    점 표기 경로의 값을 모두 반환.
+    중간 경로의 배열은 원소마다 펼쳐서 따라가고, 마지막 값이 배열이면 그대로 둡니다.
+    """
+    if not parts:
+        return [doc]
+    head, rest = parts[0], parts[1:]
+    if isinstance(doc, dict):
+        if head not in doc:
+            return []
+        return _resolve(doc[head], rest)
+    if isinstance(doc, list):
+        if head.isdigit():
+            index = int(head)
+            return _resolve(doc[index], rest) if index < len(doc) else []
+        values = []
+        for item in doc:
+            if isinstance(item, (dict, list)):
+                values.extend(_resolve(item, parts))
+        return values
+    return []
+
+
+def _candidates(values: List[Any]) -> List[Any]:
+    """비교 대상 값 목록: 배열 값은 배열 자체와 각 원소 모두 비교"""
+    out = []
+    for value in values:
+        out.append(value)
+        if isinstance(value, list):
+            out.extend(value)
+    return out
+
+
+def _get_path(doc: dict, path: str):
+    values = _resolve(doc, path.split("."))
+    if not values:
+        return _MISSING
+    return values[0] if len(values) == 1 else values
+
+
+def _set_path(doc: dict, path: str, value):
+    parts = path.split(".")
+    target = doc
+    for part in parts[:-1]:
+        if isinstance(target, list) and part.isdigit():
+            target = target[int(part)]
+            continue
+        nested = target.get(part)
+        if not isinstance(nested, (dict, list)):
+            nested = {}
+            target[part] = nested
+        target = nested
+    if isinstance(target, list) and parts[-1].isdigit():
+        target[int(parts[-1])] = value
+    else:
+        target[parts[-1]] = value
+
+
+def _unset_path(doc: dict, path: str):
+    parts = path.split(".")
+    target = doc
+    for part in parts[:-1]:
+        target = target.get(part) if isinstance(target, dict) else None
+        if target is None:
+            return
+    if isinstance(target, dict):
+        target.pop(parts[-1], None)
+
+
+def _point_of(value) -> Optional[Tuple[float, float]]:
+    """GeoJSON Point 또는 [lng, lat] 레거시 좌표에서 (lng, lat) 추출"""
+    if isinstance(value, dict) and value.get("type") == "Point":
+        value = value.get("coordinates")
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        try:
+            return float(value[0]), float(value[1])
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _haversine(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """두 (lng, lat) 좌표 사이의 구면 거리(미터)"""
+    lng1, lat1, lng2, lat2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _tokenize(text) -> List[str]:
+    if isinstance(text, list):
+        return [token for item in text for token in _tokenize(item)]
+    if not isinstance(text, str):
+        return []
+    return re.findall(r"\w+", text.lower())
+
+
+class _Index:
+    """
+    단일 필드(복합 인덱스는 첫 번째 키) 해시 인덱스.
+    배열 필드는 원소마다 등록(multikey)하고, 해시할 수 없는 값은 항상 후보로 취급합니다.
+    """
+
+    def __init__(self, name: str, keys: List[Tuple[str, Any]]):
+        self.name = name
+        self.keys = keys
+        self.field = keys[0][0]
+        self.entries: Dict[Any, set] = {}
+        self.unhashable: set = set()
+
+    def _keys_of(self, doc: dict) -> List[Any]:
+        values = _resolve(doc, self.field.split("."))
+        if not values:
+            return [None]
+        keys = []
+        for value in _candidates(values):
+            if isinstance(value, list) and not value:
+                keys.append(None)
+                continue
+            if isinstance(value, (list, dict)):
+                continue
+            keys.append(value)
+        return keys
+
+    def add(self, key, doc: dict):
+        for value in self._keys_of(doc):
+            try:
+                self.entries.setdefault(value, set()).add(key)
+            except TypeError:
+                self.unhashable.add(key)
+
+    def remove(self, key, doc: dict):
+        for value in self._keys_of(doc):
+            try:
+                bucket = self.entries.get(value)
+            except TypeError:
+                continue
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.entries[value]
+        self.unhashable.discard(key)
+
+    def lookup(self, values: Iterable[Any]) -> Optional[set]:
+        found = set(self.unhashable)
+        for value in values:
+            try:
+                found |= self.entries.get(value, set())
+            except TypeError:
+                return None
+        return found
+
+
+class _Collection:
+    def __init__(self, name: str):
+        self.name = name
+        self.docs: "OrderedDict[Any, dict]" = OrderedDict()
+        # 삽입 순번 (인덱스 후보를 자연 순서로 정렬할 때 사용)
+        self.seq: Dict[Any, int] = {}
+        self._next_seq = 0
+        self.indexes: Dict[str, _Index] = {}
+        self.specs: Dict[str, dict] = {}
+
+    def text_spec(self) -> Optional[dict]:
+        for spec in self.specs.values():
+            if any(kind == "text" for kind in spec["key"].values()):
+                return spec
+        return None
+
+    def has_geo_index(self, field: str) -> bool:
+        return any(
+            spec["key"].get(field) in ("2dsphere", "2d") for spec in self.specs.values()
+        )
+
+    def insert(self, doc: dict):
+        key = doc["_id"]
+        if key in self.docs:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.name} index: _id_ dup key: {key!r}"
+            )
+        self.docs[key] = doc
+        self.seq[key] = self._next_seq
+        self._next_seq += 1
+        for index in self.indexes.values():
+            index.add(key, doc)
+
+    def remove(self, key):
+        doc = self.docs.pop(key)
+        del self.seq[key]
+        for index in self.indexes.values():
+            index.remove(key, doc)
+
+    def replace(self, key, new_doc: dict):
+        old = self.docs[key]
+        for index in self.indexes.values():
+            index.remove(key, old)
+        self.docs[key] = new_doc
+        for index in self.indexes.values():
+            index.add(key, new_doc)
+
+
+class _Matcher:
+    """MongoDB 쿼리 문서를 평가하는 매처. $text 점수와 $near 거리는 문서별로 기록합니다."""
+
+    def __init__(self, collection: _Collection, query: dict):
+        self.collection = collection
+        self.query = query or {}
+        self.scores: Dict[Any, float] = {}
+        self.distances: Dict[Any, float] = {}
+        self.near_field: Optional[str] = None
+        self._in_sets: Dict[int, tuple] = {}
+        self._text = self._prepare_text(self.query.get("$text"))
+
+    def _prepare_text(self, text):
+        if text is None:
+            return None
+        spec = self.collection.text_spec()
+        if spec is None:
+            raise OperationFailure("text index required for $text query", code=27)
+        fields = [field for field, kind in spec["key"].items() if kind == "text"]
+        weights = spec.get("weights") or {}
+        terms = set(_tokenize(text.get("$search", "")))
+        return [(field, weights.get(field, 1)) for field in fields], terms
+
+    def matches(self, doc: dict) -> bool:
+        return self._match_doc(doc, self.query)
+
+    def _match_doc(self, doc: dict, query: dict) -> bool:
+        for key, cond in query.items():
+            if key == "$and":
+                if not all(self._match_doc(doc, sub) for sub in cond):
+                    return False
+            elif key == "$or":
+                if not any(self._match_doc(doc, sub) for sub in cond):
+                    return False
+            elif key == "$nor":
+                if any(self._match_doc(doc, sub) for sub in cond):
+                    return False
+            elif key == "$text":
+                if not self._match_text(doc):
+                    return False
+            elif key.startswith("$"):
+                raise OperationFailure(f"unknown top level operator: {key}", code=2)
+            elif not self._match_field(doc, key, cond):
+                return False
+        return True
+
+    def _match_text(self, doc: dict) -> bool:
+        fields, terms = self._text
+        score = 0.0
+        for field, weight in fields:
+            tokens = _tokenize(_candidates(_resolve(doc, field.split("."))))
+            if not tokens:
+                continue
+            hits = sum(1 for token in tokens if token in terms)
+            if hits:
+                score += weight * (hits / len(tokens) + 0.5)
+        if score <= 0:
+            return False
+        self.scores[doc["_id"]] = score
+        return True
+
+    def _match_field(self, doc: dict, path: str, cond) -> bool:
+        values = _resolve(doc, path.split("."))
+        if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+            return all(self._apply_operator(doc, path, values, op, arg, cond) for op, arg in cond.items())
+        if isinstance(cond, re.Pattern):
+            return any(isinstance(v, str) and cond.search(v) for v in _candidates(values))
+        return self._equals(values, cond)
+
+    @staticmethod
+    def _equals(values: List[Any], target) -> bool:
+        if target is None and not values:
+            return True
+        return any(_values_equal(v, target) for v in _candidates(values))
+
+    def _match_in(self, values: List[Any], targets: list) -> bool:
+        # 해시 가능한 값은 집합으로 한 번에 비교 (bool과 숫자 1/0은 구분)
+        lookup = self._in_sets.get(id(targets))
+        if lookup is None:
+            hashable, others = set(), []
+            for target in targets:
+                try:
+                    hashable.add((isinstance(target, bool), target))
+                except TypeError:
+                    others.append(target)
+            lookup = self._in_sets[id(targets)] = (hashable, others, (False, None) in hashable)
+        hashable, others, has_null = lookup
+        if has_null and not values:
+            return True
+        for value in _candidates(values):
+            try:
+                if (isinstance(value, bool), value) in hashable:
+                    return True
+            except TypeError:
+                pass
+        return any(self._equals(values, target) for target in others)
+
+    def _apply_operator(self, doc, path, values, op, arg, cond) -> bool:
+        candidates = _candidates(values)
+        if op == "$eq":
+            return self._equals(values, arg)
+        if op == "$ne":
+            return not self._equals(values, arg)
+        if op == "$in":
+            return self._match_in(values, arg)
+        if op == "$nin":
+            return not self._match_in(values, arg)
+        if op == "$exists":
+            return bool(values) == bool(arg)
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            return any(self._compare(v, op, arg) for v in candidates)
+        if op == "$type":
+            kinds = arg if isinstance(arg, list) else [arg]
+            types = tuple(t for kind in kinds for t in _TYPE_ALIASES.get(kind, ()))
+            return any(
+                isinstance(v, types) and not (isinstance(v, bool) and bool not in types)
+                for v in values
+            )
+        if op == "$regex":
+            pattern = re.compile(arg, re.IGNORECASE if "i" in cond.get("$options", "") else 0)
+            return any(isinstance(v, str) and pattern.search(v) for v in candidates)
+        if op == "$options":
+            return True
+        if op == "$size":
+            return any(isinstance(v, list) and len(v) == arg for v in values)
+        if op == "$all":
+            return all(self._equals(values, target) for target in arg)
+        if op == "$elemMatch":
+            return any(
+                isinstance(item, dict) and self._match_doc(item, arg)
+                for v in values if isinstance(v, list) for item in v
+            )
+        if op == "$not":
+            return not self._match_field(doc, path, arg)
+        if op in ("$near", "$nearSphere"):
+            return self._match_near(doc, path, values, arg)
+        if op == "$geoWithin":
+            return self._match_within(values, arg)
+        if op in ("$maxDistance", "$minDistance"):
+            return True
+        raise OperationFailure(f"unknown operator: {op}", code=2)
+
+    @staticmethod
+    def _compare(value, op, arg) -> bool:
+        if not _comparable(value, arg):
+            return False
+        if op == "$gt":
+            return value > arg
+        if op == "$gte":
+            return value >= arg
+        if op == "$lt":
+            return value < arg
+        return value <= arg
+
+    def _match_near(self, doc, path, values, arg) -> bool:
+        if not self.collection.has_geo_index(path):
+            raise OperationFailure("unable to find index for $geoNear query", code=291)
+        self.near_field = path
+        geometry = arg.get("$geometry", arg) if isinstance(arg, dict) else arg
+        origin = _point_of(geometry)
+        max_distance = arg.get("$maxDistance") if isinstance(arg, dict) else None
+        min_distance = arg.get("$minDistance") if isinstance(arg, dict) else None
+        points = [p for p in (_point_of(v) for v in values) if p is not None]
+        if origin is None or not points:
+            return False
+        distance = min(_haversine(origin, p) for p in points)
+        if max_distance is not None and distance > max_distance:
+            return False
+        if min_distance is not None and distance < min_distance:
+            return False
+        self.distances[doc["_id"]] = distance
+        return True
+
+    @staticmethod
+    def _match_within(values, arg) -> bool:
+        points = [p for p in (_point_of(v) for v in values) if p is not None]
+        if "$centerSphere" in arg:
+            center, radians = arg["$centerSphere"]
+            origin = _point_of(center)
+            return any(_haversine(origin, p) <= radians * EARTH_RADIUS_M for p in points)
+        if "$box" in arg:
+            (min_lng, min_lat), (max_lng, max_lat) = arg["$box"]
+            return any(min_lng <= p[0] <= max_lng and min_lat <= p[1] <= max_lat for p in points)
+        raise OperationFailure("unsupported $geoWithin shape", code=2)
+
+
+def _project(doc: dict, projection: Optional[dict], score: Optional[float] = None) -> dict:
+    """projection 적용 후 사본 반환 (원본 저장 문서는 절대 노출하지 않음)"""
+    if not projection:
+        return copy.deepcopy(doc)
+
+    meta = {k: v for k, v in projection.items() if isinstance(v, dict) and "$meta" in v}
+    fields = {k: v for k, v in projection.items() if k not in meta}
+    include_id = bool(fields.pop("_id", 1))
+    # {"_id": 1}만 있는 projection도 inclusion (MongoDB는 _id만 반환)
+    inclusive = any(bool(v) for v in fields.values()) or (not fields and "_id" in projection and include_id)
+
+    if inclusive:
+        out = {}
+        if include_id and "_id" in doc:
+            out["_id"] = copy.deepcopy(doc["_id"])
+        for path, flag in fields.items():
+            if not flag:
+                continue
+            value = _get_path(doc, path)
+            if value is not _MISSING:
+                _set_path(out, path, copy.deepcopy(value))
+    else:
+        out = copy.deepcopy(doc)
+        for path in fields:
+            _unset_path(out, path)
+        if not include_id:
+            out.pop("_id", None)
+
+    for name in meta:
+        out[name] = score if score is not None else 0.0
+    return out
+
+
+def _apply_sort(docs: List[dict], sort: List[Tuple[str, Any]], scores: Dict[Any, float] = None) -> List[dict]:
+    for field, direction in reversed(list(sort)):
+        if isinstance(direction, dict) and direction.get("$meta") == "textScore":
+            docs.sort(key=lambda d: (scores or {}).get(d.get("_id"), d.get(field, 0.0)), reverse=True)
+            continue
+        reverse = direction in (-1, "-1", "desc", "descending")
+
+        def key(doc, field=field, reverse=reverse):
+            values = _candidates(_resolve(doc, field.split(".")))
+            values = [v for v in values if not isinstance(v, list)] or [None]
+            # 배열은 오름차순이면 최솟값, 내림차순이면 최댓값 기준
+            keys = [_sort_key(v) for v in values]
+            return max(keys) if reverse else min(keys)
+
+        docs.sort(key=key, reverse=reverse)
+    return docs
+
+
+def _eval_expr(doc: dict, expr):
+    """집계 표현식 중 "$필드" 참조와 리터럴만 지원"""
+    if isinstance(expr, str) and expr.startswith("$"):
+        value = _get_path(doc, expr[1:])
+        return None if value is _MISSING else value
+    if isinstance(expr, dict):
+        if len(expr) == 1:
+            op, arg = next(iter(expr.items()))
+            if op == "$size":
+                value = _eval_expr(doc, arg)
+                return len(value) if isinstance(value, list) else 0
+            if op == "$literal":
+                return arg
+            if op.startswith("$"):
+                raise OperationFailure(f"unsupported expression operator: {op}", code=168)
+        return {k: _eval_expr(doc, v) for k, v in expr.items()}
+    return expr
+
+
+def _apply_update(doc: dict, update: dict, inserting: bool = False) -> dict:
+    """업데이트 연산자 적용 후 새 문서 반환. 연산자가 없으면 대체(replace) 문서로 취급"""
+    if not any(key.startswith("$") for key in update):
+        new_doc = copy.deepcopy(update)
+        if "_id" in doc:
+            new_doc["_id"] = doc["_id"]
+        return new_doc
+
+    new_doc = copy.deepcopy(doc)
+    for op, fields in update.items():
+        for path, arg in fields.items():
+            current = _get_path(new_doc, path)
+            if op == "$set":
+                _set_path(new_doc, path, copy.deepcopy(arg))
+            elif op == "$setOnInsert":
+                if inserting:
+                    _set_path(new_doc, path, copy.deepcopy(arg))
+            elif op == "$unset":
+                _unset_path(new_doc, path)
+            elif op == "$inc":
+                _set_path(new_doc, path, (0 if current is _MISSING else current) + arg)
+            elif op == "$max":
+                if current is _MISSING or _sort_key(arg) > _sort_key(current):
+                    _set_path(new_doc, path, arg)
+            elif op == "$min":
+                if current is _MISSING or _sort_key(arg) < _sort_key(current):
+                    _set_path(new_doc, path, arg)
+            elif op == "$currentDate":
+                _set_path(new_doc, path, datetime.datetime.utcnow())
+            elif op in ("$push", "$addToSet"):
+                items = arg["$each"] if isinstance(arg, dict) and "$each" in arg else [arg]
+                array = list(current) if isinstance(current, list) else []
+                for item in items:
+                    if op == "$push" or item not in array:
+                        array.append(copy.deepcopy(item))
+                _set_path(new_doc, path, array)
+            elif op == "$pull":
+                if isinstance(current, list):
+                    if isinstance(arg, dict) and "$in" in arg:
+                        removed = arg["$in"]
+                        current = [item for item in current if item not in removed]
+                    else:
+                        current = [item for item in current if item != arg]
+                    _set_path(new_doc, path, current)
+            else:
+                raise OperationFailure(f"Unknown modifier: {op}", code=9)
+    return new_doc
+
+
+def _upsert_seed(query: dict) -> dict:
+    """upsert 시 쿼리의 동등 조건으로 새 문서의 초기 필드 구성"""
+    seed = {}
+    for key, cond in query.items():
+        if key == "$and":
+            for sub in cond:
+                seed.update(_upsert_seed(sub))
+        elif key.startswith("$"):
+            continue
+        elif isinstance(cond, dict) and any(k.startswith("$") for k in cond):
+            if "$eq" in cond:
+                _set_path(seed, key, copy.deepcopy(cond["$eq"]))
+        else:
+            _set_path(seed, key, copy.deepcopy(cond))
+    return seed
+
+
+class _Accumulator:
+    def __init__(self, op: str, expr):
+        self.op = op
+        self.expr = expr
+        self.values: List[Any] = []
+
+    def add(self, doc: dict):
+        self.values.append(_eval_expr(doc, self.expr))
+
+    def result(self):
+        values = self.values
+        if self.op == "$sum":
+            return sum(v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool))
+        if self.op == "$avg":
+            numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            return sum(numbers) / len(numbers) if numbers else None
+        if self.op == "$push":
+            return values
+        if self.op == "$addToSet":
+            unique = []
+            for value in values:
+                if value not in unique:
+                    unique.append(value)
+            return unique
+        present = [v for v in values if v is not None]
+        if self.op == "$max":
+            return max(present, key=_sort_key) if present else None
+        if self.op == "$min":
+            return min(present, key=_sort_key) if present else None
+        if self.op == "$first":
+            return values[0] if values else None
+        if self.op == "$last":
+            return values[-1] if values else None
+        raise OperationFailure(f"unknown group operator '{self.op}'", code=15952)
+
+
+class MemoryBackend(StorageBackend):
+    """
+    프로세스 안에서 동작하는 인메모리 엔진 (DB 없이 부하 테스트·벤치마크용).
+
+    - 지금까지 사용하는 쿼리 연산자($in, $ne, $exists, $or, 범위 비교, $text, $near, $geoWithin 등),
+      업데이트 연산자, bulk_write, 집계 스테이지($match/$project/$lookup/$unwind/$group 등)를 지원합니다.
+    - ensure_indexes로 등록한 인덱스의 첫 번째 필드로 해시 인덱스를 만들어
+      동등 조건과 $in 조회, $lookup 조인을 전체 스캔 없이 처리합니다.
+    - 저장·반환 시 문서를 복사하므로 호출자가 결과를 수정해도 저장 내용은 바뀌지 않습니다.
+
+    같은 db_name은 프로세스 안에서 하나의 인스턴스를 공유합니다 (get_memory_backend).
+    """
+
+    name = "memory"
+
+    def __init__(self, db_name: str):
+        self.db_name = db_name
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.RLock()
+
+    def _collection(self, name: str) -> _Collection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections.setdefault(name, _Collection(name))
+        return collection
+
+    def drop(self, collection_name: str = None):
+        """컬렉션(또는 전체 데이터베이스) 삭제"""
+        with self._lock:
+            if collection_name is None:
+                self._collections.clear()
+            else:
+                self._collections.pop(collection_name, None)
+
+    def ping(self):
+        return None
+
+    # 조회 -----------------------------------------------------------------
+
+    def _plan(self, collection: _Collection, query: dict) -> Tuple[Optional[List[Any]], str]:
+        """인덱스로 후보 문서 키를 좁힘. (후보 키 목록 또는 None, 사용한 인덱스 이름)"""
+        for field, cond in (query or {}).items():
+            if field.startswith("$"):
+                continue
+            if isinstance(cond, dict) and any(k.startswith("$") for k in cond):
+                if set(cond) - {"$in", "$eq"}:
+                    continue
+                targets = list(cond.get("$in", [])) + ([cond["$eq"]] if "$eq" in cond else [])
+            elif isinstance(cond, (dict, list)):
+                continue
+            else:
+                targets = [cond]
+
+            if field == "_id":
+                keys = []
+                for target in targets:
+                    try:
+                        if target in collection.docs:
+                            keys.append(target)
+                    except TypeError:
+                        break
+                else:
+                    return list(dict.fromkeys(keys)), "_id_"
+                continue
+
+            for index in collection.indexes.values():
+                if index.field != field:
+                    continue
+                found = index.lookup(targets)
+                if found is None:
+                    break
+                # 자연 순서(삽입 순) 유지
+                return sorted(found, key=collection.seq.__getitem__), index.name
+        return None, "COLLSCAN"
+
+    def _scan(self, collection: _Collection, query: dict) -> Tuple[List[dict], _Matcher]:
+        matcher = _Matcher(collection, query)
+        keys, _ = self._plan(collection, query)
+        docs = collection.docs.values() if keys is None else (collection.docs[key] for key in keys)
+        return [doc for doc in docs if matcher.matches(doc)], matcher
+
+    def _query(
+        self,
+        collection_name: str,
+        query: dict,
+        projection: dict = None,
+        sort: list = None,
+        skip: int = 0,
+        limit: int = 0
+    ) -> List[dict]:
+        with self._lock:
+            collection = self._collection(collection_name)
+            docs, matcher = self._scan(collection, query)
+            if matcher.near_field is not None and not sort:
+                docs.sort(key=lambda d: matcher.distances.get(d["_id"], 0.0))
+            if sort:
+                docs = _apply_sort(docs, sort, matcher.scores)
+            if skip:
+                docs = docs[skip:]
+            if limit:
+                docs = docs[:abs(limit)]
+            return [_project(doc, projection, matcher.scores.get(doc["_id"])) for doc in docs]
+
+    def find(
+        self,
+        collection_name: str,
+        query: dict,
+        projection: dict = None,
+        sort: list = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = None,
+        raw: bool = False,
+        read_preference: str = None
+    ):
+        # 단일 프로세스 엔진이므로 read_preference는 무시
+        docs = self._query(collection_name, query, projection, sort, skip, limit)
+        if raw:
+            # mongo 엔진과 같은 반환 타입을 위해 BSON으로 인코딩
+            return iter([RawBSONDocument(bson.encode(doc)) for doc in docs])
+        return iter(docs)
+
+    def explain(self, collection_name: str, query: dict, sort: list = None):
+        with self._lock:
+            collection = self._collection(collection_name)
+            keys, index_name = self._plan(collection, query)
+        if keys is None:
+            stage = {"stage": "COLLSCAN", "filter": query}
+        elif index_name == "_id_":
+            stage = {"stage": "IDHACK"}
+        else:
+            stage = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": index_name}}
+        if sort:
+            stage = {"stage": "SORT", "sortPattern": dict(sort), "inputStage": stage}
+        return {
+            "queryPlanner": {
+                "namespace": f"{self.db_name}.{collection_name}",
+                "winningPlan": stage,
+            },
+            "executionStats": {
+                "totalDocsExamined": len(collection.docs) if keys is None else len(keys),
+            },
+        }
+
+    # 집계 -----------------------------------------------------------------
+
+    def aggregate(self, collection_name: str, pipeline: list, read_preference: str = None):
+        with self._lock:
+            collection = self._collection(collection_name)
+            docs = None
+            stages = list(pipeline)
+            # 첫 $match는 인덱스를 사용
+            if stages and "$match" in stages[0]:
+                matched, matcher = self._scan(collection, stages.pop(0)["$match"])
+                docs = [copy.deepcopy(doc) for doc in matched]
+                for doc in docs:
+                    if doc["_id"] in matcher.scores:
+                        doc["$textScore"] = matcher.scores[doc["_id"]]
+            if docs is None:
+                docs = [copy.deepcopy(doc) for doc in collection.docs.values()]
+            docs = self._run_pipeline(collection, docs, stages)
+            for doc in docs:
+                doc.pop("$textScore", None)
+            return iter(docs)
+
+    def _run_pipeline(self, collection: _Collection, docs: List[dict], stages: list) -> List[dict]:
+        for stage in stages:
+            (name, spec), = stage.items()
+            if name == "$match":
+                matcher = _Matcher(collection, spec)
+                docs = [doc for doc in docs if matcher.matches(doc)]
+            elif name == "$project":
+                docs = [self._project_stage(doc, spec) for doc in docs]
+            elif name in ("$addFields", "$set"):
+                for doc in docs:
+                    for path, expr in spec.items():
+                        _set_path(doc, path, _eval_expr(doc, expr))
+            elif name == "$unset":
+                for doc in docs:
+                    for path in ([spec] if isinstance(spec, str) else spec):
+                        _unset_path(doc, path)
+            elif name == "$lookup":
+                docs = self._lookup_stage(docs, spec)
+            elif name == "$unwind":
+                docs = self._unwind_stage(docs, spec)
+            elif name == "$group":
+                docs = self._group_stage(docs, spec)
+            elif name == "$sort":
+                docs = _apply_sort(docs, list(spec.items()))
+            elif name == "$skip":
+                docs = docs[spec:]
+            elif name == "$limit":
+                docs = docs[:spec]
+            elif name == "$count":
+                docs = [{spec: len(docs)}] if docs else []
+            elif name == "$facet":
+                docs = [{
+                    key: self._run_pipeline(collection, [copy.deepcopy(doc) for doc in docs], sub)
+                    for key, sub in spec.items()
+                }]
+            else:
+                raise OperationFailure(f"Unrecognized pipeline stage name: '{name}'", code=40324)
+        return docs
+
+    @staticmethod
+    def _project_stage(doc: dict, spec: dict) -> dict:
+        plain = {}
+        computed = {}
+        for key, value in spec.items():
+            if isinstance(value, (bool, int)):
+                plain[key] = value
+            elif isinstance(value, dict) and "$meta" in value:
+                computed[key] = doc.get("$textScore", 0.0)
+            else:
+                computed[key] = _eval_expr(doc, value)
+        if computed and not any(v for k, v in plain.items() if k != "_id"):
+            plain.setdefault("_id", 1)
+            out = {"_id": doc["_id"]} if plain.get("_id") and "_id" in doc else {}
+        else:
+            out = _project(doc, plain)
+        for key, value in computed.items():
+            _set_path(out, key, value)
+        if "$textScore" in doc:
+            out["$textScore"] = doc["$textScore"]
+        return out
+
+    def _lookup_stage(self, docs: List[dict], spec: dict) -> List[dict]:
+        foreign = self._collection(spec["from"])
+        local_field = spec.get("localField")
+        foreign_field = spec.get("foreignField")
+        sub_pipeline = spec.get("pipeline")
+        for doc in docs:
+            if local_field:
+                values = _candidates(_resolve(doc, local_field.split(".")))
+                values = [v for v in values if not isinstance(v, list)]
+                if not values:
+                    values = [None]
+                matched, _ = self._scan(foreign, {foreign_field: {"$in": values}})
+            else:
+                matched = list(foreign.docs.values())
+            joined = [copy.deepcopy(item) for item in matched]
+            if sub_pipeline:
+                joined = self._run_pipeline(foreign, joined, sub_pipeline)
+            doc[spec["as"]] = joined
+        return docs
+
+    @staticmethod
+    def _unwind_stage(docs: List[dict], spec) -> List[dict]:
+        if isinstance(spec, str):
+            spec = {"path": spec}
+        path = spec["path"].lstrip("$")
+        preserve = spec.get("preserveNullAndEmptyArrays", False)
+        out = []
+        for doc in docs:
+            value = _get_path(doc, path)
+            if isinstance(value, list) and value:
+                for item in value:
+                    unwound = copy.deepcopy(doc)
+                    _set_path(unwound, path, item)
+                    out.append(unwound)
+            elif value is not _MISSING and value is not None and not isinstance(value, list):
+                out.append(doc)
+            elif preserve:
+                out.append(doc)
+        return out
+
+    @staticmethod
+    def _group_stage(docs: List[dict], spec: dict) -> List[dict]:
+        groups: "OrderedDict[Any, Tuple[Any, Dict[str, _Accumulator]]]" = OrderedDict()
+        for doc in docs:
+            group_id = _eval_expr(doc, spec["_id"])
+            key = repr(_sort_key(group_id))
+            if key not in groups:
+                accumulators = {}
+                for field, acc in spec.items():
+                    if field == "_id":
+                        continue
+                    (op, expr), = acc.items()
+                    accumulators[field] = _Accumulator(op, expr)
+                groups[key] = (group_id, accumulators)
+            for accumulator in groups[key][1].values():
+                accumulator.add(doc)
+        return [
+            dict({"_id": group_id}, **{field: acc.result() for field, acc in accumulators.items()})
+            for group_id, accumulators in groups.values()
+        ]
+
+    def watch(self, collection_name: str, pipeline: list = None, resume_after: dict = None):
+        # 같은 프로세스 안의 저장소이므로 캐시는 쓰기 경로의 무효화만으로 충분
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    # 인덱스 ---------------------------------------------------------------
+
+    def create_indexes(self, collection_name: str, indexes: list):
+        names = []
+        with self._lock:
+            collection = self._collection(collection_name)
+            for model in indexes:
+                spec = dict(getattr(model, "document", model))
+                keys = list(spec["key"].items())
+                name = spec.get("name") or "_".join(f"{field}_{kind}" for field, kind in keys)
+                spec["name"] = name
+                collection.specs[name] = spec
+                field, kind = keys[0]
+                if kind in (1, -1) and name not in collection.indexes:
+                    index = _Index(name, keys)
+                    for key, doc in collection.docs.items():
+                        index.add(key, doc)
+                    collection.indexes[name] = index
+                names.append(name)
+        return names
+
+    # 쓰기 -----------------------------------------------------------------
+
+    def _insert(self, collection: _Collection, document: dict):
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        collection.insert(copy.deepcopy(document))
+        return document["_id"]
+
+    def insert_one(self, collection_name: str, document: dict):
+        with self._lock:
+            return InsertOneResult(self._insert(self._collection(collection_name), document), True)
+
+    def insert_many(self, collection_name: str, documents: list, ordered: bool = False):
+        with self._lock:
+            collection = self._collection(collection_name)
+            ids = []
+            errors = []
+            for index, document in enumerate(documents):
+                try:
+                    ids.append(self._insert(collection, document))
+                except DuplicateKeyError as exc:
+                    errors.append({"index": index, "code": 11000, "errmsg": str(exc)})
+                    if ordered:
+                        break
+            if errors:
+                raise BulkWriteError({"writeErrors": errors, "nInserted": len(ids)})
+            return InsertManyResult(ids, True)
+
+    def _update(self, collection: _Collection, query: dict, update: dict, upsert: bool, multi: bool):
+        docs, _ = self._scan(collection, query)
+        if not multi:
+            docs = docs[:1]
+        modified = 0
+        for doc in docs:
+            new_doc = _apply_update(doc, update)
+            if new_doc != doc:
+                collection.replace(doc["_id"], new_doc)
+                modified += 1
+        upserted_id = None
+        if not docs and upsert:
+            seed = _upsert_seed(query)
+            new_doc = _apply_update(seed, update, inserting=True)
+            if "_id" not in new_doc:
+                new_doc["_id"] = seed.get("_id", ObjectId())
+            collection.insert(new_doc)
+            upserted_id = new_doc["_id"]
+        return len(docs), modified, upserted_id
+
+    def update_one(self, collection_name: str, query: dict, update: dict, upsert: bool = False):
+        with self._lock:
+            matched, modified, upserted_id = self._update(
+                self._collection(collection_name), query, update, upsert, multi=False
+            )
+        return UpdateResult({"n": matched or int(upserted_id is not None), "nModified": modified,
+                             "upserted": upserted_id}, True)
+
+    def update_many(self, collection_name: str, query: dict, update: dict, upsert: bool = False):
+        with self._lock:
+            matched, modified, upserted_id = self._update(
+                self._collection(collection_name), query, update, upsert, multi=True
+            )
+        return UpdateResult({"n": matched or int(upserted_id is not None), "nModified": modified,
+                             "upserted": upserted_id}, True)
+
+    def _delete(self, collection: _Collection, query: dict, multi: bool) -> int:
+        docs, _ = self._scan(collection, query)
+        if not multi:
+            docs = docs[:1]
+        for doc in docs:
+            collection.remove(doc["_id"])
+        return len(docs)
+
+    def delete_one(self, collection_name: str, query: dict):
+        with self._lock:
+            return DeleteResult({"n": self._delete(self._collection(collection_name), query, False)}, True)
+
+    def delete_many(self, collection_name: str, query: dict):
+        with self._lock:
+            return DeleteResult({"n": self._delete(self._collection(collection_name), query, True)}, True)
+
+    def bulk_write(self, collection_name: str, requests: list, ordered: bool = False):
+        result = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0,
+                  "nRemoved": 0, "upserted": [], "writeErrors": []}
+        with self._lock:
+            collection = self._collection(collection_name)
+            for index, request in enumerate(requests):
+                try:
+                    self._apply_request(collection, request, index, result)
+                except DuplicateKeyError as exc:
+                    result["writeErrors"].append({"index": index, "code": 11000, "errmsg": str(exc)})
+                    if ordered:
+                        break
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+        del result["writeErrors"]
+        return BulkWriteResult(result, True)
+
+    def _apply_request(self, collection: _Collection, request, index: int, result: dict):
+        if isinstance(request, InsertOne):
+            self._insert(collection, request._doc)
+            result["nInserted"] += 1
+        elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+            multi = isinstance(request, UpdateMany)
+            matched, modified, upserted_id = self._update(
+                collection, request._filter, request._doc, bool(request._upsert), multi
+            )
+            result["nMatched"] += matched
+            result["nModified"] += modified
+            if upserted_id is not None:
+                result["nUpserted"] += 1
+                result["upserted"].append({"index": index, "_id": upserted_id})
+        elif isinstance(request, (DeleteOne, DeleteMany)):
+            result["nRemoved"] += self._delete(collection, request._filter, isinstance(request, DeleteMany))
+        else:
+            raise TypeError(f"{request!r} is not a valid request")
+
+
+_backends: Dict[str, MemoryBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_memory_backend(db_name: str) -> MemoryBackend:
+    """db_name별로 프로세스 전체에서 공유하는 인메모리 엔진 반환"""
+    backend = _backends.get(db_name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.setdefault(db_name, MemoryBackend(db_name))
+    return backend
+
+
+def reset_memory_backends():
+    """모든 인메모리 데이터베이스 삭제 (테스트·벤치마크 반복 실행용)"""
+    with _backends_lock:
+        _backends.clear()
@@ -0,0 +1,98 @@
+from bson.raw_bson import RawBSONDocument
+
+from ..connection import registry
+from ..read_preference import to_pymongo
+from .base import StorageBackend
+
+
+class MongoBackend(StorageBackend):
+    """
+    pymongo 기반 엔진. MongoClient는 URI별 공유 레지스트리에서 가져오며,
+    첫 작업 시점에 연결합니다.
+    """
+
+    name = "mongo"
+
+    def __init__(self, uri: str, db_name: str, **client_options):
+        self.uri = uri
+        self.db_name = db_name
+        # 공유 클라이언트를 처음 만들 때만 적용되는 MongoClient 옵션 (event_listeners 등)
+        self.client_options = client_options
+
+    @property
+    def client(self):
+        return registry.get_client(self.uri, **self.client_options)
+
+    @property
+    def db(self):
+        # 작업마다 ping하지 않음: 연결 실패는 pymongo 서버 선택이 ConnectionFailure로 알려줌
+        return self.client[self.db_name]
+
+    def _collection(self, collection_name: str, read_preference: str = None):
+        collection = self.db[collection_name]
+        if read_preference:
+            collection = collection.with_options(read_preference=to_pymongo(read_preference))
+        return collection
+
+    def ping(self):
+        # 옵션(event_listeners)을 적용해 공유 클라이언트를 먼저 생성한 뒤 확인
+        self.client
+        registry.check_health(self.uri, force=True)
+
+    def insert_one(self, collection_name: str, document: dict):
+        return self.db[collection_name].insert_one(document)
+
+    def insert_many(self, collection_name: str, documents: list, ordered: bool = False):
+        return self.db[collection_name].insert_many(documents, ordered=ordered)
+
+    def bulk_write(self, collection_name: str, requests: list, ordered: bool = False):
+        return self.db[collection_name].bulk_write(requests, ordered=ordered)
+
+    def find(
+        self,
+        collection_name: str,
+        query: dict,
+        projection: dict = None,
+        sort: list = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = None,
+        raw: bool = False,
+        read_preference: str = None
+    ):
+        collection = self._collection(collection_name, read_preference)
+        if raw:
+            # 서버 응답 BSON을 dict로 디코딩하지 않고 그대로 보관
+            collection = collection.with_options(
+                codec_options=collection.codec_options.with_options(document_class=RawBSONDocument)
+            )
+        cursor = collection.find(query, projection, skip=skip, limit=limit)
+        if sort:
+            cursor = cursor.sort(sort)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        return cursor
+
+    def aggregate(self, collection_name: str, pipeline: list, read_preference: str = None):
+        return self._collection(collection_name, read_preference).aggregate(pipeline)
+
+    def watch(self, collection_name: str, pipeline: list = None, resume_after: dict = None):
+        return self.db[collection_name].watch(pipeline, resume_after=resume_after)
+
+    def explain(self, collection_name: str, query: dict, sort: list = None):
+        cursor = self.db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        return cursor.explain()
+
+    def create_indexes(self, collection_name: str, indexes: list):
+        return self.db[collection_name].create_indexes(indexes)
+
+    def update_one(self, collection_name: str, query: dict, update: dict, upsert: bool = False):
+        return self.db[collection_name].update_one(query, update, upsert=upsert)
+
+    def delete_one(self, collection_name: str, query: dict):
+        return self.db[collection_name].delete_one(query)
+
+    def delete_many(self, collection_name: str, query: dict):
+        return self.db[collection_name].delete_many(query)
@@ -0,0 +1,102 @@
+"""
+photos 문서의 비정규화 필드 백필.
+
+photo_people / photoTags 링크 컬렉션을 기준으로 photos.people, photos.tags 배열을 채웁니다.
+사진을 _id 순 배치로 읽고, 배치마다 링크를 한 번의 $in 쿼리로 모아
+bulk_write 한 번으로 갱신하며, 체크포인트로 중단 후 이어서 실행됩니다.
+
+사용 예시:
+    python -m db.backfill photos --batch-size 500
+"""
+import argparse
+import time
+
+from pymongo import ASCENDING, UpdateOne
+
+from .checkpoint import Checkpoint
+from .db import MongoDBClient
+from .loader import normalize_id
+
+JOB_NAME = "backfill_photos"
+
+
+def _collect_links(
+    client: MongoDBClient, collection_name: str, value_field: str, photo_ids: list, normalize=None
+) -> dict:
+    """사진 ID별 링크 값 목록을 한 번의 $in 쿼리로 수집 (normalize가 있으면 값마다 적용)"""
+    values = {photo_id: [] for photo_id in photo_ids}
+    links = client.find(collection_name, {"photoId": {"$in": photo_ids}}, {"photoId": 1, value_field: 1})
+    for link in links:
+        value = link.get(value_field)
+        values[link["photoId"]].append(normalize(value) if normalize else value)
+    return values
+
+
+def backfill_photos(
+    db_name: str = "skyst",
+    batch_size: int = 500,
+    pause: float = 0.0,
+    client: MongoDBClient = None
+) -> dict:
+    """
+    photos 비정규화 필드 백필.
+
+    Args:
+        db_name: 대상 데이터베이스 이름
+        batch_size: 한 번에 처리할 사진 수
+        pause: 배치 사이 대기 시간(초)
+        client: 사용할 MongoDBClient (없으면 새로 생성)
+
+    Returns:
+        dict: 누적 처리 건수와 마지막으로 처리한 _id
+    """
+    client = client or MongoDBClient(db_name=db_name)
+    checkpoint = Checkpoint(client, JOB_NAME)
+    state = checkpoint.load()
+    last_id = state.get("last_id")
+    updated = state.get("updated", 0)
+
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = list(client.find("photos", query, {"_id": 1}, sort=[("_id", ASCENDING)], limit=batch_size))
+        if not batch:
+            break
+
+        photo_ids = [doc["_id"] for doc in batch]
+        # 예전 add_photo는 personId를 문자열로 저장했으므로 쓰기 경로(to_object_id)와 같이 ObjectId로 변환
+        people = _collect_links(client, "photo_people", "personId", photo_ids, normalize=normalize_id)
+        tags = _collect_links(client, "photoTags", "tags", photo_ids)
+        client.bulk_write("photos", [
+            UpdateOne({"_id": photo_id}, {"$set": {"people": people[photo_id], "tags": tags[photo_id]}})
+            for photo_id in photo_ids
+        ])
+
+        last_id = photo_ids[-1]
+        updated += len(photo_ids)
+        checkpoint.save(last_id=last_id, updated=updated)
+        if pause:
+            time.sleep(pause)
+
+    checkpoint.save(last_id=last_id, updated=updated, done=True)
+    return {"updated": updated, "last_id": last_id}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="photos 비정규화 필드 백필")
+    parser.add_argument("command", choices=["photos"])
+    parser.add_argument("--db", default="skyst", help="데이터베이스 이름")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.0, help="배치 사이 대기 시간(초)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터 실행")
+    args = parser.parse_args(argv)
+
+    client = MongoDBClient(db_name=args.db)
+    if args.restart:
+        Checkpoint(client, JOB_NAME).reset()
+    result = backfill_photos(args.db, args.batch_size, args.pause, client=client)
+    print(f"사진 {result['updated']}건 백필 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
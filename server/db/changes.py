@@ -0,0 +1,76 @@
+"""
+동기화 대상 컬렉션의 변경 기록.
+
+MongoDBClient의 쓰기 메서드는 SYNCED_COLLECTIONS에 속한 컬렉션을 쓸 때
+삽입·수정되는 문서마다 updatedAt을 찍고, 삭제된 문서의 _id는 sync_tombstones 컬렉션에 남깁니다.
+GET /api/sync는 이 두 값으로 토큰 이후의 변경만 돌려줍니다 (db.sync 참고).
+"""
+import copy
+from datetime import datetime
+from typing import Iterable, List
+
+from pymongo import InsertOne, ReplaceOne, UpdateMany, UpdateOne
+
+UPDATED_FIELD = "updatedAt"
+TOMBSTONE_COLLECTION = "sync_tombstones"
+
+# 모바일 클라이언트가 로컬에 보관하는 컬렉션
+SYNCED_COLLECTIONS = frozenset({
+    "people",
+    "photos",
+    "photo_people",
+    "photoTags",
+    "travels",
+    "travel_people",
+    "travel_places",
+})
+
+
+def is_synced(collection_name: str) -> bool:
+    return collection_name in SYNCED_COLLECTIONS
+
+
+def now() -> datetime:
+    """MongoDB 날짜 정밀도(밀리초)에 맞춘 현재 UTC 시각 (저장 값과 토큰 비교가 어긋나지 않도록)"""
+    current = datetime.utcnow()
+    return current.replace(microsecond=current.microsecond // 1000 * 1000)
+
+
+def stamp_document(document: dict, stamp: datetime) -> dict:
+    """삽입할 문서에 updatedAt 기록 (pymongo가 _id를 채우듯 원본 문서를 수정)"""
+    document[UPDATED_FIELD] = stamp
+    return document
+
+
+def stamp_update(update, stamp: datetime):
+    """업데이트 연산자 문서(또는 대체 문서)에 updatedAt 설정 추가"""
+    if isinstance(update, list):
+        # 집계 파이프라인 업데이트
+        return update + [{"$set": {UPDATED_FIELD: stamp}}]
+    if not any(key.startswith("$") for key in update):
+        return dict(update, **{UPDATED_FIELD: stamp})
+    stamped = dict(update)
+    stamped["$set"] = dict(stamped.get("$set") or {}, **{UPDATED_FIELD: stamp})
+    return stamped
+
+
+def stamp_request(request, stamp: datetime):
+    """bulk_write 요청 하나에 updatedAt 적용. 삭제 요청은 그대로 반환"""
+    if isinstance(request, InsertOne):
+        stamp_document(request._doc, stamp)
+        return request
+    if isinstance(request, (ReplaceOne, UpdateOne, UpdateMany)):
+        # 얕은 복사로 upsert 외의 옵션(array_filters, collation, hint, sort 등)을 그대로 유지
+        stamped = copy.copy(request)
+        stamped._doc = stamp_update(request._doc, stamp)
+        return stamped
+    return request
+
+
+def restrict_to_ids(query: dict, ids: list) -> dict:
+    """삭제 쿼리를 미리 조회한 _id로 한정 (삭제된 문서마다 삭제 기록이 남도록)"""
+    return {"$and": [query, {"_id": {"$in": ids}}]}
+
+
+def tombstones(collection_name: str, ids: Iterable, stamp: datetime) -> List[dict]:
+    return [{"collection": collection_name, "docId": doc_id, "deletedAt": stamp} for doc_id in ids]
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from .db import MongoDBClient
+
+
+class Checkpoint:
+    """
+    배치 작업(마이그레이션, 정리 작업 등)의 진행 상태를 저장해 재시작 시 이어서 실행하도록 돕는 클래스.
+    상태는 job_checkpoints 컬렉션에 작업 이름을 _id로 하는 문서 하나로 저장됩니다.
+    """
+
+    collection_name = "job_checkpoints"
+
+    def __init__(self, client: MongoDBClient, job_name: str):
+        self.client = client
+        self.job_name = job_name
+
+    def load(self) -> Dict[str, Any]:
+        docs = self.client.read(self.collection_name, {"_id": self.job_name})
+        return docs[0] if docs else {}
+
+    def save(self, **state):
+        state["updated_at"] = datetime.utcnow()
+        self.client.update(
+            self.collection_name, {"_id": self.job_name}, {"$set": state}, upsert=True
+        )
+
+    def reset(self):
+        self.client.delete(self.collection_name, {"_id": self.job_name})
@@ -0,0 +1,167 @@
+"""
+고아 링크 문서 정리 (orphan compaction).
+
+부모 문서(photos, travels)가 지워졌는데 남아 있는 링크 문서를 찾아 삭제합니다.
+링크 컬렉션을 _id 순 배치로 읽고, 배치마다 부모 존재 여부를 한 번의 $in 쿼리로 확인한 뒤
+고아만 delete_many 한 번으로 지웁니다. 배치 사이에는 pause 초만큼 쉬어
+포그라운드 요청과 경쟁하지 않도록 하며, 컬렉션별 체크포인트로 중단 후 이어서 실행됩니다.
+
+사용 예시:
+    python -m db.compact orphans --batch-size 500 --pause 0.2
+"""
+import argparse
+import logging
+import threading
+import time
+
+from pymongo import ASCENDING
+
+from .checkpoint import Checkpoint
+from .db import MongoDBClient
+from .loader import normalize_id
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "compact_orphans"
+
+# (링크 컬렉션, 부모 참조 필드, 부모 컬렉션)
+ORPHAN_RULES = [
+    ("photo_people", "photoId", "photos"),
+    ("photoTags", "photoId", "photos"),
+    ("travel_people", "travelId", "travels"),
+    ("travel_places", "travelId", "travels"),
+]
+
+
+def _existing_parents(client: MongoDBClient, parent_collection: str, refs: list) -> set:
+    """참조 값 중 실제로 존재하는 부모 _id 집합 (문자열 ObjectId 참조도 같은 부모로 취급)"""
+    candidates = list({normalize_id(ref) for ref in refs} | set(refs))
+    found = client.find(parent_collection, {"_id": {"$in": candidates}}, {"_id": 1})
+    return {normalize_id(doc["_id"]) for doc in found}
+
+
+def compact_collection(
+    client: MongoDBClient,
+    collection_name: str,
+    parent_field: str,
+    parent_collection: str,
+    batch_size: int = 500,
+    pause: float = 0.2,
+    max_batches: int = 0
+) -> dict:
+    """
+    링크 컬렉션 하나의 고아 문서 정리. 끝까지 처리하면 다음 실행은 처음부터 다시 검사합니다.
+
+    Args:
+        max_batches: 이번 실행에서 처리할 최대 배치 수 (0이면 끝까지)
+
+    Returns:
+        dict: 이번 실행의 검사/삭제 건수와 완료 여부
+    """
+    checkpoint = Checkpoint(client, f"{JOB_NAME}:{collection_name}")
+    state = checkpoint.load()
+    last_id = None if state.get("done") else state.get("last_id")
+    scanned = removed = batches = 0
+
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = list(client.find(
+            collection_name, query, {"_id": 1, parent_field: 1}, sort=[("_id", ASCENDING)], limit=batch_size
+        ))
+        if not batch:
+            break
+
+        # 참조 필드가 없는 문서는 판단할 수 없으므로 건드리지 않음
+        linked = [doc for doc in batch if doc.get(parent_field) is not None]
+        parents = _existing_parents(client, parent_collection, [doc[parent_field] for doc in linked])
+        orphan_ids = [doc["_id"] for doc in linked if normalize_id(doc[parent_field]) not in parents]
+        if orphan_ids:
+            removed += client.delete_many(collection_name, {"_id": {"$in": orphan_ids}}).deleted_count
+
+        last_id = batch[-1]["_id"]
+        scanned += len(batch)
+        batches += 1
+        checkpoint.save(last_id=last_id, done=False, removed=state.get("removed", 0) + removed)
+        if max_batches and batches >= max_batches:
+            return {"scanned": scanned, "removed": removed, "done": False}
+        if pause:
+            time.sleep(pause)
+
+    checkpoint.save(last_id=None, done=True, removed=state.get("removed", 0) + removed)
+    return {"scanned": scanned, "removed": removed, "done": True}
+
+
+def compact_orphans(
+    db_name: str = "skyst",
+    batch_size: int = 500,
+    pause: float = 0.2,
+    max_batches: int = 0,
+    client: MongoDBClient = None
+) -> dict:
+    """
+    ORPHAN_RULES의 모든 링크 컬렉션 정리.
+
+    Args:
+        db_name: 대상 데이터베이스 이름
+        batch_size: 한 번에 검사할 링크 문서 수
+        pause: 배치 사이 대기 시간(초)
+        max_batches: 컬렉션마다 이번 실행에서 처리할 최대 배치 수 (0이면 끝까지)
+        client: 사용할 MongoDBClient (없으면 새로 생성)
+
+    Returns:
+        dict: 컬렉션별 실행 결과
+    """
+    client = client or MongoDBClient(db_name=db_name)
+    return {
+        collection_name: compact_collection(
+            client, collection_name, parent_field, parent_collection, batch_size, pause, max_batches
+        )
+        for collection_name, parent_field, parent_collection in ORPHAN_RULES
+    }
+
+
+def start_compaction_thread(
+    db_name: str = "skyst",
+    interval: float = 3600,
+    batch_size: int = 500,
+    pause: float = 0.2
+) -> threading.Thread:
+    """interval 초마다 compact_orphans를 실행하는 데몬 스레드 시작"""
+
+    def run():
+        client = MongoDBClient(db_name=db_name)
+        while True:
+            try:
+                compact_orphans(db_name, batch_size, pause, client=client)
+            except Exception:
+                logger.exception("고아 링크 정리 실패")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="orphan-compaction", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="고아 링크 문서 정리")
+    parser.add_argument("command", choices=["orphans"])
+    parser.add_argument("--db", default="skyst", help="데이터베이스 이름")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.2, help="배치 사이 대기 시간(초)")
+    parser.add_argument("--max-batches", type=int, default=0, help="컬렉션별 최대 배치 수 (0이면 끝까지)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터 실행")
+    args = parser.parse_args(argv)
+
+    client = MongoDBClient(db_name=args.db)
+    if args.restart:
+        for collection_name, _, _ in ORPHAN_RULES:
+            Checkpoint(client, f"{JOB_NAME}:{collection_name}").reset()
+    result = compact_orphans(args.db, args.batch_size, args.pause, args.max_batches, client=client)
+    for collection_name, stats in result.items():
+        status = "완료" if stats["done"] else "중단 (다음 실행에서 이어서)"
+        print(f"{collection_name}: {stats['scanned']}건 검사, {stats['removed']}건 삭제, {status}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure
+
+
+class MongoUnavailable(ConnectionFailure):
+    """헬스 체크(ping) 실패. PyMongoError 하위 클래스라 기존 pymongo 오류 처리로 함께 잡힙니다."""
+
+
+def build_uri(
+    db_name: str,
+    host: str = "localhost",
+    port: int = 27017,
+    user: str = None,
+    password: str = None,
+    replica_set: str = None
+) -> str:
+    """
+    접속 정보로 MongoDB URI 구성.
+    host에 "h1:27017,h2:27017"처럼 여러 멤버(포트 포함)를 쓰면 port는 무시합니다.
+    """
+    hosts = host if ":" in host or "," in host else f"{host}:{port}"
+    auth = f"{user}:{password}@" if user and password else ""
+    options = f"?replicaSet={replica_set}" if replica_set else ""
+    return f"mongodb://{auth}{hosts}/{db_name}{options}"
+
+
+def resolve_uri(
+    db_name: str,
+    host: str = "localhost",
+    port: int = 27017,
+    user: str = None,
+    password: str = None
+) -> str:
+    """
+    접속 URI 결정. MONGO_URI가 있으면 그대로 사용하고,
+    없으면 MONGO_HOSTS(기본 host 인자)와 MONGO_REPLICA_SET으로 구성합니다.
+
+    예) MONGO_URI="mongodb://db1,db2,db3/skyst?replicaSet=rs0"
+        MONGO_HOSTS="db1:27017,db2:27017,db3:27017" MONGO_REPLICA_SET=rs0
+    """
+    uri = os.getenv("MONGO_URI")
+    if uri:
+        return uri
+    return build_uri(
+        db_name, os.getenv("MONGO_HOSTS") or host, port, user, password, os.getenv("MONGO_REPLICA_SET")
+    )
+
+
+class MongoClientRegistry:
+    """
+    URI별로 하나의 MongoClient(커넥션 풀)를 프로세스 전체에서 공유하는 레지스트리.
+
+    MongoClient는 생성 시점에 연결하지 않고(connect=False) 첫 작업에서 연결합니다.
+    일반 작업은 pymongo의 서버 선택에 맡기고, 헬스 체크(ping)는 시작 시 점검이나 헬스 체크
+    엔드포인트처럼 명시적으로 호출할 때만 수행합니다 (URI마다 health_check_interval 초에 한 번).
+
+    사용 예시:
+        client = registry.get_client("mongodb://localhost:27017/skyst")
+        registry.check_health("mongodb://localhost:27017/skyst")
+    """
+
+    def __init__(
+        self,
+        max_pool_size: int = None,
+        max_idle_time_ms: int = None,
+        server_selection_timeout_ms: int = None,
+        health_check_interval: float = None
+    ):
+        self.max_pool_size = max_pool_size or int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+        self.max_idle_time_ms = max_idle_time_ms or int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+        self.server_selection_timeout_ms = server_selection_timeout_ms or int(
+            os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")
+        )
+        self.health_check_interval = health_check_interval if health_check_interval is not None else float(
+            os.getenv("MONGO_HEALTH_CHECK_INTERVAL", "30")
+        )
+        self._clients: Dict[str, MongoClient] = {}
+        self._last_healthy: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, uri: str, **options) -> MongoClient:
+        """URI에 해당하는 공유 MongoClient 반환 (없으면 지연 연결 모드로 생성)"""
+        client = self._clients.get(uri)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(uri)
+            if client is None:
+                settings = {
+                    "maxPoolSize": self.max_pool_size,
+                    "maxIdleTimeMS": self.max_idle_time_ms,
+                    "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+                    "connect": False,
+                }
+                settings.update(options)
+                client = MongoClient(uri, **settings)
+                self._clients[uri] = client
+        return client
+
+    def check_health(self, uri: str, force: bool = False):
+        """
+        ping으로 연결 상태 확인. 최근 health_check_interval 초 안에 성공했다면 생략 (force=True면 항상 확인)
+
+        Raises:
+            MongoUnavailable: 서버에 연결할 수 없는 경우 (ConnectionFailure 하위 클래스)
+        """
+        now = time.monotonic()
+        last = self._last_healthy.get(uri)
+        if not force and last is not None and now - last < self.health_check_interval:
+            return
+
+        try:
+            self.get_client(uri).admin.command("ping")
+        except ConnectionFailure as e:
+            self._last_healthy.pop(uri, None)
+            raise MongoUnavailable(f"MongoDB 서버에 연결할 수 없습니다: {e}") from e
+        self._last_healthy[uri] = now
+
+    def close(self, uri: str):
+        """특정 URI의 클라이언트 종료"""
+        with self._lock:
+            client = self._clients.pop(uri, None)
+            self._last_healthy.pop(uri, None)
+        if client is not None:
+            client.close()
+
+    def close_all(self):
+        """등록된 모든 클라이언트 종료 (프로세스 종료/fork 이후 정리용)"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._last_healthy.clear()
+        for client in clients:
+            client.close()
+
+
+registry = MongoClientRegistry()
+
+
+def get_mongo_client(uri: str, **options) -> MongoClient:
+    """프로세스 공유 레지스트리에서 MongoClient 조회"""
+    return registry.get_client(uri, **options)
@@ -1,5 +1,12 @@
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+from pymongo import DeleteMany, DeleteOne, InsertOne
+
+from . import changes
+from .read_preference import PRIMARY, mark_write, resolve_mode, validate_mode
+from .backends import get_backend
+from .connection import registry, resolve_uri
+from .monitoring import command_metrics, monitoring_enabled
+from .pagination import decode_cursor, encode_cursor, keyset_query, with_sort_keys
+
 
 def get_database(
     db_name: str,
@@ -8,24 +15,20 @@ def get_database(
     user: str = None,
     password: str = None
 ):
-    if user and password:
-        uri = f"mongodb://{user}:{password}@{host}:{port}/{db_name}"
-    else:
-        uri = f"mongodb://{host}:{port}/{db_name}"
-
-    client = MongoClient(uri, serverSelectionTimeoutMS=5000)
-    
-    try:
-        client.admin.command("ping")
-    except ConnectionFailure:
-        raise RuntimeError("MongoDB 서버에 연결할 수 없습니다.")
-    
-    return client[db_name]
+    uri = resolve_uri(db_name, host, port, user, password)
+    registry.check_health(uri)
+    return registry.get_client(uri)[db_name]
 
 
 class MongoDBClient:
     """
     MongoDB 연결과 CRUD 작업을 담당하는 클래스.
+    실제 작업은 저장소 엔진(db.backends)이 수행하며, 기본 mongo 엔진은
+    MongoClient를 URI별 공유 레지스트리에서 가져와 첫 작업 시점에 연결합니다.
+    backend="memory"(또는 SKYST_STORAGE=memory)이면 DB 없이 인메모리 엔진을 사용합니다.
+    동기화 대상 컬렉션(db.changes.SYNCED_COLLECTIONS)에 쓸 때는 updatedAt과 삭제 기록을 함께 남깁니다.
+    접속 URI는 MONGO_URI 등 환경 변수로 바꿀 수 있고(db.connection.resolve_uri),
+    조회를 보낼 레플리카 셋 멤버는 db.read_preference 정책으로 정합니다.
     사용 예시:
         client = MongoDBClient(db_name="mydb")
         client.create("images", {"key": "value"})
@@ -37,35 +40,194 @@ class MongoDBClient:
         host: str = "localhost",
         port: int = 27017,
         user: str = None,
-        password: str = None
+        password: str = None,
+        backend: str = None,
+        read_preference: str = None
     ):
-        # MongoDB URI 구성
-        if user and password:
-            uri = f"mongodb://{user}:{password}@{host}:{port}/{db_name}"
-        else:
-            uri = f"mongodb://{host}:{port}/{db_name}"
-
-        # 클라이언트 및 DB 객체 생성
-        self.client = MongoClient(uri, serverSelectionTimeoutMS=5000)
-        try:
-            self.client.admin.command("ping")
-        except ConnectionFailure:
-            raise RuntimeError("MongoDB 서버에 연결할 수 없습니다.")
-        self.db = self.client[db_name]
+        # MongoDB URI 구성 (클라이언트는 레지스트리에서 지연 생성)
+        self.uri = resolve_uri(db_name, host, port, user, password)
+        self.db_name = db_name
+        # Repository 단위 읽기 선호 (라우트 정책이 없을 때 사용, 없으면 프로세스 기본값)
+        self.read_preference = read_preference and validate_mode(read_preference)
+        # 명령 모니터링 리스너는 공유 MongoClient 생성 시 등록됨 (db.monitoring)
+        listeners = [command_metrics] if monitoring_enabled() else []
+        self.backend = get_backend(backend, self.uri, db_name, event_listeners=listeners)
 
     def create(self, collection_name: str, data: dict):
         """단일 문서 삽입(Create)"""
-        res = self.db[collection_name].insert_one(data)
+        mark_write()
+        if changes.is_synced(collection_name):
+            changes.stamp_document(data, changes.now())
+        res = self.backend.insert_one(collection_name, data)
         return res.inserted_id
 
-    def read(self, collection_name: str, query: dict):
-        """문서 조회(Read)"""
-        return list(self.db[collection_name].find(query))
+    def create_many(self, collection_name: str, data: list, ordered: bool = False):
+        """
+        여러 문서를 한 번의 왕복으로 삽입(Create).
+        ordered=False 이면 서버가 순서와 무관하게 병렬로 처리합니다.
+        """
+        if not data:
+            return []
+        mark_write()
+        if changes.is_synced(collection_name):
+            stamp = changes.now()
+            for doc in data:
+                changes.stamp_document(doc, stamp)
+        res = self.backend.insert_many(collection_name, data, ordered=ordered)
+        return res.inserted_ids
+
+    def bulk_write(self, collection_name: str, requests: list, ordered: bool = False):
+        """InsertOne/UpdateOne/DeleteMany 등 쓰기 작업 묶음을 한 번에 실행"""
+        if not requests:
+            return None
+        mark_write()
+        if not changes.is_synced(collection_name):
+            return self.backend.bulk_write(collection_name, requests, ordered=ordered)
+
+        stamp = changes.now()
+        requests = [changes.stamp_request(request, stamp) for request in requests]
+        deleted_ids = []
+        for i, request in enumerate(requests):
+            if isinstance(request, (DeleteOne, DeleteMany)):
+                ids = self._matching_ids(collection_name, request._filter, isinstance(request, DeleteOne))
+                requests[i] = type(request)(changes.restrict_to_ids(request._filter, ids))
+                deleted_ids.extend(ids)
+        res = self.backend.bulk_write(collection_name, requests, ordered=ordered)
+        self._record_deletes(collection_name, deleted_ids, stamp)
+        return res
+
+    def replace_many(self, collection_name: str, query: dict, data: list):
+        """query에 해당하는 문서를 모두 지우고 data로 교체 (한 번의 bulk_write)"""
+        requests = [DeleteMany(query)] + [InsertOne(doc) for doc in data]
+        # 삭제가 삽입보다 먼저 적용되어야 하므로 ordered
+        return self.bulk_write(collection_name, requests, ordered=True)
+
+    def find(
+        self,
+        collection_name: str,
+        query: dict,
+        projection: dict = None,
+        sort: list = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = None,
+        raw: bool = False
+    ):
+        """
+        문서 조회 커서 반환(Read, 스트리밍용).
+        결과를 메모리에 모으지 않고 batch_size 단위로 서버에서 가져옵니다.
+
+        Args:
+            projection: 반환할 필드 지정 (예: {"name": 1})
+            sort: [(필드, 방향), ...] 형식의 정렬 조건
+            skip, limit: 건너뛸/최대 반환 문서 수 (0이면 제한 없음)
+            batch_size: 한 번의 왕복으로 가져올 문서 수
+            raw: True이면 dict 대신 RawBSONDocument 반환 (접근한 문서만 디코딩, projection과 함께 사용)
+        """
+        return self.backend.find(
+            collection_name, query, projection, sort=sort, skip=skip, limit=limit, batch_size=batch_size, raw=raw,
+            read_preference=resolve_mode(self.read_preference)
+        )
+
+    def find_page(
+        self,
+        collection_name: str,
+        query: dict,
+        sort: list,
+        limit: int,
+        cursor: str = None,
+        projection: dict = None,
+        raw: bool = False
+    ):
+        """
+        키셋(keyset) 페이지네이션 조회.
+        sort 키 기준으로 cursor 토큰 다음 문서부터 limit 개를 서버에서 정렬·제한해 가져옵니다.
+        마지막 정렬 키는 _id 처럼 유일해야 페이지 경계가 흔들리지 않습니다.
+
+        Returns:
+            (문서 리스트, 다음 페이지 토큰 또는 None)
+
+        Raises:
+            ValueError: cursor 토큰이 잘못된 경우
+        """
+        if cursor:
+            query = keyset_query(query, sort, decode_cursor(cursor))
+        projection = with_sort_keys(projection, sort)
+
+        # 다음 페이지 존재 여부를 알기 위해 하나 더 조회
+        docs = list(self.find(collection_name, query, projection, sort=sort, limit=limit + 1, raw=raw))
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            last = docs[-1]
+            next_cursor = encode_cursor({key: last.get(key) for key, _ in sort})
+        return docs, next_cursor
+
+    def read(self, collection_name: str, query: dict, projection: dict = None):
+        """문서 조회(Read), projection으로 필요한 필드만 가져올 수 있음"""
+        return list(self.backend.find(
+            collection_name, query, projection, read_preference=resolve_mode(self.read_preference)
+        ))
+
+    def aggregate(self, collection_name: str, pipeline: list):
+        """집계 파이프라인 실행 결과를 리스트로 반환"""
+        return list(self.backend.aggregate(
+            collection_name, pipeline, read_preference=resolve_mode(self.read_preference)
+        ))
 
-    def update(self, collection_name: str, query: dict, update_data: dict):
+    def watch(self, collection_name: str, pipeline: list = None, resume_after: dict = None):
+        """컬렉션 change stream 반환 (레플리카 셋 필요). resume_after로 끊긴 지점부터 이어서 받음"""
+        return self.backend.watch(collection_name, pipeline, resume_after=resume_after)
+
+    def explain(self, collection_name: str, query: dict, sort: list = None):
+        """조회 쿼리의 실행 계획(explain) 반환"""
+        return self.backend.explain(collection_name, query, sort=sort)
+
+    def ensure_indexes(self, collection_name: str, indexes: list):
+        """
+        IndexModel 목록으로 인덱스 생성.
+        같은 정의의 인덱스가 이미 있으면 아무 작업도 하지 않으므로 반복 호출해도 안전합니다.
+        """
+        if not indexes:
+            return []
+        return self.backend.create_indexes(collection_name, indexes)
+
+    def update(self, collection_name: str, query: dict, update_data: dict, upsert: bool = False):
         """문서 수정(Update), update_data는 $set 형식으로 전달"""
-        return self.db[collection_name].update_one(query, update_data)
+        mark_write()
+        if changes.is_synced(collection_name):
+            update_data = changes.stamp_update(update_data, changes.now())
+        return self.backend.update_one(collection_name, query, update_data, upsert=upsert)
 
     def delete(self, collection_name: str, query: dict):
         """문서 삭제(Delete)"""
-        return self.db[collection_name].delete_one(query)
+        mark_write()
+        if not changes.is_synced(collection_name):
+            return self.backend.delete_one(collection_name, query)
+        ids = self._matching_ids(collection_name, query, single=True)
+        res = self.backend.delete_one(collection_name, changes.restrict_to_ids(query, ids))
+        self._record_deletes(collection_name, ids[:res.deleted_count])
+        return res
+
+    def delete_many(self, collection_name: str, query: dict):
+        """query에 해당하는 문서를 한 번의 작업으로 모두 삭제"""
+        mark_write()
+        if not changes.is_synced(collection_name):
+            return self.backend.delete_many(collection_name, query)
+        ids = self._matching_ids(collection_name, query)
+        res = self.backend.delete_many(collection_name, changes.restrict_to_ids(query, ids))
+        self._record_deletes(collection_name, ids)
+        return res
+
+    def _matching_ids(self, collection_name: str, query: dict, single: bool = False) -> list:
+        """삭제 전에 대상 문서의 _id 조회 (삭제 기록용)"""
+        docs = self.backend.find(
+            collection_name, query, {"_id": 1}, limit=1 if single else 0, read_preference=PRIMARY
+        )
+        return [doc["_id"] for doc in docs]
+
+    def _record_deletes(self, collection_name: str, ids: list, stamp=None):
+        """삭제된 문서의 _id를 sync_tombstones에 기록"""
+        if ids:
+            docs = changes.tombstones(collection_name, ids, stamp or changes.now())
+            self.backend.insert_many(changes.TOMBSTONE_COLLECTION, docs)
@@ -0,0 +1,147 @@
+"""
+사진 위치(location) 좌표 변환과 기존 데이터 정규화.
+
+API는 위치를 [위도, 경도] 리스트로 주고받고, DB에는 2dsphere 인덱스를 위해
+GeoJSON Point({"type": "Point", "coordinates": [경도, 위도]})로 저장합니다.
+위치가 없으면 필드를 저장하지 않습니다.
+
+리스트 형식 위치가 남아 있으면 2dsphere 인덱스 생성이 실패하므로, PhotoRepository.ensure_indexes는
+변환이 끝날 때까지 location_2dsphere를 건너뜁니다. 변환 후 인덱스를 다시 적용하세요.
+
+사용 예시:
+    python -m db.geo normalize     # 기존 리스트 형식 위치를 GeoJSON으로 변환
+    python -m db.indexes apply     # 건너뛴 location_2dsphere 생성
+"""
+import argparse
+import time
+from collections.abc import Mapping
+
+from pymongo import ASCENDING, UpdateOne
+
+from .checkpoint import Checkpoint
+from .db import MongoDBClient
+
+EARTH_RADIUS_M = 6378100
+JOB_NAME = "normalize_photo_locations"
+# 정규화 전 위치 형식 ([위도, 경도] 리스트)
+LEGACY_LOCATION_QUERY = {"location": {"$type": "array"}}
+
+
+def _point(lat, lng) -> dict:
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        # [null, 1], [[1], 2], ["abc", 1] 등
+        raise ValueError("location coordinates must be numbers")
+    if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        raise ValueError("location out of range")
+    return {"type": "Point", "coordinates": [lng, lat]}
+
+
+def to_geojson(location):
+    """
+    [위도, 경도] 리스트를 GeoJSON Point로 변환.
+    이미 GeoJSON이면 좌표를 같은 기준으로 검사해 반환하고, 비어 있으면 None 반환.
+
+    Raises:
+        ValueError: 좌표 형식이나 범위가 잘못된 경우
+    """
+    if not location:
+        return None
+    if isinstance(location, dict):
+        if location.get("type") != "Point":
+            raise ValueError("location must be a GeoJSON Point")
+        coordinates = location.get("coordinates")
+        if not isinstance(coordinates, (list, tuple)) or len(coordinates) != 2:
+            raise ValueError("location coordinates must be [longitude, latitude]")
+        return _point(coordinates[1], coordinates[0])
+    if not isinstance(location, (list, tuple)) or len(location) != 2:
+        raise ValueError("location must be [latitude, longitude]")
+    return _point(location[0], location[1])
+
+
+def from_geojson(value) -> list:
+    """저장된 위치를 API 형식 [위도, 경도]로 변환 (없으면 빈 리스트)"""
+    if not value:
+        return []
+    if isinstance(value, Mapping):
+        # dict 또는 RawBSONDocument
+        lng, lat = value.get("coordinates", [None, None])
+        return [lat, lng]
+    return list(value)
+
+
+def point(latitude: float, longitude: float) -> dict:
+    return {"type": "Point", "coordinates": [float(longitude), float(latitude)]}
+
+
+def has_legacy_locations(client: MongoDBClient) -> bool:
+    """정규화되지 않은 리스트 형식 위치가 남아 있는지 확인"""
+    return next(iter(client.find("photos", LEGACY_LOCATION_QUERY, {"_id": 1}, limit=1)), None) is not None
+
+
+def normalize_photo_locations(
+    db_name: str = "skyst",
+    batch_size: int = 500,
+    pause: float = 0.0,
+    client: MongoDBClient = None
+) -> dict:
+    """
+    리스트 형식 위치를 GeoJSON으로 바꾸고 빈 위치는 필드를 제거.
+    2dsphere 인덱스 생성 전에 실행해야 하며, 체크포인트로 중단 후 이어서 실행됩니다.
+    """
+    client = client or MongoDBClient(db_name=db_name)
+    checkpoint = Checkpoint(client, JOB_NAME)
+    state = checkpoint.load()
+    last_id = state.get("last_id")
+    converted = state.get("converted", 0)
+    invalid = state.get("invalid", 0)
+
+    while True:
+        query = dict(LEGACY_LOCATION_QUERY)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(client.find(
+            "photos", query, {"location": 1}, sort=[("_id", ASCENDING)], limit=batch_size
+        ))
+        if not batch:
+            break
+
+        requests = []
+        for doc in batch:
+            try:
+                geo = to_geojson(doc["location"])
+            except (TypeError, ValueError):
+                geo = None
+                invalid += 1
+            if geo is None:
+                requests.append(UpdateOne({"_id": doc["_id"]}, {"$unset": {"location": ""}}))
+            else:
+                requests.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"location": geo}}))
+        client.bulk_write("photos", requests)
+
+        last_id = batch[-1]["_id"]
+        converted += len(batch)
+        checkpoint.save(last_id=last_id, converted=converted, invalid=invalid)
+        if pause:
+            time.sleep(pause)
+
+    checkpoint.save(last_id=last_id, converted=converted, invalid=invalid, done=True)
+    return {"converted": converted, "invalid": invalid}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="사진 위치 GeoJSON 정규화")
+    parser.add_argument("command", choices=["normalize"])
+    parser.add_argument("--db", default="skyst", help="데이터베이스 이름")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.0, help="배치 사이 대기 시간(초)")
+    args = parser.parse_args(argv)
+
+    result = normalize_photo_locations(args.db, args.batch_size, args.pause)
+    print(f"{result['converted']}건 처리 (잘못된 좌표 {result['invalid']}건 제거)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+"""
+skyst 데이터베이스 인덱스 관리.
+
+각 Repository의 INDEXES 선언을 멱등하게 적용하고, 라우트가 실제로 실행하는
+쿼리에 explain()을 돌려 컬렉션 풀 스캔(COLLSCAN)을 찾아냅니다.
+
+사용 예시:
+    python -m db.indexes apply
+    python -m db.indexes report
+"""
+import argparse
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+
+from .people import PeopleRepository
+from .person_stats import PersonStatsRepository
+from .changes import SYNCED_COLLECTIONS
+from .photos import PhotoRepository
+from .recommend_cache import RecommendCacheRepository
+from .recommend_jobs import RecommendJobRepository
+from .photo_people import PhotoPeopleRepository
+from .photo_tags import PhotoTagsRepository
+from .sync import SyncRepository
+from .travel import TravelRepository
+from .travel_people import TravelPeopleRepository
+from .travel_places import TravelPlacesRepository
+
+logger = logging.getLogger("db.indexes")
+
+REPOSITORIES = [
+    PeopleRepository,
+    PhotoRepository,
+    PhotoPeopleRepository,
+    PhotoTagsRepository,
+    TravelRepository,
+    TravelPeopleRepository,
+    TravelPlacesRepository,
+    PersonStatsRepository,
+    SyncRepository,
+    RecommendJobRepository,
+    RecommendCacheRepository,
+]
+
+# explain 용 자리표시자 ID (값과 무관하게 실행 계획만 확인)
+_SAMPLE_ID = ObjectId("000000000000000000000000")
+_SAMPLE_TIME = datetime(2000, 1, 1)
+
+# 라우트/도구가 실행하는 대표 쿼리: (설명, 컬렉션, 쿼리, 정렬)
+ROUTE_QUERIES = [
+    ("GET /api/photos?personId", "photos", {"people": _SAMPLE_ID}, None),
+    ("GET /api/photos/<photoId>", "photos", {"_id": _SAMPLE_ID}, None),
+    ("tool 2 get_people_in_photo", "photo_people", {"photoId": _SAMPLE_ID}, None),
+    ("tool 1 get_photos_by_person", "photo_people", {"personId": _SAMPLE_ID}, None),
+    ("GET /api/travels", "travels", {}, [("date", -1), ("_id", -1)]),
+    ("GET /api/travels/<travelId> people", "travel_people", {"travelId": _SAMPLE_ID}, None),
+    ("GET /api/travels/<travelId> places", "travel_places", {"travelId": _SAMPLE_ID}, None),
+    ("GET /api/travels/<travelId> location", "photos",
+     {"travel_id": _SAMPLE_ID, "location.type": "Point"}, None),
+    ("GET /api/people/<personId>/stats", "person_stats", {"_id": _SAMPLE_ID}, None),
+    ("person_stats lastTravel refresh", "travel_people", {"peopleId": {"$in": [_SAMPLE_ID]}}, None),
+    *[
+        (f"GET /api/sync {name}", name, {"updatedAt": {"$gte": _SAMPLE_TIME}}, [("updatedAt", 1), ("_id", 1)])
+        for name in sorted(SYNCED_COLLECTIONS)
+    ],
+    ("GET /api/sync deleted", "sync_tombstones", {"deletedAt": {"$gte": _SAMPLE_TIME}}, [("deletedAt", 1)]),
+    ("recommend cache invalidation", "recommend_cache", {"peopleId": {"$in": [str(_SAMPLE_ID)]}}, None),
+]
+
+
+def ensure_indexes(
+    db_name: str = "skyst", repositories: list = None, errors: Dict[str, str] = None
+) -> Dict[str, List[str]]:
+    """
+    모든 Repository의 인덱스 선언 적용.
+    한 Repository에서 실패해도(예: 레거시 좌표가 남아 2dsphere 생성 실패) 나머지는 계속 적용합니다.
+
+    Args:
+        db_name: 대상 데이터베이스 이름
+        repositories: 이미 생성된 Repository 인스턴스 목록 (없으면 새로 생성)
+        errors: 넘기면 실패한 컬렉션별 오류 메시지를 채움
+
+    Returns:
+        Dict[str, List[str]]: 컬렉션별 적용된 인덱스 이름
+    """
+    if repositories is None:
+        repositories = [repo_cls(db_name=db_name) for repo_cls in REPOSITORIES]
+
+    applied: Dict[str, List[str]] = {}
+    for repo in repositories:
+        try:
+            created = repo.ensure_indexes()
+        except PyMongoError as e:
+            logger.warning("%s 인덱스 적용 실패: %s", repo.collection_name, e)
+            if errors is not None:
+                errors[repo.collection_name] = str(e)
+            continue
+        names = applied.setdefault(repo.collection_name, [])
+        # 같은 컬렉션을 쓰는 Repository가 여럿일 수 있으므로 중복 제거
+        names.extend(name for name in created if name not in names)
+    return applied
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """실행 계획 트리에서 stage 이름을 모두 수집"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+def index_report(db_name: str = "skyst") -> List[Dict[str, Any]]:
+    """
+    ROUTE_QUERIES 각각의 winning plan을 확인해 인덱스 사용 여부 보고.
+
+    Returns:
+        List[Dict[str, Any]]: 쿼리별 stage 목록과 collscan 여부
+    """
+    client = PhotoRepository(db_name=db_name).client
+    report = []
+    for label, collection_name, query, sort in ROUTE_QUERIES:
+        explained = client.explain(collection_name, query, sort)
+        stages = _plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {}))
+        report.append({
+            "route": label,
+            "collection": collection_name,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+        })
+    return report
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="skyst 인덱스 관리")
+    parser.add_argument("command", choices=["apply", "report"])
+    parser.add_argument("--db", default="skyst", help="데이터베이스 이름")
+    args = parser.parse_args(argv)
+
+    if args.command == "apply":
+        errors: Dict[str, str] = {}
+        applied = ensure_indexes(args.db, errors=errors)
+        print(json.dumps({"applied": applied, "errors": errors}, ensure_ascii=False, indent=2))
+        return 1 if errors else 0
+
+    report = index_report(args.db)
+    for row in report:
+        flag = "COLLSCAN" if row["collscan"] else "ok"
+        print(f"[{flag:8}] {row['collection']:14} {row['route']} ({' > '.join(row['stages'])})")
+    return 1 if any(row["collscan"] for row in report) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from bson import ObjectId
+
+
+def normalize_id(value):
+    """ObjectId 형식의 문자열은 ObjectId로 변환 (캐시 키 통일용)"""
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+
+class BatchLoader:
+    """
+    요청(또는 TOT 실행) 범위의 ID 조회 배치 로더 (DataLoader 방식).
+
+    queue()로 모아 둔 ID는 다음 load()/load_many() 시점에 한 번의 $in 쿼리로
+    함께 조회되고, 결과(없는 ID 포함)는 로더가 살아있는 동안 메모이즈됩니다.
+
+    사용 예시:
+        loader = BatchLoader(lambda ids: repo.get_person({"_id": {"$in": ids}}))
+        loader.queue(id1, id2)
+        person = loader.load(id1)   # id1, id2를 한 번에 조회
+        other = loader.load(id2)    # 캐시에서 반환
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[List[Any]], Iterable[dict]],
+        key: str = "_id",
+        normalize: Callable[[Any], Hashable] = normalize_id
+    ):
+        self._fetch_many = fetch_many
+        self._key = key
+        self._normalize = normalize
+        self._cache: Dict[Hashable, Optional[dict]] = {}
+        self._pending: Dict[Hashable, None] = {}
+        self.query_count = 0
+
+    def prime(self, doc: dict):
+        """이미 조회한 문서를 캐시에 등록"""
+        self._cache[self._normalize(doc[self._key])] = doc
+
+    def queue(self, *ids):
+        """다음 배치에서 조회할 ID 등록 (이미 캐시된 ID는 무시)"""
+        for value in ids:
+            key = self._normalize(value)
+            if key not in self._cache:
+                self._pending[key] = None
+
+    def dispatch(self):
+        """대기 중인 ID를 한 번의 쿼리로 조회해 캐시에 저장"""
+        if not self._pending:
+            return
+        keys = list(self._pending)
+        self._pending.clear()
+
+        self.query_count += 1
+        for doc in self._fetch_many(keys):
+            self._cache[self._normalize(doc[self._key])] = doc
+        for key in keys:
+            self._cache.setdefault(key, None)
+
+    def load(self, value) -> Optional[dict]:
+        """단일 ID 조회 (대기 중인 ID도 함께 조회)"""
+        self.queue(value)
+        self.dispatch()
+        return self._cache.get(self._normalize(value))
+
+    def load_many(self, values: Iterable[Any]) -> List[Optional[dict]]:
+        """여러 ID를 한 번에 조회, 입력 순서대로 반환 (없는 ID는 None)"""
+        values = list(values)
+        self.queue(*values)
+        self.dispatch()
+        return [self._cache.get(self._normalize(value)) for value in values]
+
+    def clear(self):
+        self._cache.clear()
+        self._pending.clear()
+
+
+class RequestLoaders:
+    """
+    컬렉션별 BatchLoader 묶음. 요청 또는 TOT 실행 하나마다 새로 만들어 사용합니다.
+    """
+
+    def __init__(self, people_repo=None, photo_repo=None):
+        self.people = BatchLoader(
+            lambda ids: people_repo.get_person({"_id": {"$in": ids}})
+        ) if people_repo is not None else None
+        self.photos = BatchLoader(
+            lambda ids: photo_repo.get_photo({"_id": {"$in": ids}})
+        ) if photo_repo is not None else None
+
+    @property
+    def query_count(self) -> int:
+        return sum(loader.query_count for loader in (self.people, self.photos) if loader is not None)
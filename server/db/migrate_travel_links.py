@@ -0,0 +1,99 @@
+"""
+travels 컬렉션에 섞여 있던 여행-인물/여행-장소 링크 문서를
+travel_people / travel_places 전용 컬렉션으로 옮기는 마이그레이션.
+
+배치 단위로 (1) 대상 컬렉션에 _id 기준 upsert, (2) travels에서 삭제,
+(3) 체크포인트 저장 순으로 진행하므로 중간에 중단되어도 다시 실행하면 이어서 진행합니다.
+
+사용 예시:
+    python -m db.migrate_travel_links --batch-size 500
+"""
+import argparse
+import time
+
+from pymongo import ASCENDING, DeleteMany, ReplaceOne
+
+from .checkpoint import Checkpoint
+from .db import MongoDBClient
+
+SOURCE_COLLECTION = "travels"
+PEOPLE_COLLECTION = "travel_people"
+PLACES_COLLECTION = "travel_places"
+JOB_NAME = "migrate_travel_links"
+
+
+def migrate_travel_links(
+    db_name: str = "skyst",
+    batch_size: int = 500,
+    pause: float = 0.0,
+    client: MongoDBClient = None
+) -> dict:
+    """
+    링크 문서를 배치 단위로 이동.
+
+    Args:
+        db_name: 대상 데이터베이스 이름
+        batch_size: 한 번에 옮길 문서 수
+        pause: 배치 사이 대기 시간(초), 운영 트래픽과 경쟁하지 않도록 조절
+        client: 사용할 MongoDBClient (없으면 새로 생성)
+
+    Returns:
+        dict: 누적 이동 건수와 마지막으로 처리한 _id
+    """
+    client = client or MongoDBClient(db_name=db_name)
+    checkpoint = Checkpoint(client, JOB_NAME)
+    state = checkpoint.load()
+    last_id = state.get("last_id")
+    moved_people = state.get("moved_people", 0)
+    moved_places = state.get("moved_places", 0)
+
+    while True:
+        query = {"travelId": {"$exists": True}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(client.find(
+            SOURCE_COLLECTION, query, sort=[("_id", ASCENDING)], limit=batch_size
+        ))
+        if not batch:
+            break
+
+        people = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in batch if "peopleId" in doc]
+        places = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in batch if "placeId" in doc]
+        client.bulk_write(PEOPLE_COLLECTION, people)
+        client.bulk_write(PLACES_COLLECTION, places)
+
+        # 대상 컬렉션에 기록된 뒤에만 원본 삭제
+        moved_ids = [doc["_id"] for doc in batch if "peopleId" in doc or "placeId" in doc]
+        if moved_ids:
+            client.bulk_write(SOURCE_COLLECTION, [DeleteMany({"_id": {"$in": moved_ids}})])
+
+        last_id = batch[-1]["_id"]
+        moved_people += len(people)
+        moved_places += len(places)
+        checkpoint.save(last_id=last_id, moved_people=moved_people, moved_places=moved_places)
+
+        if pause:
+            time.sleep(pause)
+
+    checkpoint.save(last_id=last_id, moved_people=moved_people, moved_places=moved_places, done=True)
+    return {"moved_people": moved_people, "moved_places": moved_places, "last_id": last_id}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="travels 링크 문서를 전용 컬렉션으로 이동")
+    parser.add_argument("--db", default="skyst", help="데이터베이스 이름")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.0, help="배치 사이 대기 시간(초)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터 실행")
+    args = parser.parse_args(argv)
+
+    client = MongoDBClient(db_name=args.db)
+    if args.restart:
+        Checkpoint(client, JOB_NAME).reset()
+    result = migrate_travel_links(args.db, args.batch_size, args.pause, client=client)
+    print(f"people {result['moved_people']}건, places {result['moved_places']}건 이동 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
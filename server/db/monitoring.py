@@ -0,0 +1,278 @@
+"""
+MongoDB 명령 모니터링 (pymongo CommandListener).
+
+컬렉션·작업별 지연 시간 히스토그램, 문서 수, 요청/응답 크기를 모으고,
+MONGO_SLOW_QUERY_MS 이상 걸린 명령은 쿼리 형태(shape)와 함께 slow query 로그로 남깁니다.
+웹 요청 안에서 실행된 명령은 set_route()로 지정한 라우트별로도 집계됩니다.
+
+설정 (환경 변수):
+    MONGO_COMMAND_MONITORING  "0"이면 리스너를 등록하지 않음 (기본 "1")
+    MONGO_SLOW_QUERY_MS       slow query 기준 (밀리초, 기본 100, 음수면 기록하지 않음)
+    MONGO_SLOW_QUERY_LOG_SIZE 최근 slow query 보관 개수 (기본 100)
+"""
+import contextvars
+import datetime
+import logging
+import os
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import bson
+from bson import json_util
+from pymongo import monitoring
+
+logger = logging.getLogger("db.slow_query")
+
+# 지연 시간 히스토그램 버킷 상한 (밀리초)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# getMore처럼 컬렉션 이름이 명령 값이 아닌 "collection" 필드에 있는 명령
+_COLLECTION_FIELD = {"getMore": "collection"}
+
+_current_route: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("mongo_route", default=None)
+
+
+def set_route(route: Optional[str]):
+    """현재 실행 흐름(요청)에서 발생하는 명령을 route 이름으로 집계"""
+    return _current_route.set(route)
+
+
+def reset_route(token):
+    _current_route.reset(token)
+
+
+def query_shape(value):
+    """
+    쿼리 값의 형태만 남긴 사본 (리터럴은 "?"로 치환).
+    예: {"_id": {"$in": [1, 2]}} -> {"_id": {"$in": "?"}}
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and all(isinstance(item, dict) for item in value):
+        return [query_shape(item) for item in value]
+    return "?"
+
+
+def _command_shape(command_name: str, command: dict) -> dict:
+    if command_name == "find":
+        shape = {"filter": query_shape(command.get("filter", {}))}
+        if command.get("sort"):
+            shape["sort"] = dict(command["sort"])
+        if command.get("projection"):
+            shape["projection"] = sorted(command["projection"])
+        return shape
+    if command_name == "aggregate":
+        # $match 조건만 값을 지우고, 나머지 스테이지($lookup 등)는 그대로 둠
+        return {"pipeline": [
+            {name: query_shape(spec) if name == "$match" else spec for name, spec in stage.items()}
+            for stage in command.get("pipeline", [])
+        ]}
+    if command_name in ("update", "delete"):
+        key = "updates" if command_name == "update" else "deletes"
+        return {"filter": [query_shape(op.get("q", {})) for op in command.get(key, [])]}
+    if command_name in ("count", "distinct", "findAndModify"):
+        return {"filter": query_shape(command.get("query", {}))}
+    return {}
+
+
+def _reply_docs(command_name: str, reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if command_name in ("insert", "update", "delete", "count"):
+        return int(reply.get("n", 0))
+    return 0
+
+
+def _bson_size(document) -> int:
+    raw = getattr(document, "raw", None)
+    if raw is not None:
+        return len(raw)
+    try:
+        return len(bson.encode(document))
+    except Exception:
+        return 0
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램 (밀리초)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, q: float) -> float:
+        """버킷 상한 기준 근사 백분위수"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(float(self.bounds[i]), self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class _OperationStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.docs = 0
+        self.request_bytes = 0
+        self.reply_bytes = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "latency_ms": self.latency.snapshot(),
+            "errors": self.errors,
+            "docs": self.docs,
+            "request_bytes": self.request_bytes,
+            "reply_bytes": self.reply_bytes,
+        }
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    명령 시작/완료 이벤트로 컬렉션·작업별 통계를 집계하는 리스너.
+
+    사용 예시:
+        client = MongoClient(uri, event_listeners=[command_metrics])
+        command_metrics.snapshot()
+    """
+
+    def __init__(self, slow_query_ms: float = None, slow_log_size: int = None):
+        self.slow_query_ms = slow_query_ms if slow_query_ms is not None else float(
+            os.getenv("MONGO_SLOW_QUERY_MS", "100")
+        )
+        self.slow_queries = deque(maxlen=slow_log_size or int(os.getenv("MONGO_SLOW_QUERY_LOG_SIZE", "100")))
+        self._operations: Dict[Tuple[str, str], _OperationStats] = {}
+        self._routes: Dict[str, Dict[str, _OperationStats]] = {}
+        self._pending: Dict[Tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event) -> Tuple:
+        return event.connection_id, event.request_id, event.operation_id
+
+    def started(self, event):
+        command = event.command
+        field = _COLLECTION_FIELD.get(event.command_name, event.command_name)
+        collection = command.get(field)
+        if not isinstance(collection, str):
+            collection = "$cmd"
+        info = {
+            "collection": collection,
+            "route": _current_route.get(),
+            "request_bytes": _bson_size(command),
+        }
+        if self.slow_query_ms >= 0:
+            info["shape"] = _command_shape(event.command_name, command)
+        with self._lock:
+            self._pending[self._key(event)] = info
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        duration_ms = event.duration_micros / 1000
+        reply = getattr(event, "reply", None) or {}
+        docs = 0 if failed else _reply_docs(event.command_name, reply)
+        reply_bytes = 0 if failed else _bson_size(reply)
+
+        with self._lock:
+            info = self._pending.pop(self._key(event), None) or {"collection": "$cmd", "route": None,
+                                                                 "request_bytes": 0}
+            key = (info["collection"], event.command_name)
+            targets = [self._operations.setdefault(key, _OperationStats())]
+            if info["route"]:
+                route = self._routes.setdefault(info["route"], {})
+                targets.append(route.setdefault(f"{key[0]}.{key[1]}", _OperationStats()))
+            for stats in targets:
+                stats.latency.observe(duration_ms)
+                stats.docs += docs
+                stats.request_bytes += info["request_bytes"]
+                stats.reply_bytes += reply_bytes
+                if failed:
+                    stats.errors += 1
+
+            slow = self.slow_query_ms >= 0 and duration_ms >= self.slow_query_ms
+            if slow:
+                entry = {
+                    "at": datetime.datetime.utcnow().isoformat() + "Z",
+                    "collection": info["collection"],
+                    "command": event.command_name,
+                    "duration_ms": round(duration_ms, 3),
+                    "docs": docs,
+                    "route": info["route"],
+                    "shape": info.get("shape", {}),
+                }
+                self.slow_queries.append(entry)
+
+        if slow:
+            logger.warning(
+                "slow query %.1fms %s.%s route=%s shape=%s",
+                duration_ms, info["collection"], event.command_name, info["route"],
+                json_util.dumps(entry["shape"]),
+            )
+
+    def snapshot(self) -> dict:
+        """엔드포인트용 통계 사본"""
+        with self._lock:
+            collections: Dict[str, dict] = {}
+            for (collection, command_name), stats in sorted(self._operations.items()):
+                collections.setdefault(collection, {})[command_name] = stats.snapshot()
+            routes = {
+                route: {name: stats.snapshot() for name, stats in sorted(ops.items())}
+                for route, ops in sorted(self._routes.items())
+            }
+            return {
+                "slow_query_ms": self.slow_query_ms,
+                "collections": collections,
+                "routes": routes,
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+            self._routes.clear()
+            self.slow_queries.clear()
+
+
+command_metrics = CommandMetrics()
+
+
+def monitoring_enabled() -> bool:
+    return os.getenv("MONGO_COMMAND_MONITORING", "1") == "1"
@@ -0,0 +1,63 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from pymongo import ASCENDING
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """마지막 문서의 정렬 키 값을 불투명한 연속 토큰으로 인코딩"""
+    raw = json_util.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """연속 토큰 디코딩. 형식이 잘못되면 ValueError"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_query(query: dict, sort: List[Tuple[str, int]], after: Dict[str, Any]) -> dict:
+    """
+    정렬 키 (k1, k2, ...) 기준으로 after 다음 문서만 조회하는 쿼리 생성.
+    예) sort=[("date", -1), ("_id", -1)] 이면
+        {"$or": [{"date": {"$lt": d}}, {"date": d, "_id": {"$lt": id}}]}
+    """
+    branches = []
+    for i, (key, direction) in enumerate(sort):
+        if key not in after:
+            raise ValueError("Invalid cursor")
+        branch = {prev_key: after[prev_key] for prev_key, _ in sort[:i]}
+        branch[key] = {"$gt" if direction == ASCENDING else "$lt": after[key]}
+        branches.append(branch)
+
+    condition = {"$or": branches} if len(branches) > 1 else branches[0]
+    return {"$and": [query, condition]} if query else condition
+
+
+def with_sort_keys(projection: Optional[dict], sort: List[Tuple[str, int]]) -> Optional[dict]:
+    """
+    inclusion projection에 정렬 키가 빠져 있으면 추가 (토큰 생성에 필요).
+    {"_id": 1}처럼 _id만 포함하는 projection도 inclusion이며, exclusion projection은 그대로 둡니다.
+    """
+    if not projection or not _is_inclusion(projection):
+        return projection
+    projection = dict(projection)
+    for key, _ in sort:
+        projection[key] = 1
+    return projection
+
+
+def _is_inclusion(projection: dict) -> bool:
+    # {"score": {"$meta": "textScore"}} 같은 계산 필드는 inclusion/exclusion 판단에서 제외
+    fields = {k: v for k, v in projection.items() if not isinstance(v, dict)}
+    if any(v for k, v in fields.items() if k != "_id"):
+        return True
+    return set(fields) == {"_id"} and bool(fields["_id"])
@@ -1,7 +1,33 @@
 # server/db/people.py
-from . import MongoDBClient
+import logging
+import os
+import threading
+
+from bson import json_util
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .cache import TTLCache
+from .db import MongoDBClient
+from .person_stats import STATS_COLLECTION, TOP_N, format_person_stats
+
+logger = logging.getLogger("db.people_cache")
+
+# change stream 재연결 대기 시간(초). 실패할 때마다 두 배로 늘려 최대값까지
+WATCH_RETRY_MIN = 1
+WATCH_RETRY_MAX = 60
+# change stream을 지원하지 않는 서버(스탠드얼론 등). 재시도해도 소용없으므로 TTL 만료에만 의존
+_CHANGE_STREAM_UNSUPPORTED = {40573}
 
 class PeopleRepository:
+    INDEXES = [
+        # GET /api/sync 증분 조회
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt_1"),
+    ]
+    PAGE_SORT = [("_id", ASCENDING)]
+    # 인물별 통계 구체화 컬렉션 (db.person_stats가 유지)
+    STATS_COLLECTION = STATS_COLLECTION
+
     def __init__(self, db_name: str = "skyst"):
         self.client = MongoDBClient(db_name=db_name)
         self.collection_name = "people"
@@ -9,11 +35,146 @@ class PeopleRepository:
     def add_person(self, data: dict):
         return self.client.create(self.collection_name, data)
 
-    def get_person(self, query: dict):
-        return self.client.read(self.collection_name, query)
+    def get_person(self, query: dict, projection: dict = None):
+        return self.client.read(self.collection_name, query, projection)
+
+    def iter_person(self, query: dict, **options):
+        return self.client.find(self.collection_name, query, **options)
+
+    def page_person(self, query: dict, limit: int, cursor: str = None, projection: dict = None, raw: bool = False):
+        return self.client.find_page(self.collection_name, query, self.PAGE_SORT, limit, cursor, projection, raw)
+
+    def get_person_stats(self, person_id, top: int = TOP_N):
+        """인물 통계 문서 한 건 조회 (사진 수, 최근 여행, 상위 태그/동행인). 없으면 None"""
+        docs = self.client.read(self.STATS_COLLECTION, {"_id": person_id})
+        return format_person_stats(docs[0], top) if docs else None
 
     def update_person(self, query: dict, update_data: dict):
         return self.client.update(self.collection_name, query, update_data)
 
     def delete_person(self, query: dict):
-        return self.client.delete(self.collection_name, query)
\ No newline at end of file
+        return self.client.delete(self.collection_name, query)
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
+
+
+class CachedPeopleRepository(PeopleRepository):
+    """
+    people 컬렉션 앞단의 read-through 캐시.
+
+    조회 결과를 (쿼리, projection, 옵션) 단위로 TTL 동안 보관하고, add/update/delete
+    시에는 캐시 전체를 비웁니다. people 컬렉션은 작기 때문에 부분 무효화 대신 전체를
+    비우는 편이 단순하고 안전합니다. 다른 워커 프로세스의 쓰기는 TTL이 지나면 반영되며,
+    레플리카 셋 환경에서는 start_change_stream()으로 즉시 무효화할 수 있습니다.
+    """
+
+    def __init__(self, db_name: str = "skyst", ttl: float = None, maxsize: int = 1024):
+        super().__init__(db_name=db_name)
+        if ttl is None:
+            ttl = float(os.getenv("PEOPLE_CACHE_TTL", "60"))
+        self.cache = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._watcher = None
+        self._stop_watch = threading.Event()
+
+    @staticmethod
+    def _cache_key(query: dict, projection: dict = None, options: dict = None) -> str:
+        return json_util.dumps([query, projection, options or {}], sort_keys=True)
+
+    def _cached(self, key: str, fetch):
+        docs = self.cache.get(key)
+        if docs is None:
+            docs = list(fetch())
+            self.cache.set(key, docs)
+        # 호출 측에서 문서를 수정해도 캐시가 오염되지 않도록 복사본 반환
+        return [dict(doc) for doc in docs]
+
+    def get_person(self, query: dict, projection: dict = None):
+        key = self._cache_key(query, projection)
+        return self._cached(key, lambda: super(CachedPeopleRepository, self).get_person(query, projection))
+
+    def iter_person(self, query: dict, **options):
+        # batch_size는 결과에 영향을 주지 않으므로 키에서 제외
+        key_options = {k: v for k, v in options.items() if k != "batch_size"}
+        key = self._cache_key(query, options=key_options)
+        return iter(self._cached(key, lambda: super(CachedPeopleRepository, self).iter_person(query, **options)))
+
+    def page_person(self, query: dict, limit: int, cursor: str = None, projection: dict = None, raw: bool = False):
+        key = self._cache_key(query, projection, {"limit": limit, "cursor": cursor, "raw": raw})
+        page = self.cache.get(key)
+        if page is None:
+            page = super().page_person(query, limit, cursor, projection, raw)
+            self.cache.set(key, page)
+        docs, next_cursor = page
+        # RawBSONDocument는 읽기 전용이므로 복사 없이 반환
+        return (list(docs) if raw else [dict(doc) for doc in docs]), next_cursor
+
+    def add_person(self, data: dict):
+        result = super().add_person(data)
+        self.invalidate()
+        return result
+
+    def update_person(self, query: dict, update_data: dict):
+        result = super().update_person(query, update_data)
+        self.invalidate()
+        return result
+
+    def delete_person(self, query: dict):
+        result = super().delete_person(query)
+        self.invalidate()
+        return result
+
+    def invalidate(self):
+        self.cache.clear()
+
+    def start_change_stream(self):
+        """
+        people change stream을 구독하는 백그라운드 스레드 시작.
+        다른 프로세스의 쓰기도 즉시 캐시를 비우게 됩니다 (레플리카 셋 필요).
+        연결이 끊기거나 DB에 연결할 수 없으면 지수 백오프로 재연결하고 resume token으로 끊긴 지점부터 이어 받습니다.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+        self._stop_watch.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_changes, name="people-cache-watch", daemon=True
+        )
+        self._watcher.start()
+        return self._watcher
+
+    def stop_change_stream(self, timeout: float = None):
+        self._stop_watch.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout)
+
+    def _watch_changes(self):
+        resume_token = None
+        delay = WATCH_RETRY_MIN
+        while not self._stop_watch.is_set():
+            try:
+                with self.client.watch(self.collection_name, resume_after=resume_token) as stream:
+                    if resume_token is None:
+                        # 이어 받을 지점이 없으면 끊긴 동안의 변경을 놓쳤을 수 있으므로 캐시를 비움
+                        self.invalidate()
+                    delay = WATCH_RETRY_MIN
+                    while stream.alive and not self._stop_watch.is_set():
+                        change = stream.try_next()
+                        resume_token = stream.resume_token
+                        if change is not None:
+                            self.invalidate()
+            except OperationFailure as e:
+                if e.code in _CHANGE_STREAM_UNSUPPORTED:
+                    logger.warning("people 캐시 change stream을 사용할 수 없어 TTL 만료에만 의존합니다: %s", e)
+                    return
+                # resume token이 oplog 범위를 벗어난 경우 등: 처음부터 다시 구독
+                resume_token = None
+                logger.warning("people 캐시 change stream 오류, %s초 후 재연결: %s", delay, e)
+            except PyMongoError as e:
+                # 서버 선택 시간 초과, MongoUnavailable 등 연결 오류 포함: 같은 백오프로 재연결
+                logger.warning("people 캐시 change stream 끊김, %s초 후 재연결: %s", delay, e)
+            except Exception:
+                # 예상하지 못한 오류로 스레드가 조용히 죽어 TTL에만 의존하게 되지 않도록 재시도
+                logger.exception("people 캐시 change stream 오류, %s초 후 재연결", delay)
+            if self._stop_watch.wait(delay):
+                return
+            delay = min(delay * 2, WATCH_RETRY_MAX)
@@ -0,0 +1,264 @@
+"""
+인물별 통계 (person_stats) 구체화 컬렉션.
+
+인물 _id를 문서 _id로 하는 문서 하나에 다음 값을 유지합니다.
+    photoCount   등장한 사진 수
+    tagCounts    {태그: 등장 사진 수}
+    travelCount  참여한 여행 수
+    coTravelers  {함께 간 인물 ID 문자열: 여행 수}
+    lastTravel   가장 최근 여행 {"date", "travelId", "name"}
+
+사진/여행 쓰기 경로가 변경 전후 문서를 넘기면 차이만큼 $inc 하고,
+전체 재계산은 rebuild()로 수행합니다. 조회는 PeopleRepository.get_person_stats()의 문서 한 건 fetch입니다.
+
+사용 예시:
+    python -m db.person_stats rebuild
+"""
+import argparse
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import DESCENDING, ReplaceOne, UpdateOne
+
+from .db import MongoDBClient
+from .read_preference import PRIMARY
+
+STATS_COLLECTION = "person_stats"
+TOP_N = 5
+
+
+def encode_key(value) -> str:
+    """태그·인물 ID를 필드 이름으로 쓸 수 있게 '.', '$' 를 이스케이프"""
+    return str(value).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def _field_keys(values: Iterable) -> set:
+    """필드 이름으로 쓸 키 집합 (빈 문자열/None은 MongoDB가 빈 필드 이름으로 거부하므로 제외)"""
+    return {encode_key(value) for value in values if value is not None and str(value) != ""}
+
+
+def decode_key(key: str) -> str:
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+
+def _top(counts: Optional[dict], label: str, top: int) -> List[dict]:
+    items = [(decode_key(key), count) for key, count in (counts or {}).items() if count > 0]
+    items.sort(key=lambda item: (-item[1], item[0]))
+    return [{label: key, "count": count} for key, count in items[:top]]
+
+
+def format_person_stats(doc: dict, top: int = TOP_N) -> dict:
+    """저장 문서를 조회용 형태로 변환 (상위 태그/동행인은 횟수 내림차순)"""
+    return {
+        "personId": doc["_id"],
+        "photoCount": doc.get("photoCount", 0),
+        "travelCount": doc.get("travelCount", 0),
+        "lastTravel": doc.get("lastTravel"),
+        "topTags": _top(doc.get("tagCounts"), "tag", top),
+        "coTravelers": _top(doc.get("coTravelers"), "personId", top),
+    }
+
+
+def _people(doc: Optional[dict]) -> set:
+    return {person for person in (doc or {}).get("people") or [] if person is not None}
+
+
+def _add_photo(deltas: Dict, photo: Optional[dict], sign: int):
+    if not photo:
+        return
+    tags = _field_keys(photo.get("tags") or [])
+    for person in _people(photo):
+        counter = deltas[person]
+        counter["photoCount"] += sign
+        for tag in tags:
+            counter[f"tagCounts.{tag}"] += sign
+
+
+def _add_travel(deltas: Dict, travel: Optional[dict], sign: int):
+    if not travel:
+        return
+    people = _people(travel)
+    for person in people:
+        counter = deltas[person]
+        counter["travelCount"] += sign
+        for other in _field_keys(other for other in people if other != person):
+            counter[f"coTravelers.{other}"] += sign
+
+
+def _last_travel(travel: dict) -> dict:
+    # $max로 비교하므로 date가 첫 번째 필드여야 함
+    return {"date": travel.get("date"), "travelId": travel["_id"], "name": travel.get("name")}
+
+
+class PersonStatsRepository:
+    # _id(인물 ID) 조회만 사용
+    INDEXES = []
+
+    # 통계 재계산에 읽는 컬렉션
+    PHOTO_COLLECTION = "photos"
+    TRAVEL_COLLECTION = "travels"
+    TRAVEL_PEOPLE_COLLECTION = "travel_people"
+    # 재계산 결과를 바로 쓰므로 최신 데이터를 읽어야 함
+    READ_PREFERENCE = PRIMARY
+
+    def __init__(self, db_name: str = "skyst"):
+        self.client = MongoDBClient(db_name=db_name, read_preference=self.READ_PREFERENCE)
+        self.collection_name = STATS_COLLECTION
+
+    def _write_deltas(self, deltas: Dict, extra: Dict = None):
+        """인물별 $inc(0이 아닌 값만)와 추가 연산자를 한 번의 bulk_write로 적용"""
+        extra = extra or {}
+        now = datetime.utcnow()
+        requests = []
+        for person in set(deltas) | set(extra):
+            inc = {field: value for field, value in deltas.get(person, {}).items() if value}
+            if not inc and person not in extra:
+                continue
+            update = {"$set": {"updatedAt": now}}
+            if inc:
+                update["$inc"] = inc
+            update.update(extra.get(person, {}))
+            requests.append(UpdateOne({"_id": person}, update, upsert=True))
+        self.client.bulk_write(self.collection_name, requests)
+
+    def apply_photo_change(self, old: dict = None, new: dict = None):
+        """
+        사진 추가/수정/삭제 반영. old/new는 변경 전후의 {"people": [...], "tags": [...]}
+        (추가는 old=None, 삭제는 new=None).
+        """
+        deltas = defaultdict(Counter)
+        _add_photo(deltas, old, -1)
+        _add_photo(deltas, new, 1)
+        self._write_deltas(deltas)
+
+    def apply_travel_change(self, old: dict = None, new: dict = None):
+        """
+        여행 추가/수정/삭제 반영. old/new는 변경 전후의
+        {"_id": travelId, "date": ..., "name": ..., "people": [...]} (추가는 old=None, 삭제는 new=None).
+        """
+        deltas = defaultdict(Counter)
+        _add_travel(deltas, old, -1)
+        _add_travel(deltas, new, 1)
+
+        if old is None and new is not None:
+            # 새 여행은 $max만으로 최근 여행 갱신
+            extra = {person: {"$max": {"lastTravel": _last_travel(new)}} for person in _people(new)}
+            self._write_deltas(deltas, extra)
+            return
+
+        self._write_deltas(deltas)
+        # 수정/삭제는 이 여행이 최근 여행이었을 수 있으므로 관련 인물만 다시 계산
+        affected = _people(old) | _people(new)
+        self.refresh_last_travel(affected)
+
+    def refresh_last_travel(self, person_ids: Iterable):
+        """인물들의 lastTravel을 travel_people 링크와 travels에서 다시 계산"""
+        person_ids = list(person_ids)
+        if not person_ids:
+            return
+        links = self.client.find(
+            self.TRAVEL_PEOPLE_COLLECTION, {"peopleId": {"$in": person_ids}}, {"travelId": 1, "peopleId": 1}
+        )
+        travels_by_person = defaultdict(set)
+        for link in links:
+            travels_by_person[link["peopleId"]].add(link["travelId"])
+
+        travel_ids = list({travel_id for ids in travels_by_person.values() for travel_id in ids})
+        travels = self.client.find(
+            self.TRAVEL_COLLECTION, {"_id": {"$in": travel_ids}}, {"date": 1, "name": 1},
+            sort=[("date", DESCENDING), ("_id", DESCENDING)]
+        ) if travel_ids else []
+        latest = {}
+        for travel in travels:
+            # 최신순으로 정렬되어 있으므로 인물별 첫 여행이 최근 여행
+            for person, ids in travels_by_person.items():
+                if person not in latest and travel["_id"] in ids:
+                    latest[person] = _last_travel(travel)
+
+        now = datetime.utcnow()
+        requests = []
+        for person in person_ids:
+            if person in latest:
+                update = {"$set": {"lastTravel": latest[person], "updatedAt": now}}
+            else:
+                update = {"$unset": {"lastTravel": ""}, "$set": {"updatedAt": now}}
+            requests.append(UpdateOne({"_id": person}, update, upsert=True))
+        self.client.bulk_write(self.collection_name, requests)
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """
+        photos, travels, travel_people 전체를 한 번씩 읽어 통계를 다시 계산.
+        재계산에 나타나지 않은 인물의 기존 통계 문서는 삭제합니다.
+
+        Returns:
+            int: 저장한 통계 문서 수
+        """
+        deltas = defaultdict(Counter)
+        for photo in self.client.find(self.PHOTO_COLLECTION, {}, {"people": 1, "tags": 1}, batch_size=batch_size):
+            _add_photo(deltas, photo, 1)
+
+        travels = {
+            travel["_id"]: dict(travel, people=[])
+            for travel in self.client.find(self.TRAVEL_COLLECTION, {}, {"date": 1, "name": 1}, batch_size=batch_size)
+        }
+        links = self.client.find(
+            self.TRAVEL_PEOPLE_COLLECTION, {}, {"travelId": 1, "peopleId": 1}, batch_size=batch_size
+        )
+        for link in links:
+            travel = travels.get(link.get("travelId"))
+            if travel is not None:
+                travel["people"].append(link.get("peopleId"))
+
+        latest = {}
+        for travel in travels.values():
+            _add_travel(deltas, travel, 1)
+            for person in travel["people"]:
+                candidate = _last_travel(travel)
+                current = latest.get(person)
+                if current is None or (str(candidate["date"]), str(candidate["travelId"])) > (
+                    str(current["date"]), str(current["travelId"])
+                ):
+                    latest[person] = candidate
+
+        stamp = datetime.utcnow()
+        requests = []
+        for person, counter in deltas.items():
+            doc = {"_id": person, "photoCount": 0, "travelCount": 0, "tagCounts": {}, "coTravelers": {}}
+            for field, value in counter.items():
+                if "." in field:
+                    group, key = field.split(".", 1)
+                    doc[group][key] = value
+                else:
+                    doc[field] = value
+            if person in latest:
+                doc["lastTravel"] = latest[person]
+            doc["updatedAt"] = stamp
+            doc["rebuiltAt"] = stamp
+            requests.append(ReplaceOne({"_id": person}, doc, upsert=True))
+            if len(requests) >= batch_size:
+                self.client.bulk_write(self.collection_name, requests)
+                requests = []
+        self.client.bulk_write(self.collection_name, requests)
+
+        self.client.delete_many(self.collection_name, {"rebuiltAt": {"$ne": stamp}})
+        return len(deltas)
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="인물별 통계(person_stats) 재계산")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--db", default="skyst", help="데이터베이스 이름")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    count = PersonStatsRepository(args.db).rebuild(args.batch_size)
+    print(f"인물 {count}명 통계 재계산 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
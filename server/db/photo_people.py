@@ -1,6 +1,14 @@
+from pymongo import IndexModel, ASCENDING
 from .db import MongoDBClient
 
 class PhotoPeopleRepository:
+    INDEXES = [
+        IndexModel([("photoId", ASCENDING)], name="photoId_1"),
+        IndexModel([("personId", ASCENDING)], name="personId_1"),
+        # GET /api/sync 증분 조회
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt_1"),
+    ]
+
     def __init__(self, db_name: str = "skyst"):
         self.client = MongoDBClient(db_name=db_name)
         self.collection_name = "photo_people"
@@ -8,12 +16,26 @@ class PhotoPeopleRepository:
     def add_photoPeople(self, data: dict):
         return self.client.create(self.collection_name, data)
 
-    def get_photoPeople(self, query: dict):
-        return self.client.read(self.collection_name, query)
+    def add_photoPeople_many(self, data: list):
+        return self.client.create_many(self.collection_name, data)
+
+    def replace_photoPeople(self, query: dict, data: list):
+        return self.client.replace_many(self.collection_name, query, data)
+
+    def get_photoPeople(self, query: dict, projection: dict = None):
+        return self.client.read(self.collection_name, query, projection)
+
+    def iter_photoPeople(self, query: dict, **options):
+        return self.client.find(self.collection_name, query, **options)
 
     def update_photoPeople(self, query: dict, update_data: dict):
         return self.client.update(self.collection_name, query, update_data)
 
     def delete_photoPeople(self, query: dict):
         return self.client.delete(self.collection_name, query)
-    
\ No newline at end of file
+
+    def delete_photoPeople_many(self, query: dict):
+        return self.client.delete_many(self.collection_name, query)
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
@@ -1,7 +1,14 @@
+from pymongo import IndexModel, ASCENDING
 from .db import MongoDBClient
 
 
 class PhotoTagsRepository:
+    INDEXES = [
+        IndexModel([("photoId", ASCENDING)], name="photoId_1"),
+        # GET /api/sync 증분 조회
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt_1"),
+    ]
+
     def __init__(self, db_name: str = "skyst"):
         self.client = MongoDBClient(db_name=db_name)
         self.collection_name = "photoTags"
@@ -9,11 +16,26 @@ class PhotoTagsRepository:
     def add_photoTags(self, data: dict):
         return self.client.create(self.collection_name, data)
 
-    def get_photoTags(self, query: dict):
-        return self.client.read(self.collection_name, query)
+    def add_photoTags_many(self, data: list):
+        return self.client.create_many(self.collection_name, data)
+
+    def replace_photoTags(self, query: dict, data: list):
+        return self.client.replace_many(self.collection_name, query, data)
+
+    def get_photoTags(self, query: dict, projection: dict = None):
+        return self.client.read(self.collection_name, query, projection)
+
+    def iter_photoTags(self, query: dict, **options):
+        return self.client.find(self.collection_name, query, **options)
 
     def update_photoTags(self, query: dict, update_data: dict):
         return self.client.update(self.collection_name, query, update_data)
 
     def delete_photoTags(self, query: dict):
-        return self.client.delete(self.collection_name, query)
\ No newline at end of file
+        return self.client.delete(self.collection_name, query)
+
+    def delete_photoTags_many(self, query: dict):
+        return self.client.delete_many(self.collection_name, query)
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
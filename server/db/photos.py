@@ -1,7 +1,35 @@
+import logging
+
+from pymongo import IndexModel, ASCENDING, DESCENDING, GEOSPHERE, TEXT
 from .db import MongoDBClient
+from .geo import EARTH_RADIUS_M, has_legacy_locations, point
+from .pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger("db.indexes")
 
 
 class PhotoRepository:
+    INDEXES = [
+        IndexModel([("travel_id", ASCENDING)], name="travel_id_1"),
+        IndexModel([("people", ASCENDING)], name="people_1"),
+        # location은 GeoJSON Point로 저장 (db.geo 참고)
+        IndexModel([("location", GEOSPHERE)], name="location_2dsphere"),
+        # 설명 + 비정규화 태그 텍스트 검색. 한국어 형태소 분석이 없으므로 어간 처리 없이 토큰 단위로 색인
+        IndexModel(
+            [("description", TEXT), ("tags", TEXT)],
+            name="photo_text",
+            weights={"tags": 2, "description": 1},
+            default_language="none",
+        ),
+        # GET /api/sync 증분 조회
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt_1"),
+    ]
+    # 최신 사진부터 (ObjectId는 생성 시각 순)
+    PAGE_SORT = [("_id", DESCENDING)]
+
+    # 사진 삭제 시 함께 지우는 링크 컬렉션 (photoId로 참조)
+    LINK_COLLECTIONS = ("photo_people", "photoTags")
+
     def __init__(self, db_name: str = "skyst"):
         self.client = MongoDBClient(db_name=db_name)
         self.collection_name = "photos"
@@ -9,11 +37,113 @@ class PhotoRepository:
     def add_photo(self, data: dict):
         return self.client.create(self.collection_name, data)
 
-    def get_photo(self, query: dict):
-        return self.client.read(self.collection_name, query)
+    def get_photo(self, query: dict, projection: dict = None):
+        return self.client.read(self.collection_name, query, projection)
+
+    def iter_photo(self, query: dict, **options):
+        return self.client.find(self.collection_name, query, **options)
+
+    def page_photo(self, query: dict, limit: int, cursor: str = None, projection: dict = None, raw: bool = False):
+        return self.client.find_page(self.collection_name, query, self.PAGE_SORT, limit, cursor, projection, raw)
+
+    def search_photo(self, text: str, limit: int, cursor: str = None, projection: dict = None):
+        """
+        텍스트 인덱스로 관련도순 검색. 점수는 문서의 score 필드로 반환됩니다.
+        관련도 점수는 유일하지 않으므로 연속 토큰에는 오프셋을 담습니다.
+
+        Returns:
+            (문서 리스트, 다음 페이지 토큰 또는 None)
+        """
+        offset = 0
+        if cursor:
+            offset = decode_cursor(cursor).get("offset")
+            if not isinstance(offset, int) or offset < 0:
+                raise ValueError("Invalid cursor")
+
+        score = {"$meta": "textScore"}
+        projection = dict(projection or {})
+        projection["score"] = score
+        docs = list(self.client.find(
+            self.collection_name,
+            {"$text": {"$search": text}},
+            projection,
+            sort=[("score", score)],
+            skip=offset,
+            limit=limit + 1
+        ))
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor({"offset": offset + limit})
+        return docs, next_cursor
+
+    def get_photo_near(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance: float = None,
+        limit: int = 20,
+        query: dict = None,
+        projection: dict = None
+    ):
+        """기준 좌표에서 가까운 순으로 사진 조회 (max_distance: 미터)"""
+        near = {"$geometry": point(latitude, longitude)}
+        if max_distance is not None:
+            near["$maxDistance"] = max_distance
+        geo_query = dict(query or {})
+        geo_query["location"] = {"$near": near}
+        return list(self.client.find(self.collection_name, geo_query, projection, limit=limit))
+
+    def get_photo_within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        limit: int = 0,
+        query: dict = None,
+        projection: dict = None
+    ):
+        """기준 좌표 반경(radius, 미터) 안의 사진 조회 (거리순 정렬 없음)"""
+        center = [float(longitude), float(latitude)]
+        geo_query = dict(query or {})
+        geo_query["location"] = {"$geoWithin": {"$centerSphere": [center, radius / EARTH_RADIUS_M]}}
+        return list(self.client.find(self.collection_name, geo_query, projection, limit=limit))
 
     def update_photo(self, query: dict, update_data: dict):
         return self.client.update(self.collection_name, query, update_data)
 
     def delete_photo(self, query: dict):
-        return self.client.delete(self.collection_name, query)
\ No newline at end of file
+        return self.client.delete(self.collection_name, query)
+
+    def delete_photo_cascade(self, query: dict) -> dict:
+        """
+        query에 해당하는 사진과 링크 문서(photo_people, photoTags)를 삭제.
+        컬렉션마다 delete_many 한 번으로 처리하며, 사진을 먼저 지우므로
+        중간에 실패해도 남는 것은 고아 링크뿐입니다 (db.compact가 정리).
+
+        Returns:
+            컬렉션별 삭제 건수 (예: {"photos": 1, "photo_people": 2, "photoTags": 3})
+        """
+        photo_ids = [doc["_id"] for doc in self.client.find(self.collection_name, query, {"_id": 1})]
+        deleted = {self.collection_name: 0}
+        deleted.update({name: 0 for name in self.LINK_COLLECTIONS})
+        if not photo_ids:
+            return deleted
+
+        deleted[self.collection_name] = self.client.delete_many(
+            self.collection_name, {"_id": {"$in": photo_ids}}
+        ).deleted_count
+        for name in self.LINK_COLLECTIONS:
+            deleted[name] = self.client.delete_many(name, {"photoId": {"$in": photo_ids}}).deleted_count
+        return deleted
+
+    def ensure_indexes(self):
+        indexes = self.INDEXES
+        # 리스트 형식 위치가 남아 있으면 2dsphere 생성이 실패하므로 db.geo normalize 후에 생성
+        if has_legacy_locations(self.client):
+            logger.warning(
+                "photos에 정규화되지 않은 위치가 남아 있어 location_2dsphere를 건너뜁니다 "
+                "(`python -m db.geo normalize` 후 `python -m db.indexes apply`)"
+            )
+            indexes = [index for index in indexes if index.document["name"] != "location_2dsphere"]
+        return self.client.ensure_indexes(self.collection_name, indexes)
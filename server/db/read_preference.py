@@ -0,0 +1,117 @@
+"""
+읽기 선호(read preference) 정책.
+
+레플리카 셋에서 조회를 어느 멤버로 보낼지 정합니다. 쓰기는 항상 primary로 가며,
+조회마다 다음 순서로 모드를 결정합니다.
+
+    1. 현재 요청(컨텍스트)에서 이미 쓰기를 했다면 primary (read-your-writes)
+    2. 라우트 정책: @read_preference(...) 데코레이터 / use_read_preference(...) 블록
+    3. Repository 정책: MongoDBClient(read_preference=...) (Repository의 READ_PREFERENCE)
+    4. 프로세스 기본값: MONGO_READ_PREFERENCE 환경 변수 (기본 primary)
+
+secondary 계열 모드에는 MONGO_MAX_STALENESS_SECONDS(90 이상)를 지정해 너무 뒤처진 멤버를 제외할 수 있습니다.
+
+사용 예시:
+    @app.route("/api/photos")
+    @read_preference(SECONDARY_PREFERRED)
+    def get_photos(): ...
+"""
+import contextvars
+import functools
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+
+PRIMARY = "primary"
+PRIMARY_PREFERRED = "primaryPreferred"
+SECONDARY = "secondary"
+SECONDARY_PREFERRED = "secondaryPreferred"
+NEAREST = "nearest"
+
+_MODES = {
+    PRIMARY: Primary,
+    PRIMARY_PREFERRED: PrimaryPreferred,
+    SECONDARY: Secondary,
+    SECONDARY_PREFERRED: SecondaryPreferred,
+    NEAREST: Nearest,
+}
+
+_route_mode: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("mongo_read_preference", default=None)
+_wrote: contextvars.ContextVar[bool] = contextvars.ContextVar("mongo_wrote", default=False)
+_pymongo_modes = {}
+
+
+def validate_mode(mode: str) -> str:
+    if mode not in _MODES:
+        raise ValueError(f"Unknown read preference: {mode} (choose from {', '.join(_MODES)})")
+    return mode
+
+
+def default_mode() -> str:
+    return validate_mode(os.getenv("MONGO_READ_PREFERENCE", PRIMARY))
+
+
+def to_pymongo(mode: str):
+    """모드 이름 -> pymongo ReadPreference 객체 (재사용)"""
+    preference = _pymongo_modes.get(mode)
+    if preference is None:
+        validate_mode(mode)
+        if mode == PRIMARY:
+            preference = Primary()
+        else:
+            max_staleness = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "-1"))
+            preference = _MODES[mode](max_staleness=max_staleness)
+        _pymongo_modes[mode] = preference
+    return preference
+
+
+def resolve_mode(repository_mode: Optional[str] = None) -> str:
+    """이번 조회에 사용할 모드 결정 (우선순위는 모듈 설명 참고)"""
+    if _wrote.get():
+        return PRIMARY
+    return _route_mode.get() or repository_mode or default_mode()
+
+
+def mark_write():
+    """현재 컨텍스트의 이후 조회를 primary로 고정"""
+    if not _wrote.get():
+        _wrote.set(True)
+
+
+def begin_request(mode: Optional[str] = None):
+    """
+    요청 시작 시 호출. 이전 요청의 쓰기 표시를 지우고 라우트 정책을 설정합니다.
+    반환된 토큰은 end_request()에 넘깁니다.
+    """
+    return _wrote.set(False), _route_mode.set(validate_mode(mode) if mode else None)
+
+
+def end_request(tokens):
+    wrote_token, mode_token = tokens
+    _route_mode.reset(mode_token)
+    _wrote.reset(wrote_token)
+
+
+@contextmanager
+def use_read_preference(mode: str):
+    """블록 안의 조회에 라우트 정책 적용"""
+    token = _route_mode.set(validate_mode(mode))
+    try:
+        yield
+    finally:
+        _route_mode.reset(token)
+
+
+def read_preference(mode: str):
+    """뷰 함수 전체에 라우트 정책을 적용하는 데코레이터"""
+    validate_mode(mode)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with use_read_preference(mode):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
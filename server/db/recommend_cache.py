@@ -0,0 +1,108 @@
+"""
+장소 추천 결과 캐시(recommend_cache) 공유 저장소.
+
+워커 프로세스 여럿이 같은 추천 결과와 무효화 기록을 함께 보도록 MongoDB에 저장합니다.
+캐시 문서는 추천 결과와 함께 참조한 인물 ID(peopleId)를 가지며, 인물의 사진이 바뀌면
+invalidate_people()이 해당 인물을 참조하는 결과를 지웁니다. 무효화 시각도 함께 남겨
+무효화 전에 시작된 추천 실행이 끝난 뒤 오래된 결과를 다시 저장하지 않도록 합니다.
+만료된 문서는 expiresAt TTL 인덱스로 자동 삭제됩니다.
+
+키 생성과 인프로세스 캐시는 recommend.cache를 참고하세요.
+"""
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from .db import MongoDBClient
+from .read_preference import PRIMARY
+
+# 인물별 무효화 기록 문서의 _id 접두사 (결과 문서의 _id는 16진 해시)
+_PERSON_PREFIX = "person:"
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendCacheRepository:
+    INDEXES = [
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0),
+        # 사진 변경 시 인물별 무효화
+        IndexModel([("peopleId", ASCENDING)], name="peopleId_1"),
+    ]
+    # 다른 워커의 무효화가 바로 보이도록 primary에서 읽음
+    READ_PREFERENCE = PRIMARY
+
+    def __init__(self, db_name: str = "skyst", ttl: float = None):
+        self.client = MongoDBClient(db_name=db_name, read_preference=self.READ_PREFERENCE)
+        self.collection_name = "recommend_cache"
+        # 기본 보관 시간(초)
+        self.ttl = ttl if ttl is not None else float(os.getenv("RECOMMEND_CACHE_TTL", "600"))
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        만료되지 않은 결과 반환. 없거나 저장소 오류면 None (캐시 미스로 취급).
+        DB에 연결할 수 없는 경우(ConnectionFailure, MongoUnavailable)도 PyMongoError로 함께 처리합니다.
+        """
+        try:
+            docs = self.client.read(self.collection_name, {"_id": key, "expiresAt": {"$gt": datetime.utcnow()}})
+        except (ConnectionFailure, PyMongoError) as e:
+            logger.warning("추천 캐시 조회 실패: %s", e)
+            return None
+        return docs[0]["value"] if docs else None
+
+    def set(self, key: str, value: Any, people_ids: List[str], ttl: float = None, since: float = None):
+        """
+        결과 저장. since(time.time()) 이후 people_ids 중 누군가 무효화되었으면 저장하지 않습니다.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            if since is not None and people_ids and self._invalidated_since(people_ids, since):
+                return
+            self.client.update(self.collection_name, {"_id": key}, {"$set": {
+                "value": value,
+                "peopleId": list(people_ids),
+                "expiresAt": datetime.utcnow() + timedelta(seconds=ttl),
+            }}, upsert=True)
+        except (ConnectionFailure, PyMongoError) as e:
+            logger.warning("추천 캐시 저장 실패: %s", e)
+
+    def _invalidated_since(self, people_ids: List[str], since: float) -> bool:
+        docs = self.client.read(self.collection_name, {
+            "_id": {"$in": [_PERSON_PREFIX + p for p in people_ids]},
+            "invalidatedAt": {"$gte": since},
+        }, {"_id": 1})
+        return bool(docs)
+
+    def invalidate_people(self, people_ids: List[str]):
+        """people_ids 중 한 명이라도 참조하는 결과 삭제 및 무효화 시각 기록"""
+        people_ids = list(people_ids)
+        if not people_ids:
+            return
+        stamp = time.time()
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl)
+        try:
+            self.client.bulk_write(self.collection_name, [
+                UpdateOne(
+                    {"_id": _PERSON_PREFIX + p},
+                    {"$set": {"invalidatedAt": stamp, "expiresAt": expires_at}},
+                    upsert=True
+                )
+                for p in people_ids
+            ])
+            self.client.delete_many(self.collection_name, {"peopleId": {"$in": people_ids}})
+        except (ConnectionFailure, PyMongoError) as e:
+            logger.warning("추천 캐시 무효화 실패: %s", e)
+
+    def clear(self):
+        try:
+            self.client.delete_many(self.collection_name, {})
+        except (ConnectionFailure, PyMongoError) as e:
+            logger.warning("추천 캐시 비우기 실패: %s", e)
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
+
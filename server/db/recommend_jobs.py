@@ -0,0 +1,78 @@
+"""
+비동기 장소 추천 작업(recommend_jobs) 상태와 결과 저장소.
+
+작업 문서는 expiresAt이 지나면 TTL 인덱스로 자동 삭제되며,
+TTL 삭제가 돌기 전(최대 1분가량)에도 조회 시 만료된 작업은 없는 것으로 취급합니다.
+워커 프로세스가 여럿이어도 어느 프로세스에서든 같은 작업을 조회할 수 있습니다.
+
+    queued -> running -> done | failed
+"""
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, IndexModel
+
+from .db import MongoDBClient
+from .read_preference import PRIMARY
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class RecommendJobRepository:
+    INDEXES = [
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0),
+    ]
+    # 방금 만든/갱신한 작업 상태를 폴링하므로 복제 지연 없는 primary에서 읽음
+    READ_PREFERENCE = PRIMARY
+
+    def __init__(self, db_name: str = "skyst", ttl: float = None):
+        self.client = MongoDBClient(db_name=db_name, read_preference=self.READ_PREFERENCE)
+        self.collection_name = "recommend_jobs"
+        # 작업 결과 보관 시간(초)
+        self.ttl = ttl if ttl is not None else float(os.getenv("RECOMMEND_JOB_TTL", "3600"))
+
+    def _expires_at(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.ttl)
+
+    def create_job(self, prompt: str, people_ids: List[str]) -> str:
+        now = datetime.utcnow()
+        job_id = self.client.create(self.collection_name, {
+            "status": QUEUED,
+            "prompt": prompt,
+            "peopleId": people_ids,
+            "createdAt": now,
+            "expiresAt": self._expires_at(now),
+        })
+        return str(job_id)
+
+    def _set(self, job_id: str, fields: dict):
+        now = datetime.utcnow()
+        fields = dict(fields, updatedAt=now, expiresAt=self._expires_at(now))
+        self.client.update(self.collection_name, {"_id": ObjectId(job_id)}, {"$set": fields})
+
+    def mark_running(self, job_id: str):
+        self._set(job_id, {"status": RUNNING, "startedAt": datetime.utcnow()})
+
+    def mark_done(self, job_id: str, result: dict):
+        self._set(job_id, {"status": DONE, "result": result, "finishedAt": datetime.utcnow()})
+
+    def mark_failed(self, job_id: str, error: str):
+        self._set(job_id, {"status": FAILED, "error": error, "finishedAt": datetime.utcnow()})
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """작업 문서 조회. ID가 잘못되었거나 없거나 만료되었으면 None"""
+        try:
+            oid = ObjectId(job_id)
+        except (InvalidId, TypeError):
+            return None
+        docs = self.client.read(self.collection_name, {"_id": oid, "expiresAt": {"$gt": datetime.utcnow()}})
+        return docs[0] if docs else None
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
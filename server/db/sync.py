@@ -0,0 +1,119 @@
+"""
+모바일 클라이언트 증분 동기화 (GET /api/sync).
+
+토큰은 마지막 동기화 시각을 담은 불투명 문자열입니다. 토큰 이후 updatedAt이 바뀐 문서와
+sync_tombstones에 남은 삭제 기록을 컬렉션별로 돌려주고, 새 토큰을 함께 발급합니다.
+토큰이 없거나 삭제 기록 보관 기간보다 오래되었거나 변경이 너무 많으면 reset=True를 돌려주며,
+이때 클라이언트는 목록을 전체 조회한 뒤 새 토큰으로 다시 동기화합니다.
+
+사용 예시:
+    result = SyncRepository().get_changes(token)
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo import ASCENDING, IndexModel
+
+from . import changes
+from .db import MongoDBClient
+from .pagination import decode_cursor, encode_cursor
+from .read_preference import PRIMARY
+
+# 삭제 기록 보관 기간 (이보다 오래된 토큰은 전체 재동기화)
+TOMBSTONE_TTL = timedelta(days=30)
+# 토큰 시각보다 조금 앞부터 다시 조회 (서버 간 시계 차이, 토큰 발급 시점에 진행 중이던 쓰기)
+SYNC_OVERLAP = timedelta(seconds=5)
+# 컬렉션별 최대 변경 수 (넘으면 전체 재동기화가 더 저렴)
+MAX_CHANGES = 1000
+
+
+def encode_token(stamp: datetime) -> str:
+    return encode_cursor({"t": stamp})
+
+
+def decode_token(token: str) -> datetime:
+    """동기화 토큰 디코딩. 형식이 잘못되면 ValueError"""
+    values = decode_cursor(token)
+    stamp = values.get("t")
+    if not isinstance(stamp, datetime):
+        raise ValueError("Invalid sync token")
+    # 저장 값(naive UTC)과 비교할 수 있도록 맞춤
+    return stamp.replace(tzinfo=None)
+
+
+class SyncRepository:
+    INDEXES = [
+        # 보관 기간이 지난 삭제 기록은 TTL 인덱스로 자동 삭제
+        IndexModel(
+            [("deletedAt", ASCENDING)],
+            name="deletedAt_ttl",
+            expireAfterSeconds=int(TOMBSTONE_TTL.total_seconds()),
+        ),
+    ]
+    SYNC_SORT = [(changes.UPDATED_FIELD, ASCENDING), ("_id", ASCENDING)]
+    # 토큰 시각은 primary 기준이므로 복제가 늦은 secondary에서 읽으면 변경을 놓칠 수 있음
+    READ_PREFERENCE = PRIMARY
+
+    def __init__(self, db_name: str = "skyst"):
+        self.client = MongoDBClient(db_name=db_name, read_preference=self.READ_PREFERENCE)
+        self.collection_name = changes.TOMBSTONE_COLLECTION
+
+    def _reset(self, stamp: datetime) -> dict:
+        return {"token": encode_token(stamp), "reset": True, "changes": {}, "deleted": {}}
+
+    def get_changes(self, token: Optional[str] = None, limit: int = MAX_CHANGES) -> dict:
+        """
+        토큰 이후의 변경 조회.
+
+        Returns:
+            dict: {"token": 새 토큰, "reset": 전체 재동기화 필요 여부,
+                   "changes": {컬렉션: [문서, ...]}, "deleted": {컬렉션: [_id, ...]}}
+
+        Raises:
+            ValueError: 토큰이 잘못된 경우
+        """
+        # 조회 전에 새 토큰 시각을 정해야 조회 중에 들어온 쓰기를 놓치지 않음
+        started = changes.now()
+        if not token:
+            return self._reset(started)
+        since = decode_token(token)
+        if since < started - TOMBSTONE_TTL:
+            return self._reset(started)
+        after = since - SYNC_OVERLAP
+
+        updated = {}
+        for collection_name in sorted(changes.SYNCED_COLLECTIONS):
+            docs = list(self.client.find(
+                collection_name, {changes.UPDATED_FIELD: {"$gte": after}}, sort=self.SYNC_SORT, limit=limit + 1
+            ))
+            if len(docs) > limit:
+                return self._reset(started)
+            if docs:
+                updated[collection_name] = docs
+
+        records = list(self.client.find(
+            self.collection_name, {"deletedAt": {"$gte": after}}, {"collection": 1, "docId": 1, "deletedAt": 1},
+            sort=[("deletedAt", ASCENDING)], limit=limit + 1
+        ))
+        if len(records) > limit:
+            return self._reset(started)
+
+        # 삭제 후 같은 _id로 다시 저장된 문서는 삭제로 보내지 않음
+        revived = {
+            (collection_name, doc["_id"]): doc[changes.UPDATED_FIELD]
+            for collection_name, docs in updated.items() for doc in docs
+        }
+        deleted = defaultdict(list)
+        seen = set()
+        for record in records:
+            key = (record["collection"], record["docId"])
+            if key in seen or (key in revived and revived[key] >= record["deletedAt"]):
+                continue
+            seen.add(key)
+            deleted[record["collection"]].append(record["docId"])
+
+        return {"token": encode_token(started), "reset": False, "changes": updated, "deleted": dict(deleted)}
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
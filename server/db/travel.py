@@ -1,6 +1,21 @@
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from .db import MongoDBClient
 
 class TravelRepository:
+    INDEXES = [
+        IndexModel([("date", DESCENDING), ("_id", DESCENDING)], name="date_-1__id_-1"),
+        # GET /api/sync 증분 조회
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt_1"),
+    ]
+    # 최신 여행부터, 같은 날짜는 _id로 순서 고정
+    PAGE_SORT = [("date", DESCENDING), ("_id", DESCENDING)]
+
+    # 여행 상세 집계에서 $lookup 하는 컬렉션
+    PEOPLE_LINK_COLLECTION = "travel_people"
+    PLACE_LINK_COLLECTION = "travel_places"
+    PEOPLE_COLLECTION = "people"
+    PHOTO_COLLECTION = "photos"
+
     def __init__(self, db_name: str = "skyst"):
         self.client = MongoDBClient(db_name=db_name)
         self.collection_name = "travels"
@@ -8,11 +23,107 @@ class TravelRepository:
     def add_travel(self, data: dict):
         return self.client.create(self.collection_name, data)
 
-    def get_travel(self, query: dict):
-        return self.client.read(self.collection_name, query)
+    def get_travel(self, query: dict, projection: dict = None):
+        return self.client.read(self.collection_name, query, projection)
+
+    def iter_travel(self, query: dict, **options):
+        return self.client.find(self.collection_name, query, **options)
+
+    def page_travel(self, query: dict, limit: int, cursor: str = None, projection: dict = None):
+        return self.client.find_page(self.collection_name, query, self.PAGE_SORT, limit, cursor, projection)
+
+    def get_travel_detail(
+        self,
+        travel_id,
+        projection: dict = None,
+        include_people: bool = True,
+        include_places: bool = True
+    ):
+        """
+        여행 문서와 참여 인물, 장소, 대표 위치를 한 번의 집계로 조회.
+
+        Returns:
+            여행 문서에 다음 필드를 더한 dict (없으면 None)
+              - people_links: [{"peopleId": ...}]
+              - people_docs: [{"_id": ..., "name": ...}]
+              - place_links: [{"placeId": ..., "order": ...}]
+              - located_photos: 위치가 있는 사진 최대 1건 [{"location": ...}]
+        """
+        pipeline = [{"$match": {"_id": travel_id}}]
+        if projection:
+            pipeline.append({"$project": projection})
+
+        if include_people:
+            pipeline += [
+                {"$lookup": {
+                    "from": self.PEOPLE_LINK_COLLECTION,
+                    "localField": "_id",
+                    "foreignField": "travelId",
+                    "pipeline": [{"$project": {"_id": 0, "peopleId": 1}}],
+                    "as": "people_links",
+                }},
+                {"$lookup": {
+                    "from": self.PEOPLE_COLLECTION,
+                    "localField": "people_links.peopleId",
+                    "foreignField": "_id",
+                    "pipeline": [{"$project": {"name": 1}}],
+                    "as": "people_docs",
+                }},
+            ]
+
+        if include_places:
+            pipeline += [
+                {"$lookup": {
+                    "from": self.PLACE_LINK_COLLECTION,
+                    "localField": "_id",
+                    "foreignField": "travelId",
+                    "pipeline": [{"$project": {"_id": 0, "placeId": 1, "order": 1}}],
+                    "as": "place_links",
+                }},
+                {"$lookup": {
+                    "from": self.PHOTO_COLLECTION,
+                    "localField": "_id",
+                    "foreignField": "travel_id",
+                    "pipeline": [
+                        {"$match": {"location.type": "Point"}},
+                        {"$limit": 1},
+                        {"$project": {"_id": 0, "location": 1}},
+                    ],
+                    "as": "located_photos",
+                }},
+            ]
+
+        result = self.client.aggregate(self.collection_name, pipeline)
+        return result[0] if result else None
 
     def update_travel(self, query: dict, update_data: dict):
         return self.client.update(self.collection_name, query, update_data)
 
     def delete_travel(self, query: dict):
         return self.client.delete(self.collection_name, query)
+
+    def delete_travel_cascade(self, query: dict) -> dict:
+        """
+        query에 해당하는 여행과 링크 문서(travel_people, travel_places)를 삭제.
+        컬렉션마다 delete_many 한 번으로 처리하며, 여행을 먼저 지우므로
+        중간에 실패해도 남는 것은 고아 링크뿐입니다 (db.compact가 정리).
+
+        Returns:
+            컬렉션별 삭제 건수
+        """
+        link_collections = (self.PEOPLE_LINK_COLLECTION, self.PLACE_LINK_COLLECTION)
+        travel_ids = [doc["_id"] for doc in self.client.find(self.collection_name, query, {"_id": 1})]
+        deleted = {self.collection_name: 0}
+        deleted.update({name: 0 for name in link_collections})
+        if not travel_ids:
+            return deleted
+
+        deleted[self.collection_name] = self.client.delete_many(
+            self.collection_name, {"_id": {"$in": travel_ids}}
+        ).deleted_count
+        for name in link_collections:
+            deleted[name] = self.client.delete_many(name, {"travelId": {"$in": travel_ids}}).deleted_count
+        return deleted
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
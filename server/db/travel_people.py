@@ -1,18 +1,42 @@
+from pymongo import IndexModel, ASCENDING
 from .db import MongoDBClient
 
 class TravelPeopleRepository:
+    INDEXES = [
+        IndexModel([("travelId", ASCENDING)], name="travelId_1"),
+        # person_stats의 인물별 최근 여행 재계산
+        IndexModel([("peopleId", ASCENDING)], name="peopleId_1"),
+        # GET /api/sync 증분 조회
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt_1"),
+    ]
+
     def __init__(self, db_name: str = "skyst"):
         self.client = MongoDBClient(db_name=db_name)
-        self.collection_name = "travels"
+        self.collection_name = "travel_people"
 
     def add_travel_person(self, data: dict):
         return self.client.create(self.collection_name, data)
 
-    def get_travel_person(self, query: dict):
-        return self.client.read(self.collection_name, query)
+    def add_travel_person_many(self, data: list):
+        return self.client.create_many(self.collection_name, data)
+
+    def replace_travel_person(self, query: dict, data: list):
+        return self.client.replace_many(self.collection_name, query, data)
+
+    def get_travel_person(self, query: dict, projection: dict = None):
+        return self.client.read(self.collection_name, query, projection)
+
+    def iter_travel_person(self, query: dict, **options):
+        return self.client.find(self.collection_name, query, **options)
 
     def update_travel_person(self, query: dict, update_data: dict):
         return self.client.update(self.collection_name, query, update_data)
 
     def delete_travel_person(self, query: dict):
         return self.client.delete(self.collection_name, query)
+
+    def delete_travel_person_many(self, query: dict):
+        return self.client.delete_many(self.collection_name, query)
+
+    def ensure_indexes(self):
+        return self.client.ensure_indexes(self.collection_name, self.INDEXES)
@@ -2,10 +2,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from tools.tool import Tools
+import copy
 import os
 import sys
 import json
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
 from tools.tools import Tools
 
@@ -20,6 +21,23 @@ from llm.utils.prompt import InstructionConfig
 from llm.utils.output_parsers import JSONOutputParser
 from llm.utils.chatbot import ChatBot
 from tools.notes import AgentNotes
+
+
+def fork_model(model, tools: "Tools" = None):
+    """
+    미리 만든 모델 래퍼(inputChecker, TOTMaker 등)의 요청별 복제본 생성.
+    설정과 LLM 모델 객체는 공유하고, ChatBot 속성은 대화 상태가 비어 있는 복제본으로,
+    tools 속성은 주어진 요청별 Tools로 바꿉니다.
+    """
+    clone = copy.copy(model)
+    for name, value in vars(model).items():
+        if isinstance(value, ChatBot):
+            setattr(clone, name, value.fork())
+    if tools is not None and hasattr(model, "tools"):
+        clone.tools = tools
+    return clone
+
+
 class inputChecker:
     def __init__(self, api_key: str):
         """
@@ -591,15 +609,21 @@ class TOTPlanner:
     until `finished: True` is returned, assembling a full ordered steps list.
     """
 
-    def __init__(self, api_key: str, tools: "Tools"):
-        self.tot_maker = TOTMaker(api_key, tools)
+    def __init__(self, api_key: str, tools: "Tools", tot_maker: Optional[TOTMaker] = None):
+        # tot_maker를 넘기면 새로 만들지 않고 사용 (요청별 복제본 등)
+        self.tot_maker = tot_maker or TOTMaker(api_key, tools)
 
-    def build_full_plan(self, purpose: str) -> List[Dict[str, Any]]:
+    def build_full_plan(
+        self,
+        purpose: str,
+        on_step: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Generate a complete multi‑step plan for the given purpose.
 
         Args:
             purpose: High‑level user request (e.g., '서울 반나절 여행 코스 추천')
+            on_step: Optional callback invoked with each step as soon as it is planned
 
         Returns:
             List[Dict[str, Any]]: fully assembled steps array
@@ -632,6 +656,8 @@ class TOTPlanner:
 
             # Append to plan
             current_plan.append(next_step)
+            if on_step is not None:
+                on_step(next_step)
 
         return current_plan
 
@@ -685,6 +711,14 @@ class TOTExecutor:
             api_key=self.api_key
         )
 
+        # 최종 답변 생성기 (실행마다 대화 상태만 새로 가진 복제본을 사용)
+        self.answer_generator = ChatBot(
+            model_name="gemini-2.0-flash",
+            temperature=0.7,
+            max_output_tokens=2048,
+            api_key=self.api_key
+        )
+
     def execute_step(self, step: Dict[str, Any], previous_results: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         단일 단계를 실행하고 결과를 분석합니다.
@@ -792,13 +826,19 @@ class TOTExecutor:
                 "next_step_input": None
             }
 
-    def execute_plan(self, plan: Dict[str, Any], user_query: str = None) -> Dict[str, Any]:
+    def execute_plan(
+        self,
+        plan: Dict[str, Any],
+        user_query: str = None,
+        on_step_result: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         전체 실행 계획을 순차적으로 실행합니다.
 
         Args:
             plan (Dict[str, Any]): 실행 계획
             user_query (str, optional): 사용자 요청 (최종 요약에 사용)
+            on_step_result (Callable, optional): 단계가 끝날 때마다 (단계, 실행 결과)로 호출되는 콜백
 
         Returns:
             Dict[str, Any]: 전체 실행 결과
@@ -807,6 +847,10 @@ class TOTExecutor:
         current_step = 0
         max_retries = 3
 
+        # 계획에 등장하는 ID 조회를 컬렉션별 한 번의 쿼리로 묶음
+        if hasattr(self.tools, 'queue_plan_lookups'):
+            self.tools.queue_plan_lookups(plan['steps'])
+
         while current_step < len(plan['steps']):
             step = plan['steps'][current_step]
             retry_count = 0
@@ -836,6 +880,8 @@ class TOTExecutor:
 
             # 결과 저장
             results.append(step_result)
+            if on_step_result is not None:
+                on_step_result(step, step_result)
             
             # 다음 단계로 진행
             if analysis['next_action'] == 'continue':
@@ -876,13 +922,8 @@ class TOTExecutor:
             return "노트 기능이 활성화되어 있지 않아 세부 정보를 제공할 수 없습니다."
         
         try:
-            # 최종 답변 생성을 위한 LLM 설정
-            answer_generator = ChatBot(
-                model_name="gemini-2.0-flash",
-                temperature=0.7,
-                max_output_tokens=2048,
-                api_key=self.api_key
-            )
+            # 최종 답변 생성을 위한 LLM (미리 만든 생성기의 복제본)
+            answer_generator = self.answer_generator.fork()
             
             # TOT 실행 관련 노트 수집
             tot_execution_notes = self.tools.notes.get_tot_execution_notes()
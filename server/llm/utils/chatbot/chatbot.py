@@ -1,6 +1,7 @@
 """
 ChatBot 클래스 구현 - Google Gemini API 연동
 """
+import copy
 import json
 from typing import Any, Dict, List, Optional, Union, Callable
 import os
@@ -45,6 +46,14 @@ class LLMProvider:
         
         # 대화 세션
         self.convo = None
+
+    def fork(self) -> "LLMProvider":
+        """
+        모델 객체는 공유하고 대화 세션만 새로 가지는 복제본 생성
+        """
+        clone = copy.copy(self)
+        clone.convo = None
+        return clone
     
     def start_chat(self):
         """
@@ -140,6 +149,17 @@ class ChatBot:
             system_instruction=final_instruction if final_instruction else None
         )
     
+    def fork(self) -> "ChatBot":
+        """
+        설정과 LLM 모델은 공유하고 대화 상태(기록, 세션)만 새로 가지는 복제본을 생성합니다.
+        요청마다 챗봇을 새로 만들지 않고 미리 만든 챗봇에서 복제해 사용합니다.
+        """
+        clone = copy.copy(self)
+        clone.conversation_history = []
+        clone._is_running = False
+        clone.llm_provider = self.llm_provider.fork()
+        return clone
+
     def start_chat(self):
         """
         새로운 채팅 세션을 시작합니다.
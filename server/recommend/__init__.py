@@ -0,0 +1,8 @@
+from .cache import MemoryRecommendCacheBackend, RecommendCache, get_cache_backend
+from .jobs import JobQueueFull, RecommendJobRunner
+from .pipeline import RecommendContext, RecommendPipeline, extract_places, format_places, get_pipeline
+__all__ = [
+    "JobQueueFull", "MemoryRecommendCacheBackend", "RecommendCache", "RecommendContext",
+    "RecommendJobRunner", "RecommendPipeline", "extract_places", "format_places", "get_cache_backend",
+    "get_pipeline",
+]
@@ -0,0 +1,170 @@
+"""
+장소 추천 결과 캐시.
+
+같은 프롬프트·같은 인물 조합의 추천(화면 재진입, 재시도 등)은 TOT 파이프라인을 다시 돌리지 않고
+저장된 결과를 돌려줍니다. 키는 정규화한 프롬프트(유니코드 NFKC, 대소문자, 공백 정리),
+정렬한 인물 ID, 시간 구간(RECOMMEND_CACHE_BUCKET초)으로 만들어, 같은 요청이라도
+구간이 바뀌면 새로 추천합니다. 인물의 사진이 추가·수정·삭제되면 invalidate_people()로
+그 인물이 포함된 결과를 지웁니다.
+
+저장소(RECOMMEND_CACHE_BACKEND):
+    memory  워커 프로세스 안의 TTL + LRU 캐시 (기본값, RECOMMEND_CACHE_SIZE개까지)
+    mongo   워커 간 공유 (db.recommend_cache.RecommendCacheRepository)
+    off     캐시 사용 안 함
+
+memory 저장소에서는 다른 워커 프로세스의 사진 변경이 TTL(RECOMMEND_CACHE_TTL초)이 지나야 반영됩니다.
+
+사용 예시:
+    cache = RecommendCache(MemoryRecommendCacheBackend())
+    entry = cache.lookup(prompt, people_ids)
+    if entry.value is None:
+        entry.store({"places": places})
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+
+from db.cache import TTLCache
+
+BACKENDS = ("memory", "mongo", "off")
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """캐시 키용 프롬프트 정규화 (NFKC, 소문자, 연속 공백 하나로, 앞뒤 공백/끝 문장부호 제거)"""
+    prompt = unicodedata.normalize("NFKC", prompt).casefold()
+    return _SPACES.sub(" ", prompt).strip().rstrip(".!?~ ")
+
+
+def normalize_people(people_ids: Iterable[Any]) -> List[str]:
+    """캐시 키/무효화용 인물 ID 목록 (문자열, 중복 제거, 정렬)"""
+    return sorted({str(p) for p in people_ids if p})
+
+
+class MemoryRecommendCacheBackend:
+    """
+    워커 프로세스 안의 추천 결과 캐시 (TTLCache 기반 TTL + LRU).
+    무효화는 인물별 마지막 무효화 시각과 결과의 저장 시각을 비교해 조회 시점에 판단합니다.
+    """
+
+    def __init__(self, ttl: float = None, maxsize: int = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv("RECOMMEND_CACHE_TTL", "600"))
+        maxsize = maxsize or int(os.getenv("RECOMMEND_CACHE_SIZE", "256"))
+        self.cache = TTLCache(ttl=self.ttl, maxsize=maxsize)
+        self._invalidated: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _stale(self, people_ids: List[str], stamp: float) -> bool:
+        return any(self._invalidated.get(p, 0) >= stamp for p in people_ids)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        stored_at, people_ids, value = entry
+        with self._lock:
+            stale = self._stale(people_ids, stored_at)
+        if stale:
+            self.cache.delete(key)
+            return None
+        return value
+
+    def set(self, key: str, value: Any, people_ids: List[str], ttl: float = None, since: float = None):
+        with self._lock:
+            # 실행 도중 인물 사진이 바뀌었으면 결과를 저장하지 않음
+            if since is not None and self._stale(people_ids, since):
+                return
+            stored_at = time.time()
+        self.cache.set(key, (stored_at, list(people_ids), value), ttl)
+
+    def invalidate_people(self, people_ids: List[str]):
+        stamp = time.time()
+        with self._lock:
+            for p in people_ids:
+                self._invalidated[p] = stamp
+            # TTL보다 오래된 무효화 기록은 비교할 결과가 남아 있지 않으므로 정리
+            if len(self._invalidated) > self.cache.maxsize:
+                cutoff = stamp - self.ttl
+                self._invalidated = {p: t for p, t in self._invalidated.items() if t >= cutoff}
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self._invalidated.clear()
+
+
+class CacheEntry:
+    """lookup() 결과. value가 None이면 미스이며, 실행 후 store()로 결과를 저장합니다."""
+
+    def __init__(self, cache: "RecommendCache", key: str, people_ids: List[str], value: Optional[Any], started_at: float):
+        self.cache = cache
+        self.key = key
+        self.people_ids = people_ids
+        self.value = value
+        # 조회 시각. 이후 인물 사진이 바뀌면 store()는 결과를 버림
+        self.started_at = started_at
+
+    @property
+    def hit(self) -> bool:
+        return self.value is not None
+
+    def store(self, value: Any):
+        if self.cache.enabled:
+            self.cache.backend.set(self.key, value, self.people_ids, since=self.started_at)
+
+
+class RecommendCache:
+    def __init__(self, backend=None, bucket: float = None):
+        """
+        Args:
+            backend: get/set/invalidate_people/clear를 가진 저장소 (None이면 캐시 사용 안 함)
+            bucket: 키에 넣는 시간 구간 길이(초) (RECOMMEND_CACHE_BUCKET, 기본 3600)
+        """
+        self.backend = backend
+        self.bucket = bucket or float(os.getenv("RECOMMEND_CACHE_BUCKET", "3600"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def make_key(self, prompt: str, people_ids: List[str], now: float = None) -> str:
+        bucket = int((time.time() if now is None else now) // self.bucket)
+        raw = "\x1f".join([normalize_prompt(prompt), ",".join(people_ids), str(bucket)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, people_ids: Iterable[Any]) -> CacheEntry:
+        started_at = time.time()
+        people_ids = normalize_people(people_ids)
+        key = self.make_key(prompt, people_ids, started_at)
+        value = self.backend.get(key) if self.enabled else None
+        return CacheEntry(self, key, people_ids, value, started_at)
+
+    def invalidate_people(self, *people_lists: Iterable[Any]):
+        """인물 ID 목록들에 포함된 인물이 참조된 결과 무효화"""
+        if not self.enabled:
+            return
+        people_ids = normalize_people(p for people in people_lists for p in (people or []))
+        if people_ids:
+            self.backend.invalidate_people(people_ids)
+
+    def clear(self):
+        if self.enabled:
+            self.backend.clear()
+
+
+def get_cache_backend(name: str = None):
+    """이름(또는 RECOMMEND_CACHE_BACKEND)으로 저장소 생성. off면 None"""
+    name = (name or os.getenv("RECOMMEND_CACHE_BACKEND") or "memory").lower()
+    if name == "memory":
+        return MemoryRecommendCacheBackend()
+    if name == "mongo":
+        from db.recommend_cache import RecommendCacheRepository
+        return RecommendCacheRepository()
+    if name == "off":
+        return None
+    raise ValueError(f"Unknown recommend cache backend: {name} (choose from {', '.join(BACKENDS)})")
@@ -0,0 +1,113 @@
+"""
+비동기 장소 추천 작업 실행기.
+
+POST /api/recommend?async=1 은 작업을 등록하고 바로 작업 ID를 돌려주며,
+작업은 워커 프로세스마다 하나인 제한된 크기의 스레드 풀에서 실행됩니다.
+실행 중·대기 중 작업 수가 max_pending에 이르면 새 작업은 거절(JobQueueFull)되어
+요청 스레드가 LLM 호출에 묶이지 않습니다. 상태와 결과는 RecommendJobRepository에 저장합니다.
+
+사용 예시:
+    runner = RecommendJobRunner(lambda: pipeline.new_context(), RecommendJobRepository())
+    job_id = runner.submit(prompt, people_ids)
+"""
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from db.recommend_jobs import RecommendJobRepository
+
+from .cache import RecommendCache
+from .pipeline import RecommendContext, extract_places
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(RuntimeError):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class RecommendJobRunner:
+    def __init__(
+        self,
+        context_factory: Callable[[], RecommendContext],
+        store: RecommendJobRepository,
+        max_workers: int = None,
+        max_pending: int = None,
+        cache: RecommendCache = None
+    ):
+        """
+        Args:
+            context_factory: 작업마다 새 실행 컨텍스트를 만드는 함수
+            store: 작업 상태/결과 저장소
+            max_workers: 동시에 실행할 작업 수 (RECOMMEND_JOB_WORKERS, 기본 4)
+            max_pending: 실행 중 + 대기 중 작업 상한 (RECOMMEND_JOB_QUEUE, 기본 32)
+            cache: 추천 결과 캐시 (있으면 같은 요청의 결과를 재사용)
+        """
+        self.context_factory = context_factory
+        self.store = store
+        self.cache = cache or RecommendCache()
+        self.max_workers = max_workers or int(os.getenv("RECOMMEND_JOB_WORKERS", "4"))
+        self.max_pending = max(max_pending or int(os.getenv("RECOMMEND_JOB_QUEUE", "32")), self.max_workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # fork 이후 첫 작업에서 생성 (워커 프로세스마다 자기 스레드 풀을 가짐)
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="recommend-job"
+                    )
+        return self._executor
+
+    def submit(self, prompt: str, people_ids: List[str]) -> str:
+        """
+        작업 등록 후 작업 ID 반환.
+
+        Raises:
+            JobQueueFull: 실행 중 + 대기 중 작업이 max_pending개인 경우
+        """
+        if not self._slots.acquire(blocking=False):
+            raise JobQueueFull("Too many pending recommend jobs")
+        # 요청 컨텍스트(라우트 메트릭 태그, 읽기 선호)를 작업 스레드로 이어받음.
+        # 작업 문서 생성(쓰기) 전에 복사해야 작업의 조회가 primary로 고정되지 않음
+        context = contextvars.copy_context()
+        try:
+            job_id = self.store.create_job(prompt, people_ids)
+            self.executor.submit(context.run, self._run, job_id, prompt, people_ids)
+        except Exception:
+            self._slots.release()
+            raise
+        return job_id
+
+    def _run(self, job_id: str, prompt: str, people_ids: List[str]):
+        # 상태 저장(쓰기)과 분리된 컨텍스트에서 실행해 파이프라인 조회가 primary로 고정되지 않도록 함
+        run_context = contextvars.copy_context()
+        try:
+            cached = run_context.run(self.cache.lookup, prompt, people_ids)
+            if cached.hit:
+                self.store.mark_done(job_id, cached.value)
+                return
+            self.store.mark_running(job_id)
+            results = run_context.run(lambda: self.context_factory().run(prompt))
+            response = {"places": extract_places(results)}
+            if response["places"] and not results.get("error"):
+                cached.store(response)
+            self.store.mark_done(job_id, response)
+        except Exception as e:
+            try:
+                self.store.mark_failed(job_id, str(e))
+            except Exception:
+                logger.exception("추천 작업 %s 상태 저장 실패", job_id)
+        finally:
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
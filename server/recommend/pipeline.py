@@ -0,0 +1,132 @@
+"""
+장소 추천 TOT 파이프라인.
+
+Tools와 LLM 모델 래퍼(inputChecker, TOTMaker, TOTExecutor 등), Google API 클라이언트는
+워커마다 한 번만 만들고(RecommendPipeline), 요청마다 대화 상태·노트·배치 로더만 새로 가진
+가벼운 실행 컨텍스트(RecommendContext)를 복제해 사용합니다.
+
+사용 예시:
+    pipeline = get_pipeline(photo_repo=..., people_repo=..., photo_people_repo=...)
+    results = pipeline.new_context().run(prompt)
+    places = extract_places(results)
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from llm.models import TOTPlanner, fork_model
+from tools.tool import Tools
+
+
+class RecommendContext:
+    """요청 하나의 실행 상태 (대화 기록, 노트, ID 배치 로더). 요청 사이에 공유하지 않습니다."""
+
+    def __init__(self, tools: Tools):
+        self.tools = tools
+        # 도구 22/23(TOTMaker/TOTExecutor 도구)과 대화가 섞이지 않도록 별도 복제본 사용
+        self.planner = TOTPlanner(tools.api_key, tools, tot_maker=fork_model(tools.tot_maker, tools))
+        self.executor = fork_model(tools.tot_executor, tools)
+
+    def build_plan(self, prompt: str, on_step: Callable = None) -> List[Dict[str, Any]]:
+        return self.planner.build_full_plan(prompt, on_step=on_step)
+
+    def execute(self, steps: List[Dict[str, Any]], prompt: str, on_step_result: Callable = None) -> Dict[str, Any]:
+        return self.executor.execute_plan({"steps": steps}, prompt, on_step_result=on_step_result)
+
+    def run(self, prompt: str, on_event: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        계획 생성 후 실행한 전체 결과 반환.
+
+        on_event(event, data)를 넘기면 진행 상황을 바로 알립니다.
+            plan_step    계획된 단계 하나
+            step_result  단계 실행 결과 요약 {"stepId", "toolId", "summary", "analysis"}
+            place        추천 장소 하나 (처음 찾은 장소 목록, extract_places와 같은 기준)
+        """
+        if on_event is None:
+            return self.execute(self.build_plan(prompt), prompt)
+
+        places_sent = False
+
+        def on_step_result(step: Dict[str, Any], step_result: Dict[str, Any]):
+            nonlocal places_sent
+            on_event("step_result", {
+                "stepId": step.get("step_id"),
+                "toolId": step.get("tool_id"),
+                "summary": step_result.get("summary"),
+                "analysis": step_result.get("analysis"),
+            })
+            result = step_result.get("result")
+            if not places_sent and isinstance(result, dict) and "places" in result:
+                places_sent = True
+                for place in format_places(result["places"]):
+                    on_event("place", place)
+
+        steps = self.build_plan(prompt, on_step=lambda step: on_event("plan_step", step))
+        return self.execute(steps, prompt, on_step_result=on_step_result)
+
+
+class RecommendPipeline:
+    """
+    워커당 하나씩 만드는 추천 파이프라인.
+    생성 시 Tools와 모델 래퍼를 모두 만들어 두고, new_context()는 복제만 수행합니다.
+    """
+
+    def __init__(self, photo_repo, people_repo, photo_people_repo, persist_notes: bool = None):
+        # 원본은 노트 없이 만들고, 요청별 복제본에서 노트를 켬
+        self.tools = Tools(
+            photo_people_repo=photo_people_repo,
+            photo_repo=photo_repo,
+            people_repo=people_repo,
+            enable_notes=False
+        )
+        if persist_notes is None:
+            persist_notes = os.getenv("RECOMMEND_PERSIST_NOTES", "0") == "1"
+        self.persist_notes = persist_notes
+
+    def new_context(self, enable_notes: bool = True) -> RecommendContext:
+        return RecommendContext(self.tools.fork(enable_notes=enable_notes, persist_notes=self.persist_notes))
+
+
+_pipeline: Optional[RecommendPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline(photo_repo, people_repo, photo_people_repo) -> RecommendPipeline:
+    """
+    프로세스(워커)에 하나인 파이프라인 반환. 첫 호출 시 생성합니다.
+    fork 기반 워커에서는 fork 이후 첫 요청에서 만들어지므로 워커마다 따로 가집니다.
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = RecommendPipeline(photo_repo, people_repo, photo_people_repo)
+    return _pipeline
+
+
+def extract_places(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """실행 결과에서 추천 장소 목록을 찾아 응답 형태로 정리"""
+    recommended_places = []
+    # Try to locate a "places" list either in step results or final summary
+    for step in results.get("steps", []):
+        res = step.get("result", {})
+        if isinstance(res, dict) and "places" in res:
+            recommended_places = res["places"]
+            break
+    if not recommended_places and isinstance(results.get("final_summary"), dict):
+        recommended_places = results["final_summary"].get("places", [])
+
+    return format_places(recommended_places)
+
+
+def format_places(places: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """장소 목록을 응답 형태({"id", "order", "name", "location"})로 정리"""
+    return [
+        {
+            "id": str(place.get("id", "")),
+            "order": int(place.get("order", idx)),
+            "name": place.get("name", ""),
+            "location": place.get("location", [])
+        }
+        for idx, place in enumerate(places)
+    ]
@@ -0,0 +1,61 @@
+"""
+people 캐시 change stream 재연결 테스트 (DB 없이 인메모리 엔진 사용).
+
+    SKYST_STORAGE=memory python -m unittest test_people_cache
+"""
+import os
+import threading
+import unittest
+from unittest import mock
+
+os.environ.setdefault("SKYST_STORAGE", "memory")
+
+from pymongo.errors import ServerSelectionTimeoutError
+
+from db import people
+from db.connection import MongoUnavailable
+from db.people import CachedPeopleRepository
+
+
+class WatchReconnectTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = CachedPeopleRepository()
+        self.calls = 0
+        self.retried = threading.Event()
+
+    def tearDown(self):
+        self.repo.stop_change_stream(timeout=1)
+
+    def _failing_watch(self, error):
+        def watch(collection_name, pipeline=None, resume_after=None):
+            self.calls += 1
+            if self.calls >= 2:
+                self.retried.set()
+            raise error
+        return watch
+
+    def _assert_retries(self, error):
+        with mock.patch.object(people, "WATCH_RETRY_MIN", 0.01), \
+                mock.patch.object(self.repo.client, "watch", side_effect=self._failing_watch(error)):
+            watcher = self.repo.start_change_stream()
+            self.assertTrue(self.retried.wait(2), "change stream을 다시 구독하지 않음")
+            self.assertTrue(watcher.is_alive())
+
+    def test_retries_when_server_unreachable(self):
+        self._assert_retries(ServerSelectionTimeoutError("127.0.0.1:1: Connection refused"))
+
+    def test_retries_on_health_check_failure(self):
+        self._assert_retries(MongoUnavailable("MongoDB 서버에 연결할 수 없습니다."))
+
+    def test_retries_on_unexpected_error(self):
+        self._assert_retries(RuntimeError("unexpected"))
+
+    def test_stops_when_change_stream_unsupported(self):
+        # 인메모리 엔진은 change stream을 지원하지 않으므로 재시도 없이 종료
+        watcher = self.repo.start_change_stream()
+        watcher.join(2)
+        self.assertFalse(watcher.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
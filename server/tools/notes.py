@@ -1,5 +1,6 @@
 import os
 import json
+import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from enum import Enum
@@ -14,19 +15,24 @@ class NoteType(Enum):
     SUMMARY = "summary"               # 요약 기록
 
 class AgentNotes:
-    def __init__(self, base_dir: str = "notes"):
+    def __init__(self, base_dir: str = "notes", persist: bool = True):
         """
         에이전트 노트 초기화
 
         Args:
             base_dir (str): 노트 저장 기본 디렉토리
+            persist (bool): False이면 파일 없이 메모리에만 보관 (요청별 실행용, export_notes 시에만 저장)
         """
         self.base_dir = base_dir
-        self.current_session = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.persist = persist
+        # 같은 초에 시작한 세션(동시 요청)이 같은 디렉토리를 쓰지 않도록 접미사 추가
+        self.current_session = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
         self.session_dir = os.path.join(base_dir, self.current_session)
+        self._data = None
         
         # 세션 디렉토리 생성
-        os.makedirs(self.session_dir, exist_ok=True)
+        if self.persist:
+            os.makedirs(self.session_dir, exist_ok=True)
         
         # 노트 파일 경로
         self.notes_file = os.path.join(self.session_dir, "notes.json")
@@ -34,7 +40,7 @@ class AgentNotes:
 
     def initialize_notes(self):
         """노트 파일 초기화"""
-        if not os.path.exists(self.notes_file):
+        if not self.persist or not os.path.exists(self.notes_file):
             initial_data = {
                 "session_id": self.current_session,
                 "start_time": datetime.now().isoformat(),
@@ -44,11 +50,16 @@ class AgentNotes:
 
     def _save_notes(self, data: Dict[str, Any]):
         """노트 저장"""
+        if not self.persist:
+            self._data = data
+            return
         with open(self.notes_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
     def _load_notes(self) -> Dict[str, Any]:
         """노트 로드"""
+        if not self.persist:
+            return self._data
         with open(self.notes_file, 'r', encoding='utf-8') as f:
             return json.load(f)
 
@@ -219,6 +230,7 @@ class AgentNotes:
             str: 내보낸 파일 경로
         """
         notes_data = self._load_notes()
+        os.makedirs(self.session_dir, exist_ok=True)
         export_file = os.path.join(self.session_dir, f"export_{self.current_session}.{format}")
         
         if format == "json":
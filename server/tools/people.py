@@ -1,13 +1,26 @@
 from db.people import PeopleRepository
+from db.loader import BatchLoader, normalize_id
 from bson import ObjectId
 from typing import Optional, Dict, List
 
-def get_person_by_id(repo: PeopleRepository, person_id: str) -> Optional[Dict]:
-    """ID로 사람을 검색합니다."""
+def get_person_by_id(repo: PeopleRepository, person_id: str, loader: BatchLoader = None) -> Optional[Dict]:
+    """ID로 사람을 검색합니다. loader가 있으면 같은 실행 안의 조회를 묶어서 처리합니다."""
+    if loader is not None:
+        return loader.load(person_id)
     query = {"_id": ObjectId(person_id)}
     result = repo.get_person(query)
     return result[0] if result else None
 
-def get_all_people(repo: PeopleRepository) -> List[Dict]:
-    """모든 사람 정보를 가져옵니다."""
-    return repo.get_person({})
\ No newline at end of file
+def get_person_stats(repo: PeopleRepository, person_id: str, top: int = 5) -> Optional[Dict]:
+    """사람의 통계(사진 수, 여행 수, 최근 여행, 자주 나온 태그, 자주 함께 간 사람)를 한 번에 조회합니다."""
+    stats = repo.get_person_stats(normalize_id(person_id), top)
+    if stats is None:
+        return None
+    stats["personId"] = str(stats["personId"])
+    if stats["lastTravel"]:
+        stats["lastTravel"] = dict(stats["lastTravel"], travelId=str(stats["lastTravel"]["travelId"]))
+    return stats
+
+def get_all_people(repo: PeopleRepository, limit: int = 0, skip: int = 0) -> List[Dict]:
+    """모든 사람 정보를 가져옵니다. limit/skip으로 페이지 단위 조회가 가능합니다."""
+    return list(repo.iter_person({}, skip=skip, limit=limit))
\ No newline at end of file
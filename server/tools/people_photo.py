@@ -1,11 +1,21 @@
 # tools/people_photo.py
 from bson import ObjectId
 
-def get_photos_by_person(photo_people_repo, person_id: str):
-    return photo_people_repo.get_photoPeople({"personId": ObjectId(person_id)})
+def get_photos_by_person(photo_people_repo, person_id: str, limit: int = 0, skip: int = 0):
+    return list(photo_people_repo.iter_photoPeople(
+        {"personId": ObjectId(person_id)}, skip=skip, limit=limit
+    ))
 
-def get_people_in_photo(photo_people_repo, photo_id: str):
-    return photo_people_repo.get_photoPeople({"photoId": ObjectId(photo_id)})
+def get_people_in_photo(photo_people_repo, photo_id: str, limit: int = 0, skip: int = 0, people_loader=None):
+    links = list(photo_people_repo.iter_photoPeople(
+        {"photoId": ObjectId(photo_id)}, skip=skip, limit=limit
+    ))
+    if people_loader is not None:
+        # 링크마다 인물 문서를 붙이되, 조회는 한 번의 $in 쿼리로 처리
+        people = people_loader.load_many(link.get("personId") for link in links)
+        for link, person in zip(links, people):
+            link["person"] = person
+    return links
 
 def add_person_to_photo(photo_people_repo, photo_id: str, person_id: str):
     return photo_people_repo.add_photoPeople({
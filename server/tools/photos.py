@@ -1,9 +1,42 @@
 from db.photos import PhotoRepository
+from db.loader import BatchLoader
 from bson import ObjectId
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+from db.geo import from_geojson
 
-def search_photo_by_id(repo: PhotoRepository, photo_id: str) -> Optional[Dict]:
-    """ID로 사진을 검색합니다."""
+def search_photo_by_id(repo: PhotoRepository, photo_id: str, loader: BatchLoader = None) -> Optional[Dict]:
+    """ID로 사진을 검색합니다. loader가 있으면 같은 실행 안의 조회를 묶어서 처리합니다."""
+    if loader is not None:
+        return loader.load(photo_id)
     query = {"_id": ObjectId(photo_id)}
     result = repo.get_photo(query)
-    return result[0] if result else None
\ No newline at end of file
+    return result[0] if result else None
+
+def _summarize_photo(photo: Dict) -> Dict:
+    """도구 결과용 사진 요약 (JSON 직렬화 가능한 값만)"""
+    return {
+        "id": str(photo["_id"]),
+        "url": photo.get("image_url", ""),
+        "description": photo.get("description", ""),
+        "location": from_geojson(photo.get("location")),
+        "travelId": str(photo.get("travel_id") or "")
+    }
+
+_SUMMARY_PROJECTION = {"image_url": 1, "description": 1, "location": 1, "travel_id": 1}
+
+def search_photos_near(repo: PhotoRepository, latitude: float, longitude: float,
+                       max_distance: float = 1000, limit: int = 20) -> List[Dict]:
+    """좌표에서 가까운 순으로 사진을 검색합니다. (max_distance: 미터)"""
+    photos = repo.get_photo_near(latitude, longitude, max_distance, limit, projection=_SUMMARY_PROJECTION)
+    return [_summarize_photo(photo) for photo in photos]
+
+def search_photos_within(repo: PhotoRepository, latitude: float, longitude: float,
+                         radius: float = 500, limit: int = 50) -> List[Dict]:
+    """좌표 반경(미터) 안에서 찍은 사진을 검색합니다."""
+    photos = repo.get_photo_within(latitude, longitude, radius, limit, projection=_SUMMARY_PROJECTION)
+    return [_summarize_photo(photo) for photo in photos]
+
+def search_photos_by_text(repo: PhotoRepository, query: str, limit: int = 10) -> List[Dict]:
+    """사진 설명과 태그에서 키워드를 관련도순으로 검색합니다."""
+    photos, _ = repo.search_photo(query, limit, projection=_SUMMARY_PROJECTION)
+    return [dict(_summarize_photo(photo), score=photo.get("score", 0)) for photo in photos]
@@ -7,19 +7,23 @@ from tools.people_photo import (
     get_people_in_photo,
     add_person_to_photo,
 )
-from tools.people import get_person_by_id, get_all_people
-from tools.photos import search_photo_by_id
+from tools.people import get_person_by_id, get_all_people, get_person_stats
+from tools.photos import search_photo_by_id, search_photos_near, search_photos_within, search_photos_by_text
 from llm.models import *
 from tools.notes import AgentNotes, NoteType
+from db.loader import RequestLoaders
+import copy
 import os
 
 class Tools:
-    def __init__(self, photo_people_repo, photo_repo, people_repo, enable_notes: bool = True):
+    def __init__(self, photo_people_repo, photo_repo, people_repo, enable_notes: bool = True, persist_notes: bool = True):
         self.google_places_api = GooglePlacesAPI()
         self.google_search_api = GoogleSearchAPI()
         self.photo_people_repo = photo_people_repo
         self.photo_repo = photo_repo
         self.people_repo = people_repo
+        # 실행 범위 ID 조회 배치 로더 (Tools 인스턴스 = 요청/TOT 실행 하나)
+        self.loaders = RequestLoaders(people_repo=people_repo, photo_repo=photo_repo)
         self.api_key = os.getenv("GOOGLE_API_KEY", "")  # 환경변수 또는 다른 방식으로 API 키 주입
         self.input_checker   = inputChecker(self.api_key)
         self.query_maker     = queryMaker(self.api_key)
@@ -32,11 +36,41 @@ class Tools:
         # 에이전트 노트 초기화
         self.enable_notes = enable_notes
         if self.enable_notes:
-            self.notes = AgentNotes()
+            self.notes = AgentNotes(persist=persist_notes)
         
-        self.tool_mapping = {
-            "1": lambda person_id: get_photos_by_person(self.photo_people_repo, person_id),
-            "2": lambda photo_id: get_people_in_photo(self.photo_people_repo, photo_id),
+        self.tool_mapping = self._build_tool_mapping()
+
+    def fork(self, enable_notes: bool = None, persist_notes: bool = False) -> "Tools":
+        """
+        요청별 실행용 복제본 생성.
+        API 클라이언트와 LLM 모델은 공유하고, 대화 상태·노트·배치 로더만 새로 가집니다.
+
+        Args:
+            enable_notes: 노트 사용 여부 (None이면 원본 설정을 따름)
+            persist_notes: 노트를 파일로 저장할지 여부 (기본은 메모리에만 보관)
+        """
+        clone = copy.copy(self)
+        clone.loaders = RequestLoaders(people_repo=self.people_repo, photo_repo=self.photo_repo)
+        clone.enable_notes = self.enable_notes if enable_notes is None else enable_notes
+        if clone.enable_notes:
+            clone.notes = AgentNotes(persist=persist_notes)
+        clone.input_checker = fork_model(self.input_checker, clone)
+        clone.query_maker = fork_model(self.query_maker, clone)
+        clone.filter_generator = fork_model(self.filter_generator, clone)
+        clone.tot_maker = fork_model(self.tot_maker, clone)
+        clone.tot_executor = fork_model(self.tot_executor, clone)
+        clone.text_summarizer = fork_model(self.text_summarizer, clone)
+        clone.custom_llm = fork_model(self.custom_llm, clone)
+        clone.tool_mapping = clone._build_tool_mapping()
+        return clone
+
+    def _build_tool_mapping(self) -> Dict[str, Any]:
+        """도구 ID -> 실행 함수 (이 인스턴스의 저장소, 로더, 모델에 바인딩)"""
+        return {
+            "1": lambda person_id, limit=0, skip=0: get_photos_by_person(self.photo_people_repo, person_id, limit, skip),
+            "2": lambda photo_id, limit=0, skip=0: get_people_in_photo(
+                self.photo_people_repo, photo_id, limit, skip, people_loader=self.loaders.people
+            ),
             "3": lambda photo_id, person_id: add_person_to_photo(self.photo_people_repo, photo_id, person_id),
             # "4": plan_route
             "5": self.google_places_api.search_text,
@@ -45,9 +79,17 @@ class Tools:
             "9": self.google_search_api.search,
             "10": self.google_search_api.get_total_results,
             "11": self.google_search_api.get_page_content,
-            "16": lambda person_id: get_person_by_id(self.people_repo, person_id),
-            "17": lambda: get_all_people(self.people_repo),
-            "18": lambda photo_id: search_photo_by_id(self.photo_repo, photo_id),
+            "16": lambda person_id: get_person_by_id(self.people_repo, person_id, loader=self.loaders.people),
+            "17": lambda limit=0, skip=0: get_all_people(self.people_repo, limit, skip),
+            "18": lambda photo_id: search_photo_by_id(self.photo_repo, photo_id, loader=self.loaders.photos),
+            "27": lambda latitude, longitude, max_distance=1000, limit=20: search_photos_near(
+                self.photo_repo, latitude, longitude, max_distance, limit
+            ),
+            "28": lambda latitude, longitude, radius=500, limit=50: search_photos_within(
+                self.photo_repo, latitude, longitude, radius, limit
+            ),
+            "29": lambda query, limit=10: search_photos_by_text(self.photo_repo, query, limit),
+            "30": lambda person_id, top=5: get_person_stats(self.people_repo, person_id, top),
             "19": self._log_model_response(self.input_checker.process_query, "input_checker"),
             "20": self._log_model_response(self.query_maker.process_query, "query_maker"),
             "21": self._log_model_response(self.filter_generator.process_query, "filter_generator"),
@@ -135,6 +177,22 @@ class Tools:
             }
         )
 
+    def queue_plan_lookups(self, steps: List[Dict[str, Any]]):
+        """
+        계획 단계 입력에 들어 있는 인물/사진 ID를 미리 로더에 등록.
+        첫 조회 시점에 계획 전체의 ID가 컬렉션별 한 번의 $in 쿼리로 조회됩니다.
+        """
+        for step in steps:
+            inputs = step.get("inputs") or {}
+            if inputs.get("person_id"):
+                self.loaders.people.queue(inputs["person_id"])
+            if inputs.get("photo_id"):
+                self.loaders.photos.queue(inputs["photo_id"])
+
+    def reset_loaders(self):
+        """새 요청/실행을 위해 로더 캐시 초기화"""
+        self.loaders = RequestLoaders(people_repo=self.people_repo, photo_repo=self.photo_repo)
+
     def get_tool_info(self, tool_id: str) -> Optional[Dict[str, Any]]:
         return TOOL_LIST.get(tool_id)
 
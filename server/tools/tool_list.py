@@ -24,7 +24,9 @@ TOOL_LIST: Dict[str, Dict[str, Any]] = {
         "callable": "get_photos_by_person",
         "description": "사람 ObjectId(또는 이름)를 받아 해당 인물이 포함된 모든 사진을 반환합니다.",
         "inputs": {
-            "person_id": "str — 필수. 인물의 BSON ObjectId 또는 이름"
+            "person_id": "str — 필수. 인물의 BSON ObjectId 또는 이름",
+            "limit": "Optional[int] — 최대 반환 개수 (기본값 0, 제한 없음)",
+            "skip": "Optional[int] — 건너뛸 개수 (기본값 0)"
         },
         "outputs": {
             "photos": "List[Dict] — 사진 메타데이터 목록",
@@ -37,7 +39,9 @@ TOOL_LIST: Dict[str, Dict[str, Any]] = {
         "callable": "get_people_in_photo",
         "description": "사진 ID를 받아 해당 사진에 등장하는 모든 사람(인물) 정보를 반환합니다.",
         "inputs": {
-            "photo_id": "str — 필수. BSON ObjectId 형식의 사진 ID"
+            "photo_id": "str — 필수. BSON ObjectId 형식의 사진 ID",
+            "limit": "Optional[int] — 최대 반환 개수 (기본값 0, 제한 없음)",
+            "skip": "Optional[int] — 건너뛸 개수 (기본값 0)"
         },
         "outputs": {
             "people": "List[Dict] — 인물 메타데이터 목록",
@@ -174,7 +178,10 @@ TOOL_LIST: Dict[str, Dict[str, Any]] = {
         "module": "tools.people",
         "callable": "get_all_people",
         "description": "모든 인물 정보 목록을 반환합니다.",
-        "inputs": {},  # 입력 파라미터 없음
+        "inputs": {
+            "limit": "Optional[int] — 최대 반환 개수 (기본값 0, 제한 없음)",
+            "skip": "Optional[int] — 건너뛸 개수 (기본값 0)"
+        },
         "outputs": {
             "people": "List[Dict] — 인물 메타데이터 목록"
         },
@@ -192,6 +199,62 @@ TOOL_LIST: Dict[str, Dict[str, Any]] = {
             "photo": "Dict — 사진 메타데이터 (없으면 null)"
         },
     },
+    "27": {
+        "name": "search_photos_near",
+        "module": "tools.photos",
+        "callable": "search_photos_near",
+        "description": "위도·경도를 받아 그 근처에서 찍은 사진을 가까운 순으로 반환합니다. '여기 근처에서 갔던 곳' 같은 질문에 사용합니다.",
+        "inputs": {
+            "latitude": "float — 필수. 위도",
+            "longitude": "float — 필수. 경도",
+            "max_distance": "Optional[float] — 최대 거리 미터 (기본값 1000)",
+            "limit": "Optional[int] — 최대 결과 수 (기본값 20)"
+        },
+        "outputs": {
+            "photos": "List[Dict] — 사진 요약 목록 (id, url, description, location, travelId)"
+        },
+    },
+    "28": {
+        "name": "search_photos_within",
+        "module": "tools.photos",
+        "callable": "search_photos_within",
+        "description": "위도·경도와 반경(미터)을 받아 그 안에서 찍은 사진을 반환합니다. 예: 이 장소 500m 이내 사진.",
+        "inputs": {
+            "latitude": "float — 필수. 위도",
+            "longitude": "float — 필수. 경도",
+            "radius": "Optional[float] — 반경 미터 (기본값 500)",
+            "limit": "Optional[int] — 최대 결과 수 (기본값 50)"
+        },
+        "outputs": {
+            "photos": "List[Dict] — 사진 요약 목록 (id, url, description, location, travelId)"
+        },
+    },
+    "29": {
+        "name": "search_photos_by_text",
+        "module": "tools.photos",
+        "callable": "search_photos_by_text",
+        "description": "키워드로 사진 설명과 태그를 검색해 관련도 높은 순으로 사진을 반환합니다. 예: '바다', '카페'.",
+        "inputs": {
+            "query": "str — 필수. 검색 키워드 (공백으로 여러 단어)",
+            "limit": "Optional[int] — 최대 결과 수 (기본값 10)"
+        },
+        "outputs": {
+            "photos": "List[Dict] — 사진 요약 목록 (id, url, description, location, travelId, score)"
+        },
+    },
+    "30": {
+        "name": "get_person_stats",
+        "module": "tools.people",
+        "callable": "get_person_stats",
+        "description": "사람 ID로 그 사람의 통계를 한 번에 조회합니다. 사진 수, 여행 수, 최근 여행, 자주 나온 태그, 자주 함께 여행한 사람을 알 수 있어 취향 파악에 사용합니다.",
+        "inputs": {
+            "person_id": "str — 필수. 사람 ID",
+            "top": "Optional[int] — 상위 태그/동행인 개수 (기본값 5)"
+        },
+        "outputs": {
+            "stats": "Optional[Dict] — personId, photoCount, travelCount, lastTravel(date, travelId, name), topTags[{tag, count}], coTravelers[{personId, count}] (없으면 None)"
+        },
+    },
     # -------------------------------------------------------------
     # 추가된 LLM 기반 툴 정의 (ID 19‒23)
     # -------------------------------------------------------------------
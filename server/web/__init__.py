@@ -0,0 +1,11 @@
+from .admission import AdmissionControl, AdmissionPool, Rejected, TokenBucket, admission_pool
+from .encoding import FastJSONProvider
+from .fields import parse_fields, select_fields
+from .paging import parse_page_args, set_next_cursor
+from .sse import StreamClosed, sse_event, stream_events
+from .streaming import stream_json_array
+__all__ = [
+    "AdmissionControl", "AdmissionPool", "Rejected", "TokenBucket", "admission_pool",
+    "FastJSONProvider", "parse_fields", "select_fields", "parse_page_args", "set_next_cursor",
+    "StreamClosed", "sse_event", "stream_events", "stream_json_array",
+]
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""
+요청 수락 제어 (동시 실행 제한 + 클라이언트별 요청 속도 제한).
+
+라우트는 풀(AdmissionPool) 하나에 속하며, 풀마다 동시 실행 수 상한과 제한된 크기의 대기열,
+클라이언트별 토큰 버킷을 가집니다. 대기열이 가득 찼거나, 대기 시간이 지났거나,
+클라이언트의 토큰이 없으면 바로 429와 Retry-After로 거절합니다.
+
+LLM·외부 API를 호출하는 추천 라우트는 llm 풀, 나머지(사진·여행 CRUD 등)는 crud 풀을 사용해
+추천 요청이 몰려도 CRUD 라우트가 워커 스레드를 나눠 쓰지 않도록 합니다.
+llm 풀의 동시 실행 수 + 대기열 크기를 워커 스레드 수보다 작게 두어야 CRUD 몫이 남습니다.
+
+풀 설정은 환경 변수 ADMISSION_<풀 이름>_* 로 덮어쓸 수 있습니다 (예: ADMISSION_LLM_CONCURRENCY).
+    CONCURRENCY    동시 실행 수
+    QUEUE          대기열 크기 (0이면 대기 없이 바로 거절)
+    QUEUE_TIMEOUT  대기열에서 기다리는 최대 시간(초)
+    RATE           클라이언트별 초당 요청 수 (0이면 속도 제한 없음)
+    BURST          클라이언트별 순간 최대 요청 수
+    RETRY_AFTER    대기열이 가득 찼을 때 Retry-After(초)
+ADMISSION_CONTROL=0이면 수락 제어를 끕니다.
+
+사용 예시:
+    llm_pool = AdmissionPool.from_env("llm", max_concurrent=4, max_queue=4, rate=0.1, burst=5)
+    admission = AdmissionControl(app, default_pool=AdmissionPool.from_env("crud"))
+
+    @app.route("/api/recommend", methods=["POST"])
+    @admission_pool(llm_pool)
+    def recommend_places(): ...
+"""
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from flask import Flask, Response, current_app, g, jsonify, request
+
+from db.cache import TTLCache
+
+
+class Rejected(Exception):
+    """요청을 받을 수 없음 (429). retry_after는 다시 시도할 때까지의 초"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "lock")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> float:
+        """토큰 하나 사용. 성공하면 0, 부족하면 다음 토큰까지 남은 초"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class AdmissionPool:
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int = 0,
+        queue_timeout: float = 0,
+        rate: float = 0,
+        burst: float = None,
+        retry_after: float = 1,
+        max_clients: int = 10000
+    ):
+        """
+        Args:
+            name: 풀 이름 (메트릭/로그용)
+            max_concurrent: 동시에 실행할 요청 수
+            max_queue: 실행 슬롯을 기다릴 수 있는 요청 수
+            queue_timeout: 대기열에서 기다리는 최대 시간(초)
+            rate: 클라이언트별 초당 요청 수 (0이면 제한 없음)
+            burst: 클라이언트별 순간 최대 요청 수 (기본 max(1, rate))
+            retry_after: 대기열이 가득 찼거나 대기 시간이 지났을 때 Retry-After(초)
+            max_clients: 토큰 버킷을 보관할 클라이언트 수 (LRU, 오래 쉰 클라이언트는 가득 찬 버킷으로 다시 시작)
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.retry_after = retry_after
+        # 버킷이 가득 차는 시간보다 오래 쉰 클라이언트의 버킷은 새 버킷과 같으므로 버려도 됨
+        idle_ttl = self.burst / rate if rate > 0 else 0
+        self._buckets = TTLCache(ttl=max(idle_ttl, 1), maxsize=max_clients)
+        self._bucket_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected: Dict[str, int] = {"rate": 0, "queue_full": 0, "timeout": 0}
+
+    @classmethod
+    def from_env(cls, name: str, **defaults) -> "AdmissionPool":
+        """ADMISSION_<NAME>_* 환경 변수로 defaults를 덮어쓴 풀 생성"""
+        prefix = f"ADMISSION_{name.upper()}_"
+        options = {
+            "max_concurrent": ("CONCURRENCY", int),
+            "max_queue": ("QUEUE", int),
+            "queue_timeout": ("QUEUE_TIMEOUT", float),
+            "rate": ("RATE", float),
+            "burst": ("BURST", float),
+            "retry_after": ("RETRY_AFTER", float),
+        }
+        for option, (suffix, convert) in options.items():
+            value = os.getenv(prefix + suffix)
+            if value not in (None, ""):
+                defaults[option] = convert(value)
+        defaults.setdefault("max_concurrent", 16)
+        return cls(name, **defaults)
+
+    def _bucket(self, client: str) -> TokenBucket:
+        with self._bucket_lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+            # 요청마다 다시 저장해 만료 시각을 마지막 요청 기준으로 연장
+            self._buckets.set(client, bucket)
+        return bucket
+
+    def acquire(self, client: str):
+        """
+        실행 슬롯 하나 확보. 성공하면 요청 처리 후 release()를 호출해야 합니다.
+
+        Raises:
+            Rejected: 클라이언트 요청 속도 초과, 대기열 가득 참, 대기 시간 초과
+        """
+        if self.rate > 0:
+            wait = self._bucket(client).take()
+            if wait:
+                with self._cond:
+                    self._rejected["rate"] += 1
+                raise Rejected("rate", wait)
+        with self._cond:
+            if self._active >= self.max_concurrent:
+                if self._waiting >= self.max_queue:
+                    self._rejected["queue_full"] += 1
+                    raise Rejected("queue_full", self.retry_after)
+                self._waiting += 1
+                try:
+                    deadline = time.monotonic() + self.queue_timeout
+                    while self._active >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._rejected["timeout"] += 1
+                            raise Rejected("timeout", self.retry_after)
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._active += 1
+            self._admitted += 1
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "maxConcurrent": self.max_concurrent,
+                "maxQueue": self.max_queue,
+                "admitted": self._admitted,
+                "rejected": dict(self._rejected),
+            }
+
+
+def admission_pool(pool: AdmissionPool):
+    """뷰 함수가 사용할 풀 지정 (지정하지 않은 라우트는 AdmissionControl의 default_pool)"""
+
+    def decorator(func):
+        func.admission_pool = pool
+        return func
+    return decorator
+
+
+def remote_client() -> str:
+    """요청 클라이언트 식별자. ADMISSION_TRUST_PROXY=1이면 X-Forwarded-For의 첫 주소 사용"""
+    if os.getenv("ADMISSION_TRUST_PROXY", "0") == "1":
+        forwarded = request.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.remote_addr or "unknown"
+
+
+class AdmissionControl:
+    """Flask 앱의 모든 요청에 풀별 수락 제어 적용"""
+
+    def __init__(
+        self,
+        app: Flask = None,
+        default_pool: AdmissionPool = None,
+        client_key: Callable[[], str] = remote_client
+    ):
+        self.default_pool = default_pool
+        self.client_key = client_key
+        self.pools: Dict[str, AdmissionPool] = {}
+        if default_pool is not None:
+            self.pools[default_pool.name] = default_pool
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        app.before_request(self._admit)
+        app.after_request(self._hold_for_stream)
+        app.teardown_request(self._release)
+
+    def _pool_for(self) -> Optional[AdmissionPool]:
+        view = current_app.view_functions.get(request.endpoint)
+        pool = getattr(view, "admission_pool", None) or self.default_pool
+        if pool is not None:
+            self.pools.setdefault(pool.name, pool)
+        return pool
+
+    def _admit(self):
+        pool = self._pool_for()
+        if pool is None:
+            return None
+        try:
+            pool.acquire(self.client_key())
+        except Rejected as e:
+            retry_after = max(1, math.ceil(e.retry_after))
+            response = jsonify({"error": "Too many requests", "reason": e.reason})
+            response.status_code = 429
+            response.headers["Retry-After"] = str(retry_after)
+            return response
+        g.admission_pool = pool
+        return None
+
+    def _hold_for_stream(self, response: Response) -> Response:
+        # 스트리밍 응답은 본문 전송이 끝날 때까지 슬롯을 유지
+        if response.is_streamed:
+            pool = g.pop("admission_pool", None)
+            if pool is not None:
+                response.call_on_close(pool.release)
+        return response
+
+    def _release(self, exc):
+        pool = g.pop("admission_pool", None)
+        if pool is not None:
+            pool.release()
+
+    def snapshot(self) -> dict:
+        return {name: pool.snapshot() for name, pool in self.pools.items()}
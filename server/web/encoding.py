@@ -0,0 +1,79 @@
+"""
+응답 JSON 인코딩.
+
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 동작합니다.
+ObjectId, datetime, Decimal128, RawBSONDocument 등 BSON 타입을 변환 없이 바로 직렬화하므로
+라우트에서 str(ObjectId)나 중간 dict 변환을 할 필요가 없습니다.
+
+사용 예시:
+    app.json = FastJSONProvider(app)
+    body = dumps({"_id": ObjectId()})   # bytes
+"""
+import base64
+import datetime
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from bson import Binary, Decimal128, ObjectId, Regex, Timestamp
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any):
+    """기본 인코더가 처리하지 못하는 BSON/파이썬 타입 변환"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Mapping):
+        # RawBSONDocument, SON 등
+        return dict(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal128):
+        return str(obj.to_decimal())
+    if isinstance(obj, (bytes, Binary)):
+        return base64.b64encode(bytes(obj)).decode("ascii")
+    if isinstance(obj, Timestamp):
+        return {"t": obj.time, "i": obj.inc}
+    if isinstance(obj, Regex):
+        return obj.pattern
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(data):
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(data):
+        return json.loads(data)
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    jsonify()와 request.get_json()이 사용하는 Flask JSON 프로바이더.
+    기본 프로바이더와 달리 키를 정렬하지 않고, 인코딩 결과(bytes)를 그대로 응답 본문으로 씁니다.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,36 @@
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_fields(field_map: Dict[str, Optional[str]], requested: Optional[str] = None) -> Tuple[List[str], dict]:
+    """
+    ?fields= 쿼리 파라미터를 응답 필드 목록과 MongoDB projection으로 변환.
+
+    Args:
+        field_map: 응답 필드 이름 -> 문서 필드 이름. 다른 컬렉션에서 채우는
+                   계산 필드는 None으로 지정합니다.
+        requested: 콤마로 구분된 필드 목록 (없으면 전체 필드)
+
+    Returns:
+        (응답에 포함할 필드 목록, projection)
+
+    Raises:
+        ValueError: 알 수 없는 필드가 요청된 경우
+    """
+    if requested:
+        names = [name.strip() for name in requested.split(",") if name.strip()]
+        unknown = [name for name in names if name not in field_map]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    else:
+        names = list(field_map)
+
+    projection = {field_map[name]: 1 for name in names if field_map[name]}
+    if not projection:
+        # 계산 필드만 요청된 경우에도 문서 전체를 가져오지 않도록 _id만 조회
+        projection = {"_id": 1}
+    return names, projection
+
+
+def select_fields(data: dict, names: List[str]) -> dict:
+    """응답 dict에서 요청된 필드만 남김"""
+    return {name: data[name] for name in names if name in data}
@@ -0,0 +1,35 @@
+from typing import Optional, Tuple
+
+from flask import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def parse_page_args(args, default_limit: int, max_limit: int = 500) -> Tuple[int, Optional[str]]:
+    """
+    limit / cursor 쿼리 파라미터 파싱.
+
+    Returns:
+        (limit, cursor 토큰 또는 None)
+
+    Raises:
+        ValueError: limit이 양의 정수가 아닌 경우
+    """
+    raw_limit = args.get("limit")
+    if raw_limit is None or raw_limit == "":
+        limit = default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValueError("limit must be a positive integer")
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer")
+    return min(limit, max_limit), args.get("cursor") or None
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> Response:
+    """다음 페이지 토큰을 응답 헤더에 추가 (마지막 페이지면 생략)"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
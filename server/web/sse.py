@@ -0,0 +1,76 @@
+import contextvars
+import queue
+import threading
+from typing import Any, Callable
+
+from flask import Response
+
+from .encoding import dumps
+
+# 이벤트가 없을 때 연결 유지를 위해 보내는 주석 줄 간격(초)
+HEARTBEAT_SECONDS = 15
+
+Emit = Callable[[str, Any], None]
+
+
+class StreamClosed(Exception):
+    """클라이언트 연결이 끊겨 더 이상 이벤트를 보낼 수 없음"""
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Server-Sent Events 형식의 이벤트 한 개 (data는 JSON)"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def stream_events(produce: Callable[[Emit], None], heartbeat: float = HEARTBEAT_SECONDS) -> Response:
+    """
+    produce(emit)를 별도 스레드에서 실행하며 emit(event, data)로 보낸 이벤트를 바로 SSE로 전송하는 응답 생성.
+    produce에서 예외가 나면 error 이벤트를 보내고 스트림을 닫습니다.
+    클라이언트 연결이 끊기면 다음 emit 호출이 StreamClosed를 일으켜 작업을 일찍 멈춥니다.
+
+    Args:
+        produce: 이벤트를 만들어 내는 함수 (요청 컨텍스트 변수를 이어받아 실행)
+        heartbeat: 이벤트가 없을 때 keep-alive 주석을 보내는 간격(초)
+    """
+    events: "queue.Queue[bytes]" = queue.Queue()
+    closed = threading.Event()
+    # 라우트 메트릭 태그, 읽기 선호 등 요청 컨텍스트를 작업 스레드로 이어받음
+    context = contextvars.copy_context()
+
+    def emit(event: str, data: Any):
+        if closed.is_set():
+            raise StreamClosed()
+        events.put(sse_event(event, data))
+
+    def run():
+        try:
+            produce(emit)
+        except StreamClosed:
+            pass
+        except Exception as e:
+            events.put(sse_event("error", {"error": str(e)}))
+        finally:
+            events.put(None)
+
+    def generate():
+        # 응답 본문을 읽기 시작할 때 작업 시작
+        threading.Thread(target=context.run, args=(run,), name="sse-producer", daemon=True).start()
+        try:
+            while True:
+                try:
+                    frame = events.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield b": keep-alive\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            closed.set()
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        # 프록시 버퍼링 없이 이벤트마다 바로 전달
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
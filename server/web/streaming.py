@@ -0,0 +1,49 @@
+from typing import Any, Callable, Iterable, Optional
+
+from flask import Response, stream_with_context
+
+from .encoding import dumps
+
+# 한 번에 내보낼 항목 수 (항목마다 쓰기 호출이 생기지 않도록 묶음)
+CHUNK_ITEMS = 100
+
+
+def _iter_json_array(items: Iterable[Any], transform: Optional[Callable[[Any], Any]], chunk_items: int):
+    yield b"["
+    chunk = []
+    first = True
+    for item in items:
+        if transform is not None:
+            item = transform(item)
+        chunk.append(dumps(item))
+        if len(chunk) >= chunk_items:
+            yield (b"" if first else b",") + b",".join(chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]"
+
+
+def stream_json_array(
+    items: Iterable[Any],
+    transform: Optional[Callable[[Any], Any]] = None,
+    status: int = 200,
+    chunk_items: int = CHUNK_ITEMS
+) -> Response:
+    """
+    커서(이터러블)를 순회하며 JSON 배열을 조각 단위로 스트리밍하는 응답 생성.
+    중간 리스트를 만들지 않으므로 요청당 메모리가 결과 크기에 비례해 늘어나지 않습니다.
+    ObjectId, datetime, RawBSONDocument 등은 web.encoding이 바로 직렬화합니다.
+
+    Args:
+        items: MongoDB 커서 등 문서 이터러블
+        transform: 각 문서를 응답 항목으로 변환하는 함수
+        status: HTTP 상태 코드
+        chunk_items: 한 조각에 담을 항목 수
+    """
+    return Response(
+        stream_with_context(_iter_json_array(items, transform, chunk_items)),
+        status=status,
+        mimetype="application/json"
+    )